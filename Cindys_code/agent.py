@@ -3,19 +3,28 @@
 # using the BeeAI framework, ChromaDB for vector storage, and OpenAI for LLM responses.
 
 import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
 import os
+import sys
+import threading
 import time
 # Disable tokenizer parallelism to avoid warnings and potential conflicts
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional
+
+# Make shared modules in the repository root (e.g. fake_llm.py, telemetry/) importable when running from Cindys_code/
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 
 # OpenTelemetry imports for observability
 try:
     from opentelemetry import trace
-    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-    from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor
-    from opentelemetry.sdk.resources import Resource
+    from telemetry import get_telemetry_stats, get_tracer, instrument_beeai, setup_telemetry, test_span_export
     OTEL_AVAILABLE = True
     print("✅ OpenTelemetry available for observability")
 except ImportError:
@@ -24,106 +33,199 @@ except ImportError:
 
 # Import BeeAI framework components for building the agent system
 from beeai_framework.backend.chat import ChatModel  # For LLM integration (OpenAI)
+from beeai_framework.backend.message import SystemMessage, UserMessage  # Messages for direct (streaming) LLM calls
 from beeai_framework.tools.tool import Tool  # Base class for creating tools
 from beeai_framework.workflows.agent import AgentWorkflow, AgentWorkflowInput  # Workflow management
 from beeai_framework.emitter.emitter import Emitter  # Event emission system
 from pydantic import BaseModel, Field  # Data validation and schema definition
 
 # Import external libraries for RAG functionality
-from sentence_transformers import SentenceTransformer  # For creating text embeddings
 import chromadb  # Vector database for storing and searching FAQ embeddings
+from embedding_backends import EmbeddingBackend, create_embedding_backend  # SentenceTransformer or offline fake embeddings
+
+# Local performance helpers
+from embedding_batcher import EmbeddingBatcher  # Micro-batches concurrent query embeddings
+from embedding_cache import EmbeddingCache, normalize_query  # LRU cache of query embeddings
+from persistent_embedding_cache import PersistentEmbeddingCache  # Memory-mapped cache that survives restarts
+from answer_cache import SemanticAnswerCache  # Reuses answers for near-identical questions
+from singleflight import Flight, FlightCancelledError, SingleFlight  # Coalesces identical in-flight queries
+from vector_index import InMemoryVectorIndex  # NumPy mirror of small Chroma collections
+from fake_chat_model import FakeChatModel  # Offline ChatModel for load testing (LLM_BACKEND=fake)
+from llm_cassette import CASSETTE_MODE_OFF, LLMCassette, TokenTimer  # Record/replay of agent workflow answers
+from executors import BlockingExecutor, encode_in_worker, init_embedding_worker  # Off-loop execution
 
 # Configuration constants for the RAG system
 EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'  # Lightweight but effective embedding model
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # openai | fake (see fake_llm.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")  # sentence-transformers | fake (see embedding_backends.py)
 CHROMA_PERSIST_PATH = "./my_chroma_db"  # Local path for ChromaDB storage
 CHROMA_COLLECTION_NAME = "company_faqs"  # Collection name in ChromaDB
 
+# Micro-batching of concurrent query embeddings (see embedding_batcher.py)
+EMBEDDING_BATCHING_ENABLED = os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "16"))  # Queries per encode call
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))  # Batching window
+
+# Query-embedding cache in front of the embedding model (see embedding_cache.py)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000"))
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+
+# Persistent, memory-mapped embedding cache shared by worker processes (see persistent_embedding_cache.py)
+PERSISTENT_EMBEDDING_CACHE_ENABLED = os.getenv("PERSISTENT_EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+PERSISTENT_EMBEDDING_CACHE_PATH = os.getenv("PERSISTENT_EMBEDDING_CACHE_PATH", "./embedding_cache")
+PERSISTENT_EMBEDDING_CACHE_DTYPE = os.getenv("PERSISTENT_EMBEDDING_CACHE_DTYPE", "float32")  # float32 | float16
+PERSISTENT_EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("PERSISTENT_EMBEDDING_CACHE_MAX_ENTRIES", "1000000"))
+PERSISTENT_EMBEDDING_CACHE_COMPACTION_INTERVAL_S = float(os.getenv("PERSISTENT_EMBEDDING_CACHE_COMPACTION_INTERVAL_S", "30"))
+
+# Semantic answer cache in front of the agent workflow (see answer_cache.py)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0.95"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2000"))
+
+# Coalescing of identical concurrent /chat queries (see singleflight.py)
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# In-process NumPy mirror of the Chroma collection (see vector_index.py)
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_INDEX_MAX_ROWS = int(os.getenv("VECTOR_INDEX_MAX_ROWS", "20000"))  # Above this, query Chroma directly
+FAQ_COLLECTION_CHECK_INTERVAL_S = float(os.getenv("FAQ_COLLECTION_CHECK_INTERVAL_S", "30"))  # 0 disables change detection
+
+# Record/replay of agent workflow LLM exchanges for offline regression benchmarks (see llm_cassette.py)
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", CASSETTE_MODE_OFF)  # off | record | replay
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "./cassettes/faq_agent.jsonl.gz")
+LLM_CASSETTE_MISS_POLICY = os.getenv("LLM_CASSETTE_MISS_POLICY", "error")  # error | passthrough
+LLM_CASSETTE_REPLAY_SPEED = float(os.getenv("LLM_CASSETTE_REPLAY_SPEED", "1.0"))  # 0 replays without delays
+
+# Batch /chat/batch processing
+CHAT_BATCH_MAX_CONCURRENCY = int(os.getenv("CHAT_BATCH_MAX_CONCURRENCY", "8"))  # Concurrent LLM calls per batch
+CHAT_BATCH_MAX_CONCURRENCY_LIMIT = int(os.getenv("CHAT_BATCH_MAX_CONCURRENCY_LIMIT", "32"))  # Cap on caller-supplied concurrency
+
+# Execution of CPU-bound RAG steps off the event loop (see executors.py)
+RAG_EXECUTION_MODE = os.getenv("RAG_EXECUTION_MODE", "thread")  # inline | thread | process
+RAG_EXECUTOR_MAX_WORKERS = int(os.getenv("RAG_EXECUTOR_MAX_WORKERS", "4"))  # Thread pool size
+RAG_EXECUTOR_MAX_PENDING = int(os.getenv("RAG_EXECUTOR_MAX_PENDING", "64"))  # In-flight calls before callers wait
+RAG_EMBEDDING_PROCESS_WORKERS = int(os.getenv("RAG_EMBEDDING_PROCESS_WORKERS", "2"))  # Process pool size in "process" mode
+
+# Instructions shared by the workflow agent and the streaming endpoint
+FAQ_AGENT_INSTRUCTIONS = (
+    "You are an expert in company FAQs. Your primary goal is to answer questions based on the provided company FAQ information. "
+    "If company FAQ information is provided in the input, prioritize using it to answer the user's question. "
+    "If no relevant company FAQ information is provided or found, state that you cannot find the answer in the company FAQs. "
+    "Do NOT try to use the 'faq_lookup_tool' on your own if context is already provided, as the information has already been retrieved for you."
+)
+
 # Global variables to store initialized components (singleton pattern)
 # These are initialized once and reused across multiple requests
-_embedding_model = None  # SentenceTransformer model for creating embeddings
+_embedding_model = None  # EmbeddingBackend (SentenceTransformer or fake) for creating embeddings
+_embedding_batcher = None  # EmbeddingBatcher that groups concurrent encode calls
+_executor = None  # BlockingExecutor running embedding and Chroma calls off the event loop
+_embedding_cache = None  # EmbeddingCache of normalized query -> embedding
+_persistent_embedding_cache = None  # PersistentEmbeddingCache backing the in-memory cache on disk
+_answer_cache = None  # SemanticAnswerCache of generated answers
+_vector_index = None  # InMemoryVectorIndex mirroring the Chroma collection
+_collection_version = None  # Content hash of the Chroma collection the derived state was built from
+_collection_watcher = None  # Daemon thread rebuilding derived state when the collection changes
+_single_flight = SingleFlight() if SINGLE_FLIGHT_ENABLED else None  # In-flight pipeline executions by normalized query
 _chroma_collection = None  # ChromaDB collection for FAQ storage
 _llm = None  # OpenAI chat model instance
 _faq_tool_instance = None  # FAQTool instance for searching FAQs
 _agent_workflow = None  # AgentWorkflow for orchestrating the FAQ agent
+_llm_cassette = None  # LLMCassette recording or replaying agent workflow answers
 _tracer_provider = None  # OpenTelemetry tracer provider for observability
 _tracer = None  # OpenTelemetry tracer for creating spans
+_setup_lock = threading.Lock()  # Serializes initialization between the startup thread and requests
+_component_load_times: Dict[str, float] = {}  # Per-component initialization time in milliseconds
+_startup_total_ms = None  # Wall-clock time of the last full initialization
 
-def setup_splunk_otel():
-    """Set up OpenTelemetry for Splunk SignalFX observability."""
-    if not OTEL_AVAILABLE:
-        print("⚠️  OpenTelemetry not available - skipping OTEL setup")
-        return None
+def _load_component(name: str, loader: Callable):
+    """Runs one component loader, recording its load time and a load span."""
+    with _optional_span(f"load_{name}") as span:
+        start = time.perf_counter()
+        try:
+            component = loader()
+        except Exception as e:
+            if span:
+                span.set_attribute("component.status", "error")
+                span.set_attribute("error.message", str(e))
+                span.set_attribute("error.type", type(e).__name__)
+            raise
+        finally:
+            _component_load_times[name] = round((time.perf_counter() - start) * 1000, 3)
+        if span:
+            span.set_attribute("component.name", name)
+            span.set_attribute("component.load_ms", _component_load_times[name])
+            span.set_attribute("component.status", "success")
+        return component
+
+def _load_components_in_parallel(loaders: Dict[str, Callable]) -> Optional[Dict[str, object]]:
+    """
+    Loads independent components concurrently on short-lived threads.
     
-    try:
-        # Configuration from environment variables
-        OTEL_ENDPOINT = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")
-        SERVICE_NAME = os.getenv("SERVICE_NAME", "beeai-faq-agent")
-        ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
-        
-        print(f"🔧 Setting up Splunk SignalFX OTEL integration...")
-        print(f"   Endpoint: {OTEL_ENDPOINT}")
-        print(f"   Service: {SERVICE_NAME}")
-        print(f"   Environment: {ENVIRONMENT}")
-        
-        # Create resource with service information
-        resource = Resource.create({
-            "service.name": SERVICE_NAME,
-            "service.version": "1.0.0",
-            "deployment.environment": ENVIRONMENT,
-            "telemetry.sdk.name": "beeai-framework",
-            "telemetry.sdk.version": "0.1.17"
-        })
-        
-        # Create tracer provider
-        tracer_provider = TracerProvider(resource=resource)
-        
-        # Create OTLP exporter for Splunk SignalFX
-        otlp_exporter = OTLPSpanExporter(
-            endpoint=OTEL_ENDPOINT,
-            headers={
-                # Add any required headers for your Splunk setup
-                # "Authorization": "Bearer your-token",
-                # "X-SF-TOKEN": "your-signalfx-token"
-            }
-        )
-        
-        # Add batch processor
-        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
-        
-        # Set as global tracer provider
-        trace.set_tracer_provider(tracer_provider)
-        
-        print("✅ Splunk SignalFX OTEL integration configured successfully")
-        return tracer_provider
-        
-    except Exception as e:
-        print(f"⚠️  Failed to configure Splunk SignalFX OTEL: {e}")
-        print("💡 Check your OTEL endpoint and configuration")
-        return None
+    Each loader runs in a copy of the caller's context so its load span nests
+    under the current startup span.
+    
+    Returns:
+        dict: Component name -> loaded component, or None if any loader failed
+    """
+    results, failed = {}, False
+    with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="rag-startup") as pool:
+        futures = {
+            name: pool.submit(contextvars.copy_context().run, _load_component, name, loader)
+            for name, loader in loaders.items()
+        }
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Error loading {name}: {e}")
+                failed = True
+    return None if failed else results
 
-def test_span_export(tracer_provider, endpoint: str):
-    """Test that spans can be exported successfully to verify connectivity."""
-    try:
-        print(f"🧪 Testing span export to {endpoint}...")
-        
-        # Create a test span
-        test_tracer = trace.get_tracer("span-test")
-        with test_tracer.start_as_current_span("test_span") as span:
-            span.set_attribute("test.attribute", "span_export_test")
-            span.set_attribute("test.timestamp", time.time())
-            span.set_attribute("test.service", "beeai-faq-agent")
-        
-        # Force export by shutting down the tracer provider
-        tracer_provider.force_flush()
-        
-        print("✅ Span export test completed successfully")
-        print("💡 Check your Splunk dashboard for the test span")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Span export test failed: {e}")
-        print("💡 Check your OTEL endpoint connectivity")
-        return False
+def _load_embedding_model():
+    model = create_embedding_backend(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND)
+    print(f"Embedding model loaded ({model.name} backend, {model.model_id}).")
+    return model
+
+def _load_chroma_collection():
+    chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_PATH)
+    collection = chroma_client.get_or_create_collection(name=CHROMA_COLLECTION_NAME)
+    print(f"ChromaDB collection '{CHROMA_COLLECTION_NAME}' ready with {collection.count()} documents.")
+    return collection
+
+def _llm_model_name() -> str:
+    """Name of the configured chat model, used for span attributes."""
+    if LLM_BACKEND == "fake":
+        return "fake-llm"
+    return os.environ.get("OPENAI_MODEL", "openai:gpt-4o")
+
+def _load_llm():
+    if LLM_BACKEND == "fake":
+        llm = FakeChatModel()
+        print("Fake LLM initialized (offline mode).")
+        return llm
+    llm = ChatModel.from_name(_llm_model_name())
+    print("OpenAI LLM initialized.")
+    return llm
+
+def _run_span_export_test(tracer_provider, endpoint: str):
+    """Runs the span export connectivity test (blocking force_flush) off the startup path."""
+    span_test_success = test_span_export(tracer_provider, endpoint, service="beeai-faq-agent")
+    if not span_test_success:
+        print("⚠️  Warning: Span export test failed - traces may not be reaching Splunk")
+    else:
+        print("✅ Span export test passed - traces are being sent to Splunk successfully")
+
+async def setup_rag_system_async() -> bool:
+    """
+    Initializes the RAG system without blocking the event loop.
+    
+    Returns:
+        bool: True if setup successful, False otherwise
+    """
+    return await asyncio.to_thread(_setup_rag_system)
 
 def _setup_rag_system():
     """
@@ -135,7 +237,25 @@ def _setup_rag_system():
     Returns:
         bool: True if setup successful, False otherwise
     """
-    global _embedding_model, _chroma_collection, _llm, _faq_tool_instance, _agent_workflow, _tracer_provider, _tracer
+    # Check if all components are already initialized
+    if _embedding_model and _chroma_collection and _llm and _faq_tool_instance and _agent_workflow:
+        print("RAG system already set up.")
+        return True
+
+    with _setup_lock:
+        return _initialize_rag_components()
+
+def _initialize_rag_components():
+    """
+    Creates the RAG system components; called by _setup_rag_system under the setup lock.
+    
+    Independent, slow components (embedding model, ChromaDB, LLM) are loaded
+    concurrently, so cold start takes roughly as long as the slowest of them.
+    
+    Returns:
+        bool: True if setup successful, False otherwise
+    """
+    global _startup_total_ms, _embedding_model, _embedding_batcher, _executor, _embedding_cache, _persistent_embedding_cache, _answer_cache, _vector_index, _chroma_collection, _llm, _faq_tool_instance, _agent_workflow, _llm_cassette, _tracer_provider, _tracer
 
     # Check if all components are already initialized
     if _embedding_model and _chroma_collection and _llm and _faq_tool_instance and _agent_workflow:
@@ -143,23 +263,29 @@ def _setup_rag_system():
         return True
 
     print("Setting up RAG system components...")
+    setup_start = time.perf_counter()
     
     # Step 0: Initialize OpenTelemetry for observability
     if OTEL_AVAILABLE:
         try:
-            _tracer_provider = setup_splunk_otel()
-            if _tracer_provider:
-                _tracer = trace.get_tracer("beeai-faq-agent")
+            telemetry_start = time.perf_counter()
+            first_setup = _tracer_provider is None
+            _tracer_provider = setup_telemetry(default_service_name="beeai-faq-agent", default_environment="production")
+            _component_load_times["telemetry"] = round((time.perf_counter() - telemetry_start) * 1000, 3)
+            if _tracer_provider and first_setup:
+                _tracer = get_tracer("beeai-faq-agent")
+                instrument_beeai()  # Idempotent: safe alongside any other startup hook
                 print("✅ OpenTelemetry tracer initialized for observability")
                 
-                # Test span export to verify connectivity
+                # Test span export to verify connectivity; its force_flush runs in the background
                 otel_endpoint = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")
-                span_test_success = test_span_export(_tracer_provider, otel_endpoint)
-                if not span_test_success:
-                    print("⚠️  Warning: Span export test failed - traces may not be reaching Splunk")
-                else:
-                    print("✅ Span export test passed - traces are being sent to Splunk successfully")
-            else:
+                threading.Thread(
+                    target=_run_span_export_test,
+                    args=(_tracer_provider, otel_endpoint),
+                    name="span-export-test",
+                    daemon=True,
+                ).start()
+            elif not _tracer_provider:
                 print("⚠️  OpenTelemetry setup failed - continuing without observability")
         except Exception as e:
             print(f"⚠️  Error setting up OpenTelemetry: {e}")
@@ -167,52 +293,151 @@ def _setup_rag_system():
     else:
         print("⚠️  OpenTelemetry not available - running without observability")
     
-    # Step 1: Initialize the embedding model for converting text to vectors
-    try:
-        _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-        print("Embedding model loaded.")
-    except Exception as e:
-        print(f"Error loading embedding model: {e}")
+    # Steps 1-3: Load the embedding model, ChromaDB collection and LLM concurrently
+    with _optional_span("rag_system_startup") as startup_span:
+        loaded = _load_components_in_parallel({
+            "embedding_model": _load_embedding_model,  # Converts text to vectors
+            "chroma_collection": _load_chroma_collection,  # Vector storage and retrieval
+            "llm": _load_llm,  # Generates responses
+        })
+        if startup_span:
+            startup_span.set_attribute("startup.status", "success" if loaded else "failed")
+            for name, load_ms in _component_load_times.items():
+                startup_span.set_attribute(f"startup.{name}_ms", load_ms)
+    if loaded is None:
         return False
+    _embedding_model = loaded["embedding_model"]
+    _chroma_collection = loaded["chroma_collection"]
+    _llm = loaded["llm"]
 
-    # Step 2: Initialize ChromaDB for vector storage and retrieval
+    # Step 1b: Create the executor that keeps embedding and search off the event loop
     try:
-        chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_PATH)
-        _chroma_collection = chroma_client.get_or_create_collection(name=CHROMA_COLLECTION_NAME)
-        print(f"ChromaDB collection '{CHROMA_COLLECTION_NAME}' ready with {_chroma_collection.count()} documents.")
+        if _executor is None:
+            _executor = BlockingExecutor(
+                mode=RAG_EXECUTION_MODE,
+                max_workers=RAG_EXECUTOR_MAX_WORKERS,
+                max_pending=RAG_EXECUTOR_MAX_PENDING,
+                process_workers=RAG_EMBEDDING_PROCESS_WORKERS,
+                process_initializer=init_embedding_worker,
+                process_initargs=(EMBEDDING_MODEL_NAME,),
+            )
+        print(f"RAG executor ready (mode: {_executor.mode}).")
     except Exception as e:
-        print(f"Error connecting to ChromaDB: {e}")
+        print(f"Error creating RAG executor: {e}")
         return False
 
-    # Step 3: Initialize the OpenAI LLM for generating responses
-    try:
-        _llm = ChatModel.from_name(os.environ.get("OPENAI_MODEL", "openai:gpt-4o"))
-        print("OpenAI LLM initialized.")
-    except Exception as e:
-        print(f"Error initializing LLM: {e}")
-        return False
+    # Step 1c: Create the query-embedding cache
+    if EMBEDDING_CACHE_ENABLED and _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+            max_bytes=EMBEDDING_CACHE_MAX_BYTES,
+            ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+        )
+        print(f"Embedding cache enabled (max {EMBEDDING_CACHE_MAX_ENTRIES} entries, TTL {EMBEDDING_CACHE_TTL_SECONDS}s).")
+
+    # Step 1d: Create the persistent embedding cache and map its files here, off the request path
+    if PERSISTENT_EMBEDDING_CACHE_ENABLED and _persistent_embedding_cache is None:
+        try:
+            cache = PersistentEmbeddingCache(
+                directory=PERSISTENT_EMBEDDING_CACHE_PATH,
+                model_name=_embedding_model.model_id,  # Fake and real embeddings never share entries
+                dtype=PERSISTENT_EMBEDDING_CACHE_DTYPE,
+                max_entries=PERSISTENT_EMBEDDING_CACHE_MAX_ENTRIES,
+                compaction_interval_s=PERSISTENT_EMBEDDING_CACHE_COMPACTION_INTERVAL_S,
+            )
+            cache.warm()
+            _persistent_embedding_cache = cache
+            print(f"Persistent embedding cache enabled at '{PERSISTENT_EMBEDDING_CACHE_PATH}'.")
+        except Exception as e:
+            print(f"⚠️  Persistent embedding cache disabled: {e}")
+
+    # Step 2b: Mirror small collections into an in-process NumPy index
+    if VECTOR_INDEX_ENABLED:
+        try:
+            _vector_index = _load_component(
+                "vector_index",
+                lambda: InMemoryVectorIndex.from_collection(_chroma_collection, max_rows=VECTOR_INDEX_MAX_ROWS),
+            )
+            if _vector_index is not None:
+                print(f"In-memory vector index loaded with {len(_vector_index)} rows.")
+            else:
+                print(f"Collection exceeds {VECTOR_INDEX_MAX_ROWS} rows - querying ChromaDB directly.")
+        except Exception as e:
+            _vector_index = None
+            print(f"⚠️  In-memory vector index unavailable, querying ChromaDB directly: {e}")
 
     # Step 4: Create the FAQ tool instance that combines embedding and search
-    _faq_tool_instance = FAQTool(embedding_model=_embedding_model, chroma_collection=_chroma_collection)
+    _faq_tool_instance = FAQTool(
+        embedding_model=_embedding_model,
+        chroma_collection=_chroma_collection,
+        executor=_executor,
+        embedding_cache=_embedding_cache,
+        persistent_embedding_cache=_persistent_embedding_cache,
+        vector_index=_vector_index,
+    )
+    if EMBEDDING_BATCHING_ENABLED:
+        _embedding_batcher = EmbeddingBatcher(
+            encode_fn=_faq_tool_instance._encode_texts,
+            max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS,
+        )
+        _faq_tool_instance.embedding_batcher = _embedding_batcher
+        print(f"Embedding micro-batching enabled (max {EMBEDDING_BATCH_MAX_SIZE} queries / {EMBEDDING_BATCH_MAX_WAIT_MS} ms).")
     print("FAQTool instance created.")
 
+    # Step 4b: Create the semantic answer cache that can skip the LLM entirely
+    if ANSWER_CACHE_ENABLED and _answer_cache is None:
+        _answer_cache = SemanticAnswerCache(
+            similarity_threshold=ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+            max_entries=ANSWER_CACHE_MAX_ENTRIES,
+        )
+        print(f"Semantic answer cache enabled (similarity >= {ANSWER_CACHE_SIMILARITY_THRESHOLD}).")
+
+    # Step 4c: Watch the collection so the vector index and cached answers never go stale
+    if VECTOR_INDEX_ENABLED or ANSWER_CACHE_ENABLED:
+        _start_collection_watcher()
+
     # Step 5: Create the agent workflow that orchestrates the FAQ answering process
     _agent_workflow = AgentWorkflow(name="Company FAQ Assistant")
     _agent_workflow.add_agent(
         name="FAQAgent",
         role="An expert in company FAQs.",
-        instructions=(
-            "You are an expert in company FAQs. Your primary goal is to answer questions based on the provided company FAQ information. "
-            "If company FAQ information is provided in the input, prioritize using it to answer the user's question. "
-            "If no relevant company FAQ information is provided or found, state that you cannot find the answer in the company FAQs. "
-            "Do NOT try to use the 'faq_lookup_tool' on your own if context is already provided, as the information has already been retrieved for you."
-        ),
+        instructions=FAQ_AGENT_INSTRUCTIONS,
         tools=[_faq_tool_instance],  # Give the agent access to the FAQ search tool
         llm=_llm,  # Provide the LLM for generating responses
     )
     print("Agent workflow created and agent added.")
+
+    # Step 5b: Open the LLM cassette when recording or replaying
+    if LLM_CASSETTE_MODE != CASSETTE_MODE_OFF and _llm_cassette is None:
+        try:
+            _llm_cassette = LLMCassette(
+                path=LLM_CASSETTE_PATH,
+                mode=LLM_CASSETTE_MODE,
+                miss_policy=LLM_CASSETTE_MISS_POLICY,
+                replay_speed=LLM_CASSETTE_REPLAY_SPEED,
+            )
+            print(f"LLM cassette in {LLM_CASSETTE_MODE} mode at '{LLM_CASSETTE_PATH}' ({_llm_cassette.entry_count} entries).")
+        except Exception as e:
+            print(f"Error opening LLM cassette: {e}")
+            return False
+    _startup_total_ms = round((time.perf_counter() - setup_start) * 1000, 3)
+    print(f"RAG system ready in {_startup_total_ms:.0f} ms (component load times: {_component_load_times}).")
     return True
 
+class FAQSearchResult(NamedTuple):
+    """
+    Structured outcome of an FAQ search.
+    
+    Besides the formatted context handed to the LLM, it carries the retrieved
+    FAQ ids and the query embedding so callers can reuse them (e.g. for caching).
+    """
+    context: str  # Formatted FAQ information or error message
+    faq_ids: List[str]  # Ids of the retrieved FAQ entries, in rank order
+    query_embedding: Optional[List[float]]  # Embedding of the query, None if embedding failed
+    status: str  # "success", "no_results" or "error"
+
 class FAQTool(Tool):
     """
     A custom tool that extends the BeeAI Tool class to provide FAQ search functionality.
@@ -244,22 +469,217 @@ class FAQTool(Tool):
         """Creates an emitter for tracking tool execution events."""
         return Emitter()
 
-    def __init__(self, embedding_model: SentenceTransformer, chroma_collection: chromadb.Collection):
+    def __init__(self, embedding_model: EmbeddingBackend, chroma_collection: chromadb.Collection,
+                 embedding_batcher: EmbeddingBatcher | None = None, executor: BlockingExecutor | None = None,
+                 embedding_cache: EmbeddingCache | None = None,
+                 persistent_embedding_cache: PersistentEmbeddingCache | None = None,
+                 vector_index: InMemoryVectorIndex | None = None):
         """
         Initialize the FAQ tool with required components.
         
         Args:
-            embedding_model: Model for converting text to embeddings
+            embedding_model: Embedding backend for converting text to embeddings
             chroma_collection: ChromaDB collection containing FAQ data
+            embedding_batcher: Optional micro-batcher used instead of encoding queries one by one
+            executor: Optional executor used to run embedding and search off the event loop
+            embedding_cache: Optional cache of previously computed query embeddings
+            persistent_embedding_cache: Optional on-disk cache consulted after the in-memory cache
+            vector_index: Optional in-memory mirror of the collection used instead of Chroma queries
         """
         super().__init__()
         self.embedding_model = embedding_model
         self.chroma_collection = chroma_collection
+        self.embedding_batcher = embedding_batcher
+        self.executor = executor
+        self.embedding_cache = embedding_cache
+        self.persistent_embedding_cache = persistent_embedding_cache
+        self.vector_index = vector_index
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Runs a blocking call on the executor, or inline when no executor is configured."""
+        if self.executor:
+            return await self.executor.run(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    async def _query_collection(self, query_embeddings: List[List[float]], n_results: int = 3) -> dict:
+        """
+        Finds the nearest FAQ entries for one or more query embeddings.
+        
+        Uses the in-memory vector index when one is loaded (a single matrix
+        product, cheap enough to run inline) and ChromaDB otherwise.
+        """
+        if self.vector_index is not None:
+            return self.vector_index.query(query_embeddings, n_results=n_results, include=['documents', 'metadatas'])
+        return await self._run_blocking(
+            self.chroma_collection.query,
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            include=['documents', 'metadatas']  # Include both content and metadata
+        )
+
+    async def _encode_texts(self, texts: List[str]):
+        """
+        Encodes a list of texts into an embedding matrix.
+        
+        Uses the executor's process pool when one is configured, otherwise the
+        thread pool (or the event loop when running inline).
+        """
+        if self.executor and self.executor.uses_process_pool:
+            return await self.executor.run_cpu(encode_in_worker, texts, EMBEDDING_BATCH_MAX_SIZE)
+        return await self._run_blocking(self.embedding_model.encode, texts, batch_size=EMBEDDING_BATCH_MAX_SIZE)
+
+    async def _embed_query(self, query: str, span=None) -> List[float]:
+        """
+        Converts a query to its embedding vector.
+        
+        The normalized query is looked up in the in-memory embedding cache first,
+        then in the persistent on-disk cache. On a miss, the query joins the
+        current micro-batch (when enabled) and is encoded together with other
+        concurrent queries.
+        
+        Args:
+            query: The user's question to embed
+            span: Optional span that receives cache attributes
+            
+        Returns:
+            List[float]: The query embedding
+        """
+        cache_key = normalize_query(query)
+        if self.embedding_cache:
+            cached = self.embedding_cache.get(cache_key)
+            if span:
+                stats = self.embedding_cache.get_stats()
+                span.set_attribute("embedding.cache_hit", cached is not None)
+                span.set_attribute("embedding.cache_hits", stats["hits"])
+                span.set_attribute("embedding.cache_misses", stats["misses"])
+                span.set_attribute("embedding.cache_evictions", stats["evictions"])
+            if cached is not None:
+                return cached
+
+        if self.persistent_embedding_cache:
+            persisted = self.persistent_embedding_cache.get(cache_key)
+            if span:
+                span.set_attribute("embedding.persistent_cache_hit", persisted is not None)
+            if persisted is not None:
+                if self.embedding_cache:
+                    self.embedding_cache.put(cache_key, persisted)
+                return persisted
+
+        if self.embedding_batcher:
+            query_embedding = (await self.embedding_batcher.encode(query)).tolist()
+        else:
+            query_embedding = (await self._encode_texts([query]))[0].tolist()
+
+        if self.embedding_cache:
+            self.embedding_cache.put(cache_key, query_embedding)
+        if self.persistent_embedding_cache:
+            self.persistent_embedding_cache.put(cache_key, query_embedding)
+        return query_embedding
+
+    @staticmethod
+    def _format_contexts(documents: List[str], metadatas: List[dict]) -> List[str]:
+        """Formats retrieved FAQ documents and their metadata as question/answer blocks."""
+        retrieved_contexts = []
+        for doc_content, metadata in zip(documents, metadatas):
+            metadata = metadata or {}
+            question = metadata.get('question', 'N/A')  # Extract question from metadata
+            answer = metadata.get('answer', doc_content)  # Extract answer or use content
+            retrieved_contexts.append(f"Question: {question}\nAnswer: {answer}")
+        return retrieved_contexts
+
+    async def search_batch(self, queries: List[str]) -> List[FAQSearchResult]:
+        """
+        Searches the FAQs for many queries at once.
+        
+        Queries missing from the embedding caches are embedded in a single encode
+        call, and all embeddings are sent to ChromaDB in a single multi-query
+        request.
+        
+        Args:
+            queries: The questions to search for
+            
+        Returns:
+            List[FAQSearchResult]: One result per query, in input order
+        """
+        with _optional_span("faq_tool_batch_execution") as span:
+            if span:
+                span.set_attribute("tool.name", self.name)
+                span.set_attribute("faq.batch_size", len(queries))
+            try:
+                # Step 1: Reuse cached embeddings and encode the rest in one call
+                embeddings: List[Optional[List[float]]] = [None] * len(queries)
+                missing = []
+                for i, query in enumerate(queries):
+                    cache_key = normalize_query(query)
+                    cached = self.embedding_cache.get(cache_key) if self.embedding_cache else None
+                    if cached is None and self.persistent_embedding_cache:
+                        cached = self.persistent_embedding_cache.get(cache_key)
+                    if cached is None:
+                        missing.append(i)
+                    else:
+                        embeddings[i] = cached
+
+                with _optional_span("query_embedding") as embedding_span:
+                    if missing:
+                        vectors = await self._encode_texts([queries[i] for i in missing])
+                        for i, vector in zip(missing, vectors):
+                            embeddings[i] = vector.tolist()
+                            cache_key = normalize_query(queries[i])
+                            if self.embedding_cache:
+                                self.embedding_cache.put(cache_key, embeddings[i])
+                            if self.persistent_embedding_cache:
+                                self.persistent_embedding_cache.put(cache_key, embeddings[i])
+                    if embedding_span:
+                        embedding_span.set_attribute("embedding.batch_size", len(queries))
+                        embedding_span.set_attribute("embedding.encoded_count", len(missing))
+
+                # Step 2: One multi-query ChromaDB search for the whole batch
+                with _optional_span("chroma_search") as search_span:
+                    results = await self._query_collection(embeddings, n_results=3)
+                    if search_span:
+                        search_span.set_attribute("chroma.collection", CHROMA_COLLECTION_NAME)
+                        search_span.set_attribute("chroma.backend", "numpy" if self.vector_index is not None else "chroma")
+                        search_span.set_attribute("chroma.query_count", len(embeddings))
+            except Exception as e:
+                if span:
+                    span.set_attribute("faq.status", "error")
+                    span.set_attribute("error.message", str(e))
+                    span.set_attribute("error.type", type(e).__name__)
+                print(f"Error in batched FAQ tool execution: {e}")
+                error = f"Error processing query for FAQ lookup: {e}"
+                return [FAQSearchResult(error, [], None, "error") for _ in queries]
+
+            # Step 3: Format each query's results
+            search_results = []
+            for i in range(len(queries)):
+                documents = results['documents'][i] if results.get('documents') else []
+                metadatas = results['metadatas'][i] if results.get('metadatas') else [{}] * len(documents)
+                faq_ids = results['ids'][i] if results.get('ids') else []
+                retrieved_contexts = self._format_contexts(documents, metadatas)
+                if retrieved_contexts:
+                    search_results.append(FAQSearchResult("\n\n".join(retrieved_contexts), list(faq_ids), embeddings[i], "success"))
+                else:
+                    search_results.append(FAQSearchResult("No relevant information found in the FAQs.", [], embeddings[i], "no_results"))
+            if span:
+                span.set_attribute("faq.status", "success")
+            return search_results
 
     async def _run(self, query: str) -> str:
         """
         Main execution method for the FAQ tool.
         
+        Args:
+            query: The user's question to search for
+            
+        Returns:
+            str: Formatted FAQ information or error message
+        """
+        return (await self.search(query)).context
+
+    async def search(self, query: str) -> FAQSearchResult:
+        """
+        Performs the FAQ semantic search.
+        
         This method performs semantic search by:
         1. Converting the query to embeddings
         2. Searching ChromaDB for similar FAQ content
@@ -269,8 +689,9 @@ class FAQTool(Tool):
             query: The user's question to search for
             
         Returns:
-            str: Formatted FAQ information or error message
+            FAQSearchResult: Formatted FAQ information plus retrieved ids and query embedding
         """
+        query_embedding = None
         # Start OpenTelemetry span for FAQ tool execution
         if _tracer:
             with _tracer.start_as_current_span("faq_tool_execution") as span:
@@ -282,10 +703,13 @@ class FAQTool(Tool):
                 try:
                     # Step 1: Convert the user query to embeddings for semantic search
                     with _tracer.start_as_current_span("query_embedding") as embedding_span:
-                        embedding_span.set_attribute("embedding.model", "sentence-transformers")
-                        embedding_span.set_attribute("embedding.model_name", "all-MiniLM-L6-v2")
+                        embedding_span.set_attribute("embedding.model", self.embedding_model.name)
+                        embedding_span.set_attribute("embedding.model_name", self.embedding_model.model_id)
                         
-                        query_embedding = self.embedding_model.encode(query).tolist()
+                        embedding_span.set_attribute("embedding.batched", self.embedding_batcher is not None)
+                        embedding_span.set_attribute("embedding.execution_mode", self.executor.mode if self.executor else "inline")
+                        
+                        query_embedding = await self._embed_query(query, span=embedding_span)
                         embedding_span.set_attribute("embedding.vector_size", len(query_embedding))
                         embedding_span.set_attribute("embedding.success", True)
                     
@@ -293,12 +717,10 @@ class FAQTool(Tool):
                     with _tracer.start_as_current_span("chroma_search") as search_span:
                         search_span.set_attribute("chroma.collection", CHROMA_COLLECTION_NAME)
                         search_span.set_attribute("chroma.n_results", 3)
+                        search_span.set_attribute("chroma.backend", "numpy" if self.vector_index is not None else "chroma")
                         
-                        results = self.chroma_collection.query(
-                            query_embeddings=[query_embedding],  # Search using the query embedding
-                            n_results=3,  # Return top 3 most similar results
-                            include=['documents', 'metadatas']  # Include both content and metadata
-                        )
+                        # Search using the query embedding, returning the top 3 most similar results
+                        results = await self._query_collection([query_embedding], n_results=3)
                         
                         search_span.set_attribute("chroma.results_count", len(results.get('documents', [[]])[0]) if results and results.get('documents') else 0)
                         search_span.set_attribute("chroma.search_success", True)
@@ -306,6 +728,7 @@ class FAQTool(Tool):
                     # Step 3: Process and format the search results
                     with _tracer.start_as_current_span("result_processing") as process_span:
                         retrieved_contexts = []
+                        faq_ids = results['ids'][0] if results and results.get('ids') else []
                         if results and results.get('documents') and results['documents'][0]:
                             # Iterate through the retrieved documents and format them
                             for i in range(len(results['documents'][0])):
@@ -322,7 +745,7 @@ class FAQTool(Tool):
                     if not retrieved_contexts:
                         span.set_attribute("faq.no_results", True)
                         span.set_attribute("faq.status", "no_results")
-                        return "No relevant information found in the FAQs."
+                        return FAQSearchResult("No relevant information found in the FAQs.", [], query_embedding, "no_results")
                     
                     # Step 5: Combine all retrieved contexts into a single formatted string
                     context_string = "\n\n".join(retrieved_contexts)
@@ -330,7 +753,7 @@ class FAQTool(Tool):
                     span.set_attribute("faq.status", "success")
                     span.set_attribute("faq.response_length", len(context_string))
                     
-                    return context_string
+                    return FAQSearchResult(context_string, list(faq_ids), query_embedding, "success")
                     
                 except Exception as e:
                     # Set span attributes for error
@@ -340,22 +763,20 @@ class FAQTool(Tool):
                     
                     # Log error for observability
                     print(f"Error in FAQ tool execution: {e}")
-                    return f"Error processing query for FAQ lookup: {e}"
+                    return FAQSearchResult(f"Error processing query for FAQ lookup: {e}", [], query_embedding, "error")
         else:
             # Fallback without OpenTelemetry
             try:
                 # Step 1: Convert the user query to embeddings for semantic search
-                query_embedding = self.embedding_model.encode(query).tolist()
+                query_embedding = await self._embed_query(query)
                 
                 # Step 2: Search ChromaDB for similar FAQ content using vector similarity
-                results = self.chroma_collection.query(
-                    query_embeddings=[query_embedding],  # Search using the query embedding
-                    n_results=3,  # Return top 3 most similar results
-                    include=['documents', 'metadatas']  # Include both content and metadata
-                )
+                # Search using the query embedding, returning the top 3 most similar results
+                results = await self._query_collection([query_embedding], n_results=3)
                 
                 # Step 3: Process and format the search results
                 retrieved_contexts = []
+                faq_ids = results['ids'][0] if results and results.get('ids') else []
                 if results and results.get('documents') and results['documents'][0]:
                     # Iterate through the retrieved documents and format them
                     for i in range(len(results['documents'][0])):
@@ -367,19 +788,156 @@ class FAQTool(Tool):
                 
                 # Step 4: Handle case where no relevant information is found
                 if not retrieved_contexts:
-                    return "No relevant information found in the FAQs."
+                    return FAQSearchResult("No relevant information found in the FAQs.", [], query_embedding, "no_results")
                 
                 # Step 5: Combine all retrieved contexts into a single formatted string
                 context_string = "\n\n".join(retrieved_contexts)
-                return context_string
+                return FAQSearchResult(context_string, list(faq_ids), query_embedding, "success")
                 
             except Exception as e:
-                return f"Error processing query for FAQ lookup: {e}"
+                return FAQSearchResult(f"Error processing query for FAQ lookup: {e}", [], query_embedding, "error")
+
+def _lookup_cached_answer(search_result: FAQSearchResult):
+    """
+    Looks up a previously generated answer for the given search result.
+    
+    Returns:
+        CachedAnswer or None when caching is disabled, retrieval failed or nothing matches
+    """
+    if not _answer_cache or search_result.status == "error" or search_result.query_embedding is None:
+        return None
+    return _answer_cache.lookup(search_result.faq_ids, search_result.query_embedding)
+
+def _store_cached_answer(search_result: FAQSearchResult, answer: str, generation_ms: float):
+    """Stores a freshly generated answer in the semantic answer cache."""
+    if not _answer_cache or search_result.status == "error" or search_result.query_embedding is None:
+        return
+    _answer_cache.store(search_result.faq_ids, search_result.query_embedding, answer, generation_ms)
+
+def refresh_vector_index():
+    """
+    Reloads the in-memory vector index from the Chroma collection and drops cached answers.
+    
+    Collection changes are picked up automatically every
+    FAQ_COLLECTION_CHECK_INTERVAL_S; ingestion code should still call this right
+    after modifying the collection so no request is answered from the old
+    snapshot in between. If the collection has grown beyond
+    VECTOR_INDEX_MAX_ROWS, lookups fall back to ChromaDB.
+    """
+    global _vector_index, _collection_version
+    if _chroma_collection is None:
+        return
+    _collection_version = _faq_collection_version()
+    if VECTOR_INDEX_ENABLED:
+        _vector_index = InMemoryVectorIndex.from_collection(_chroma_collection, max_rows=VECTOR_INDEX_MAX_ROWS)
+        if _faq_tool_instance:
+            _faq_tool_instance.vector_index = _vector_index
+        print(f"In-memory vector index rebuilt ({len(_vector_index) if _vector_index is not None else 0} rows).")
+    # Answers were generated from the old FAQ content
+    invalidate_answer_cache(reason=f"FAQ collection changed (version {_collection_version})")
+
+def _faq_collection_version() -> str:
+    """Hash of every id, document and metadata in the collection; changes with any edit, not just the count."""
+    data = _chroma_collection.get(include=["documents", "metadatas"])
+    rows = zip(data["ids"], data.get("documents") or [None] * len(data["ids"]), data.get("metadatas") or [None] * len(data["ids"]))
+    digest = hashlib.blake2b(digest_size=16)
+    for row in sorted(rows, key=lambda r: r[0]):
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+def _watch_faq_collection():
+    """Rebuilds the state derived from the collection whenever its content version changes."""
+    while True:
+        time.sleep(FAQ_COLLECTION_CHECK_INTERVAL_S)
+        try:
+            if _faq_collection_version() != _collection_version:
+                print("FAQ collection changed - rebuilding derived state.")
+                refresh_vector_index()
+        except Exception as e:
+            print(f"⚠️  FAQ collection change check failed: {e}")
+
+def _start_collection_watcher():
+    global _collection_watcher, _collection_version
+    if _collection_watcher is not None or FAQ_COLLECTION_CHECK_INTERVAL_S <= 0 or _chroma_collection is None:
+        return
+    try:
+        _collection_version = _faq_collection_version()  # Baseline of what was just loaded
+    except Exception as e:
+        print(f"⚠️  FAQ collection change detection disabled: {e}")
+        return
+    _collection_watcher = threading.Thread(target=_watch_faq_collection, name="faq-collection-watcher", daemon=True)
+    _collection_watcher.start()
+
+def invalidate_answer_cache(reason: str = "explicit"):
+    """
+    Drops all cached answers.
+    
+    refresh_vector_index() calls this whenever the collection's content changes
+    (edits included, not only a different document count).
+    """
+    if _answer_cache:
+        _answer_cache.invalidate(reason=reason)
 
 async def run_faq_agent(user_query: str) -> str:
     """
     Main function to run the FAQ agent workflow.
     
+    Concurrent requests for the same (normalized) question are coalesced: the
+    first one runs the pipeline and the others wait for and share its answer.
+    
+    Args:
+        user_query: The user's question about company FAQs
+        
+    Returns:
+        str: The agent's response to the user's question
+    """
+    if not _single_flight:
+        return await _run_faq_pipeline(user_query)
+
+    key = normalize_query(user_query)
+    flight = _single_flight.get(key)
+    if flight is not None:
+        return await _follow_flight(flight, user_query)
+    return await _single_flight.run(key, lambda leader_flight: _run_faq_pipeline(user_query, leader_flight))
+
+async def _follow_flight(flight: Flight, user_query: str) -> str:
+    """
+    Waits for an identical in-flight query and returns its answer.
+    
+    The follower's span links to the leader's faq_agent_workflow span so the
+    shared work can be found from either trace, and carries the leader's status.
+    If the leader is cancelled, the query runs again (the first follower to
+    retry leads, the others coalesce with it).
+    """
+    print("Coalescing with an identical in-flight query...")
+    if _tracer:
+        links = [trace.Link(flight.leader_span_context)] if flight.leader_span_context else []
+        with _tracer.start_as_current_span("faq_agent_workflow", links=links) as span:
+            span.set_attribute("workflow.name", "Company FAQ Assistant")
+            span.set_attribute("workflow.query_length", len(user_query))
+            span.set_attribute("workflow.coalesced", True)
+            try:
+                answer = await flight.wait()
+            except FlightCancelledError:
+                span.set_attribute("workflow.leader_cancelled", True)
+                return await run_faq_agent(user_query)
+            span.set_attribute("workflow.status", flight.status or "unknown")
+            return answer
+    try:
+        return await flight.wait()
+    except FlightCancelledError:
+        return await run_faq_agent(user_query)
+
+def _set_workflow_status(span, flight: Flight | None, status: str) -> None:
+    """Sets workflow.status on the leader's span and reports it to coalesced followers."""
+    span.set_attribute("workflow.status", status)
+    if flight:
+        flight.status = status
+
+async def _run_faq_pipeline(user_query: str, flight: Flight | None = None) -> str:
+    """
+    Runs the full FAQ answering pipeline for one query.
+    
     This function orchestrates the entire FAQ answering process:
     1. Ensures the RAG system is properly initialized
     2. Searches for relevant FAQ information
@@ -387,6 +945,7 @@ async def run_faq_agent(user_query: str) -> str:
     
     Args:
         user_query: The user's question about company FAQs
+        flight: The coalesced execution this run leads, if any
         
     Returns:
         str: The agent's response to the user's question
@@ -394,6 +953,9 @@ async def run_faq_agent(user_query: str) -> str:
     # Start OpenTelemetry span for the main FAQ agent workflow
     if _tracer:
         with _tracer.start_as_current_span("faq_agent_workflow") as span:
+            if flight:
+                flight.leader_span_context = span.get_span_context()
+                span.set_attribute("workflow.coalesced", False)
             span.set_attribute("workflow.name", "Company FAQ Assistant")
             span.set_attribute("workflow.query", user_query)
             span.set_attribute("workflow.query_length", len(user_query))
@@ -404,7 +966,7 @@ async def run_faq_agent(user_query: str) -> str:
                 with _tracer.start_as_current_span("rag_system_setup") as setup_span:
                     if not _setup_rag_system():
                         setup_span.set_attribute("setup.status", "failed")
-                        span.set_attribute("workflow.status", "setup_failed")
+                        _set_workflow_status(span, flight, "setup_failed")
                         return "Backend RAG system failed to initialize. Please check server logs."
                     setup_span.set_attribute("setup.status", "success")
                 
@@ -412,9 +974,20 @@ async def run_faq_agent(user_query: str) -> str:
                 print("Calling the faq_lookup_tool...")
                 with _tracer.start_as_current_span("faq_tool_execution") as tool_span:
                     tool_span.set_attribute("tool.name", "faq_lookup_tool")
-                    retrieved_info = await _faq_tool_instance._run(user_query)
+                    search_result = await _faq_tool_instance.search(user_query)
+                    retrieved_info = search_result.context
                     tool_span.set_attribute("tool.response_length", len(retrieved_info))
                     tool_span.set_attribute("tool.success", True)
+                
+                # Step 1b: Serve near-identical questions from the semantic answer cache
+                cached = _lookup_cached_answer(search_result)
+                span.set_attribute("workflow.cache_hit", cached is not None)
+                if cached:
+                    span.set_attribute("workflow.cache_similarity", cached.similarity)
+                    span.set_attribute("workflow.cache_saved_ms", cached.generation_ms)
+                    span.set_attribute("workflow.cache_age_s", cached.age_s)
+                    _set_workflow_status(span, flight, "success")
+                    return cached.answer
                
                 # Step 2: Build a comprehensive prompt combining retrieved info and user question
                 # This gives the LLM context about relevant FAQs before asking it to answer
@@ -428,26 +1001,23 @@ async def run_faq_agent(user_query: str) -> str:
                 # Step 3: Run the agent workflow to generate the final answer
                 with _tracer.start_as_current_span("agent_workflow_execution") as workflow_span:
                     workflow_span.set_attribute("workflow.agent_name", "FAQAgent")
-                    workflow_span.set_attribute("workflow.llm_model", "openai:gpt-4o")
+                    workflow_span.set_attribute("workflow.llm_model", _llm_model_name())
+                    workflow_span.set_attribute("workflow.llm_cassette_mode", LLM_CASSETTE_MODE)
                     
-                    response = await _agent_workflow.run(
-                        inputs=[
-                            AgentWorkflowInput(
-                                prompt=prompt_for_agent,  # Send the combined prompt to the agent
-                            )
-                        ]
-                    )
-                    
-                    final_answer = response.result.final_answer
+                    generation_start = time.perf_counter()
+                    final_answer = await _generate_answer(prompt_for_agent)  # Send the combined prompt to the agent
+                    generation_ms = (time.perf_counter() - generation_start) * 1000
+                    _store_cached_answer(search_result, final_answer, generation_ms)
+                    workflow_span.set_attribute("workflow.generation_ms", generation_ms)
                     workflow_span.set_attribute("workflow.response_length", len(final_answer))
                     workflow_span.set_attribute("workflow.success", True)
-                    span.set_attribute("workflow.status", "success")
+                    _set_workflow_status(span, flight, "success")
                     
                     return final_answer  # Extract the agent's response
                     
             except Exception as e:
                 # Set span attributes for error
-                span.set_attribute("workflow.status", "error")
+                _set_workflow_status(span, flight, "error")
                 span.set_attribute("error.message", str(e))
                 span.set_attribute("error.type", type(e).__name__)
                 
@@ -461,7 +1031,13 @@ async def run_faq_agent(user_query: str) -> str:
 
         # Step 1: Manually call the FAQ tool to retrieve relevant information
         print("Calling the faq_lookup_tool...")
-        retrieved_info = await _faq_tool_instance._run(user_query)
+        search_result = await _faq_tool_instance.search(user_query)
+        retrieved_info = search_result.context
+
+        # Step 1b: Serve near-identical questions from the semantic answer cache
+        cached = _lookup_cached_answer(search_result)
+        if cached:
+            return cached.answer
        
         # Step 2: Build a comprehensive prompt combining retrieved info and user question
         # This gives the LLM context about relevant FAQs before asking it to answer
@@ -469,18 +1045,272 @@ async def run_faq_agent(user_query: str) -> str:
 
         # Step 3: Run the agent workflow to generate the final answer
         try:
-            response = await _agent_workflow.run(
-                inputs=[
-                    AgentWorkflowInput(
-                        prompt=prompt_for_agent,  # Send the combined prompt to the agent
-                    )
-                ]
-            )
-            return response.result.final_answer  # Extract the agent's response
+            generation_start = time.perf_counter()
+            final_answer = await _generate_answer(prompt_for_agent)  # Send the combined prompt to the agent
+            _store_cached_answer(search_result, final_answer, (time.perf_counter() - generation_start) * 1000)
+            return final_answer
         except Exception as e:
             print(f"Error running agent workflow: {e}")
             return f"An error occurred while processing your request: {e}"
 
+async def _run_agent_workflow(prompt: str, timer: TokenTimer) -> str:
+    """Runs the agent workflow on a prompt, reporting streamed LLM tokens to `timer`."""
+    def on_event(data, event):
+        if event.name == "new_token":
+            timer.on_token(data.value.get_text_content())
+
+    response = await _agent_workflow.run(
+        inputs=[AgentWorkflowInput(prompt=prompt)]
+    ).observe(lambda emitter: emitter.match("*.*", on_event))
+    return response.result.final_answer  # Extract the agent's response
+
+async def _generate_answer(prompt: str) -> str:
+    """
+    Generates the final answer for a prompt with the agent workflow.
+    
+    When an LLM cassette is active, the exchange is recorded to it or replayed
+    from it with the recorded latency profile.
+    """
+    if _llm_cassette:
+        return await _llm_cassette.run(prompt, lambda timer: _run_agent_workflow(prompt, timer))
+    return await _run_agent_workflow(prompt, TokenTimer())
+
+def _optional_span(name: str, **kwargs):
+    """Starts a span when tracing is enabled, otherwise a no-op context yielding None."""
+    if _tracer:
+        return _tracer.start_as_current_span(name, **kwargs)
+    return contextlib.nullcontext()
+
+async def stream_faq_agent(user_query: str) -> AsyncIterator[dict]:
+    """
+    Streams the FAQ answering process as a sequence of events.
+    
+    Retrieval runs exactly as in run_faq_agent. The answer is then generated by
+    calling the agent's ChatModel directly with streaming enabled (the agent
+    workflow only returns the final answer), forwarding each new token as soon as
+    the model produces it. With an LLM cassette active, the streamed call is
+    recorded to or replayed from it like the non-streaming path.
+    
+    Args:
+        user_query: The user's question about company FAQs
+        
+    Yields:
+        dict: Events of the form {"event": "status" | "token" | "done" | "error", "data": {...}}
+    """
+    request_start = time.perf_counter()
+    with _optional_span("faq_agent_workflow") as span:
+        if span:
+            span.set_attribute("workflow.name", "Company FAQ Assistant")
+            span.set_attribute("workflow.query", user_query)
+            span.set_attribute("workflow.query_length", len(user_query))
+            span.set_attribute("workflow.streaming", True)
+
+        if not _setup_rag_system():
+            if span:
+                span.set_attribute("workflow.status", "setup_failed")
+            yield {"event": "error", "data": {"message": "Backend RAG system failed to initialize. Please check server logs."}}
+            return
+
+        # Step 1: Retrieve relevant FAQ information
+        yield {"event": "status", "data": {"stage": "retrieval", "status": "started"}}
+        with _optional_span("faq_tool_execution") as tool_span:
+            search_result = await _faq_tool_instance.search(user_query)
+            if tool_span:
+                tool_span.set_attribute("tool.name", "faq_lookup_tool")
+                tool_span.set_attribute("tool.response_length", len(search_result.context))
+        yield {"event": "status", "data": {"stage": "retrieval", "status": search_result.status, "faq_count": len(search_result.faq_ids)}}
+
+        # Step 1b: Serve near-identical questions from the semantic answer cache
+        cached = _lookup_cached_answer(search_result)
+        if span:
+            span.set_attribute("workflow.cache_hit", cached is not None)
+        if cached:
+            if span:
+                span.set_attribute("workflow.cache_saved_ms", cached.generation_ms)
+                span.set_attribute("workflow.status", "success")
+            yield {"event": "token", "data": {"text": cached.answer}}
+            yield {"event": "done", "data": {"answer_length": len(cached.answer), "cached": True}}
+            return
+
+        # Step 2: Build the prompt and stream the answer tokens from the LLM
+        prompt_for_agent = f"Retrieved Company FAQ Information:\n{search_result.context}\n\nUser Question: {user_query}"
+        yield {"event": "status", "data": {"stage": "generation", "status": "started"}}
+
+        with _optional_span("agent_workflow_execution") as workflow_span:
+            if workflow_span:
+                workflow_span.set_attribute("workflow.agent_name", "FAQAgent")
+                workflow_span.set_attribute("workflow.llm_model", _llm_model_name())
+                workflow_span.set_attribute("workflow.streaming", True)
+
+            async def llm_tokens() -> AsyncIterator[str]:
+                """Streams the ChatModel's tokens as they are produced."""
+                token_queue: asyncio.Queue = asyncio.Queue()
+                end_of_stream = object()
+
+                def on_new_token(data, event):
+                    token_queue.put_nowait(data.value.get_text_content())
+
+                async def generate():
+                    try:
+                        await _llm.create(
+                            messages=[SystemMessage(FAQ_AGENT_INSTRUCTIONS), UserMessage(prompt_for_agent)],
+                            stream=True,
+                        ).observe(lambda emitter: emitter.on("new_token", on_new_token))
+                    finally:
+                        token_queue.put_nowait(end_of_stream)
+
+                generation_task = asyncio.create_task(generate())
+                try:
+                    while True:
+                        token = await token_queue.get()
+                        if token is end_of_stream:
+                            break
+                        yield token
+                    await generation_task  # Surface generation errors
+                finally:
+                    if not generation_task.done():
+                        generation_task.cancel()  # Client disconnected mid-stream
+
+            if _llm_cassette:
+                # Keyed by system + user message: the direct ChatModel call differs from the agent workflow's
+                tokens = _llm_cassette.run_stream(f"{FAQ_AGENT_INSTRUCTIONS}\n\n{prompt_for_agent}", llm_tokens)
+            else:
+                tokens = llm_tokens()
+
+            generation_start = time.perf_counter()
+            answer_parts = []
+            first_token_ms = None
+            try:
+                async for token in tokens:
+                    if not token:
+                        continue
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - generation_start) * 1000
+                        if workflow_span:
+                            workflow_span.set_attribute("workflow.time_to_first_token_ms", first_token_ms)
+                        if span:
+                            span.set_attribute("workflow.time_to_first_token_ms", (time.perf_counter() - request_start) * 1000)
+                    answer_parts.append(token)
+                    yield {"event": "token", "data": {"text": token}}
+            except Exception as e:
+                if span:
+                    span.set_attribute("workflow.status", "error")
+                    span.set_attribute("error.message", str(e))
+                    span.set_attribute("error.type", type(e).__name__)
+                print(f"Error streaming agent response: {e}")
+                yield {"event": "error", "data": {"message": f"An error occurred while processing your request: {e}"}}
+                return
+            finally:
+                await tokens.aclose()
+
+            final_answer = "".join(answer_parts)
+            generation_ms = (time.perf_counter() - generation_start) * 1000
+            _store_cached_answer(search_result, final_answer, generation_ms)
+            if workflow_span:
+                workflow_span.set_attribute("workflow.generation_ms", generation_ms)
+                workflow_span.set_attribute("workflow.tokens_streamed", len(answer_parts))
+                workflow_span.set_attribute("workflow.response_length", len(final_answer))
+                workflow_span.set_attribute("workflow.success", True)
+        if span:
+            span.set_attribute("workflow.status", "success")
+        yield {"event": "done", "data": {"answer_length": len(final_answer), "cached": False, "time_to_first_token_ms": first_token_ms}}
+
+async def run_faq_agent_batch(queries: List[str], max_concurrency: int = CHAT_BATCH_MAX_CONCURRENCY) -> List[dict]:
+    """
+    Answers a batch of FAQ questions.
+    
+    Retrieval is vectorized across the batch (one encode call, one Chroma
+    query); answers are then generated with at most `max_concurrency` LLM calls
+    in flight.
+    
+    Args:
+        queries: The users' questions
+        max_concurrency: Maximum number of concurrent agent workflow runs
+        
+    Returns:
+        List[dict]: Per-query results in input order with status, answer and timings
+    """
+    # Callers may pass any value; never exceed the server-side cap
+    max_concurrency = max(1, min(max_concurrency, CHAT_BATCH_MAX_CONCURRENCY_LIMIT))
+    batch_start = time.perf_counter()
+    with _optional_span("faq_agent_batch") as span:
+        if span:
+            span.set_attribute("batch.size", len(queries))
+            span.set_attribute("batch.max_concurrency", max_concurrency)
+
+        if not _setup_rag_system():
+            if span:
+                span.set_attribute("workflow.status", "setup_failed")
+            return [
+                {"index": i, "query": q, "status": "error", "answer": None,
+                 "error": "Backend RAG system failed to initialize. Please check server logs.", "timings": {}}
+                for i, q in enumerate(queries)
+            ]
+
+        # Step 1: Vectorized retrieval for the whole batch
+        retrieval_start = time.perf_counter()
+        search_results = await _faq_tool_instance.search_batch(queries)
+        retrieval_ms = (time.perf_counter() - retrieval_start) * 1000
+
+        # Step 2: Fan out answer generation with bounded concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def answer_one(index: int, query: str, search_result: FAQSearchResult) -> dict:
+            item = {"index": index, "query": query, "status": "success", "answer": None, "error": None, "cached": False}
+            queued_at = time.perf_counter()
+            async with semaphore:
+                generation_start = time.perf_counter()
+                try:
+                    cached = _lookup_cached_answer(search_result)
+                    if cached:
+                        item["answer"], item["cached"] = cached.answer, True
+                    else:
+                        prompt_for_agent = f"Retrieved Company FAQ Information:\n{search_result.context}\n\nUser Question: {query}"
+                        item["answer"] = await _generate_answer(prompt_for_agent)
+                        _store_cached_answer(search_result, item["answer"], (time.perf_counter() - generation_start) * 1000)
+                except Exception as e:
+                    item["status"], item["error"] = "error", str(e)
+                finished_at = time.perf_counter()
+            item["retrieval_status"] = search_result.status
+            item["timings"] = {
+                "retrieval_ms": round(retrieval_ms, 3),  # Shared by the whole batch
+                "queue_ms": round((generation_start - queued_at) * 1000, 3),
+                "generation_ms": round((finished_at - generation_start) * 1000, 3),
+                "total_ms": round((finished_at - batch_start) * 1000, 3),
+            }
+            return item
+
+        results = await asyncio.gather(*(
+            answer_one(i, query, search_result)
+            for i, (query, search_result) in enumerate(zip(queries, search_results))
+        ))
+
+        if span:
+            span.set_attribute("batch.retrieval_ms", retrieval_ms)
+            span.set_attribute("batch.error_count", sum(1 for r in results if r["status"] == "error"))
+            span.set_attribute("batch.cached_count", sum(1 for r in results if r["cached"]))
+            span.set_attribute("workflow.status", "success")
+        return list(results)
+
+def shutdown_rag_system():
+    """
+    Releases RAG system resources on application shutdown.
+    
+    Persists buffered embeddings and cassette recordings and stops the executor pools.
+    """
+    if _llm_cassette:
+        try:
+            _llm_cassette.close()
+        except Exception as e:
+            print(f"⚠️  Failed to write LLM cassette: {e}")
+    if _persistent_embedding_cache:
+        try:
+            _persistent_embedding_cache.close()
+        except Exception as e:
+            print(f"⚠️  Failed to persist embedding cache: {e}")
+    if _executor:
+        _executor.shutdown()
+
 def get_observability_data() -> dict:
     """
     Get observability data for monitoring the RAG system.
@@ -493,13 +1323,15 @@ def get_observability_data() -> dict:
             "embedding_model_loaded": _embedding_model is not None,
             "chroma_collection_ready": _chroma_collection is not None,
             "llm_initialized": _llm is not None,
+            "llm_backend": LLM_BACKEND,
             "faq_tool_ready": _faq_tool_instance is not None,
             "agent_workflow_ready": _agent_workflow is not None
         },
         "opentelemetry": {
             "available": OTEL_AVAILABLE,
             "tracer_provider_ready": _tracer_provider is not None,
-            "tracer_ready": _tracer is not None
+            "tracer_ready": _tracer is not None,
+            "telemetry": get_telemetry_stats() if OTEL_AVAILABLE else {}
         },
         "chroma_db": {
             "collection_name": CHROMA_COLLECTION_NAME,
@@ -508,8 +1340,24 @@ def get_observability_data() -> dict:
         },
         "embedding_model": {
             "name": EMBEDDING_MODEL_NAME,
+            "backend": EMBEDDING_BACKEND,
+            "model_id": _embedding_model.model_id if _embedding_model else None,
             "loaded": _embedding_model is not None
         },
+        "llm_cassette": _llm_cassette.get_stats() if _llm_cassette else {"mode": LLM_CASSETTE_MODE},
+        "fake_llm": _llm.fake_llm.get_stats() if isinstance(_llm, FakeChatModel) else {"enabled": False},
+        "embedding_batcher": _embedding_batcher.get_stats() if _embedding_batcher else {"enabled": False},
+        "embedding_cache": _embedding_cache.get_stats() if _embedding_cache else {"enabled": False},
+        "persistent_embedding_cache": _persistent_embedding_cache.get_stats() if _persistent_embedding_cache else {"enabled": False},
+        "startup": {
+            "total_ms": _startup_total_ms,
+            "component_load_ms": dict(_component_load_times)
+        },
+        "vector_index": _vector_index.get_stats() if _vector_index is not None else {"enabled": False, "max_rows": VECTOR_INDEX_MAX_ROWS},
+        "faq_collection": {"version": _collection_version, "check_interval_s": FAQ_COLLECTION_CHECK_INTERVAL_S},
+        "answer_cache": _answer_cache.get_stats() if _answer_cache else {"enabled": False},
+        "single_flight": _single_flight.get_stats() if _single_flight else {"enabled": False},
+        "executor": _executor.get_stats() if _executor else {"mode": RAG_EXECUTION_MODE, "ready": False},
         "status": "ready" if all([
             _embedding_model, _chroma_collection, _llm, 
             _faq_tool_instance, _agent_workflow
@@ -0,0 +1,156 @@
+# backend/answer_cache.py
+# Semantic answer cache placed in front of the agent workflow. Questions that
+# retrieve the same set of FAQ entries and whose embeddings are nearly identical
+# get the previously generated answer back without calling the LLM.
+
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+
+class CachedAnswer(NamedTuple):
+    """A cache hit: the stored answer plus how it matched."""
+    answer: str
+    similarity: float  # Cosine similarity between the new query and the cached one
+    generation_ms: float  # LLM latency paid when the answer was originally generated
+    age_s: float  # Seconds since the answer was generated
+
+
+class _Entry:
+    __slots__ = ("unit_embedding", "answer", "generation_ms", "created_at")
+
+    def __init__(self, unit_embedding: array, answer: str, generation_ms: float, created_at: float):
+        self.unit_embedding = unit_embedding
+        self.answer = answer
+        self.generation_ms = generation_ms
+        self.created_at = created_at
+
+
+def _unit_vector(vector: Sequence[float]) -> array:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return array("f", (x / norm for x in vector))
+
+
+class SemanticAnswerCache:
+    """
+    LRU cache of generated answers keyed by the set of retrieved FAQ ids.
+
+    Within one key, a stored answer is reused when the cosine similarity between
+    the cached query embedding and the new one reaches `similarity_threshold`.
+    Entries expire after `ttl_seconds`, and the whole cache is dropped with
+    `invalidate()` when the FAQ collection changes.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl_seconds: float = 3600.0,
+                 max_entries: int = 2000, max_entries_per_key: int = 8):
+        """
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Lifetime of an answer; 0 disables expiry
+            max_entries: Maximum number of cached answers overall
+            max_entries_per_key: Maximum number of answers kept per FAQ id set
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_entries_per_key = max_entries_per_key
+
+        self._entries: "OrderedDict[tuple, List[_Entry]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.saved_ms = 0.0  # Total LLM latency avoided by hits
+
+    @staticmethod
+    def make_key(faq_ids: Iterable[str]) -> tuple:
+        """Builds the cache key from the retrieved FAQ ids (order-insensitive)."""
+        return tuple(sorted(faq_ids))
+
+    def lookup(self, faq_ids: Iterable[str], query_embedding: Sequence[float]) -> Optional[CachedAnswer]:
+        """
+        Finds a cached answer for the retrieved FAQ ids and query embedding.
+
+        Returns:
+            CachedAnswer on a hit, None otherwise
+        """
+        key = self.make_key(faq_ids)
+        query_unit = _unit_vector(query_embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._entries.get(key)
+            best, best_similarity = None, -1.0
+            if entries:
+                if self.ttl_seconds:
+                    fresh = [e for e in entries if now - e.created_at <= self.ttl_seconds]
+                    self._size -= len(entries) - len(fresh)
+                    entries[:] = fresh
+                for entry in entries:
+                    similarity = sum(a * b for a, b in zip(query_unit, entry.unit_embedding))
+                    if similarity > best_similarity:
+                        best, best_similarity = entry, similarity
+                if entries:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+
+            if best is None or best_similarity < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.saved_ms += best.generation_ms
+            return CachedAnswer(best.answer, best_similarity, best.generation_ms, now - best.created_at)
+
+    def store(self, faq_ids: Iterable[str], query_embedding: Sequence[float], answer: str, generation_ms: float) -> None:
+        """Caches a freshly generated answer."""
+        key = self.make_key(faq_ids)
+        entry = _Entry(_unit_vector(query_embedding), answer, generation_ms, time.monotonic())
+
+        with self._lock:
+            entries = self._entries.setdefault(key, [])
+            entries.append(entry)
+            self._size += 1
+            if len(entries) > self.max_entries_per_key:
+                entries.pop(0)
+                self._size -= 1
+                self.evictions += 1
+            self._entries.move_to_end(key)
+
+            while self._size > self.max_entries and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += len(evicted)
+
+    def invalidate(self, reason: str = "explicit") -> None:
+        """Drops every cached answer, e.g. after the FAQ collection was updated."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.invalidations += 1
+        print(f"Semantic answer cache invalidated ({reason}).")
+
+    def get_stats(self) -> dict:
+        """Returns cache occupancy and counters for observability."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._size,
+                "keys": len(self._entries),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "saved_ms": round(self.saved_ms, 3),
+            }
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing FAQ top-k lookups through ChromaDB and the in-memory NumPy index.
+Run from the Cindys_code directory. Uses the persisted FAQ collection by default, or a
+synthetic in-memory collection with --synthetic N. No embedding model is required:
+query vectors are perturbed copies of stored embeddings.
+"""
+
+import argparse
+import statistics
+import time
+
+import chromadb
+import numpy as np
+
+from vector_index import InMemoryVectorIndex
+
+CHROMA_PERSIST_PATH = "./my_chroma_db"
+CHROMA_COLLECTION_NAME = "company_faqs"
+
+
+def build_synthetic_collection(rows: int, dim: int, seed: int):
+    """Creates an ephemeral Chroma collection filled with random unit vectors."""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((rows, dim)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    client = chromadb.EphemeralClient()
+    collection = client.get_or_create_collection(name="benchmark_faqs")
+    for start in range(0, rows, 1000):
+        end = min(start + 1000, rows)
+        collection.add(
+            ids=[f"faq-{i}" for i in range(start, end)],
+            embeddings=embeddings[start:end].tolist(),
+            documents=[f"Synthetic FAQ answer {i}" for i in range(start, end)],
+            metadatas=[{"question": f"Synthetic question {i}?", "answer": f"Synthetic FAQ answer {i}"} for i in range(start, end)],
+        )
+    return collection
+
+
+def time_queries(query_fn, queries, warmup: int = 10):
+    """Runs every query once and returns per-query latencies in milliseconds."""
+    for query in queries[:warmup]:
+        query_fn(query)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        query_fn(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"  {name:<8} mean {statistics.mean(ordered):8.3f} ms | p50 {statistics.median(ordered):8.3f} ms | p99 {p99:8.3f} ms")
+    return statistics.median(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use a synthetic collection with this many rows")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension for synthetic data")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries to time")
+    parser.add_argument("--n-results", type=int, default=3, help="Top-k per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("🔍 Vector Index Benchmark")
+    print("=" * 50)
+
+    if args.synthetic:
+        collection = build_synthetic_collection(args.synthetic, args.dim, args.seed)
+    else:
+        client = chromadb.PersistentClient(path=CHROMA_PERSIST_PATH)
+        collection = client.get_or_create_collection(name=CHROMA_COLLECTION_NAME)
+
+    rows = collection.count()
+    if rows == 0:
+        print("❌ Collection is empty - use --synthetic N to benchmark with generated data")
+        return
+
+    load_start = time.perf_counter()
+    index = InMemoryVectorIndex.from_collection(collection, max_rows=rows)
+    load_ms = (time.perf_counter() - load_start) * 1000
+    print(f"  Rows: {rows} | dim: {index.matrix.shape[1]} | space: {index.space} | index load: {load_ms:.1f} ms")
+
+    # Query with noisy copies of stored vectors so results are meaningful
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.integers(0, rows, size=args.queries)
+    base = np.asarray(collection.get(ids=[index.ids[i] for i in picks], include=["embeddings"])["embeddings"], dtype=np.float32)
+    queries = (base + rng.normal(0, 0.05, base.shape).astype(np.float32)).tolist()
+
+    include = ["documents", "metadatas"]
+    chroma_latencies = time_queries(lambda q: collection.query(query_embeddings=[q], n_results=args.n_results, include=include), queries)
+    numpy_latencies = time_queries(lambda q: index.query([q], n_results=args.n_results, include=include), queries)
+
+    print(f"\n📊 Single-query latency ({args.queries} queries, top-{args.n_results}):")
+    chroma_p50 = summarize("chroma", chroma_latencies)
+    numpy_p50 = summarize("numpy", numpy_latencies)
+    print(f"  Speedup (p50): {chroma_p50 / numpy_p50:.1f}x")
+
+    # Chroma's HNSW search is approximate; report how often the top-1 agrees with the exact index
+    agree = 0
+    for q in queries[:100]:
+        chroma_top = collection.query(query_embeddings=[q], n_results=1, include=[])["ids"][0]
+        numpy_top = index.query([q], n_results=1, include=[])["ids"][0]
+        agree += chroma_top == numpy_top
+    print(f"  Top-1 agreement: {agree}/{min(100, len(queries))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# backend/embedding_backends.py
+# Pluggable embedding backends. The real backend wraps SentenceTransformer; the
+# fake backend produces deterministic hash-based vectors with a configurable
+# dimension and simulated latency, so the RAG pipeline can be benchmarked on
+# machines without network access or model downloads.
+
+import hashlib
+import os
+import re
+import time
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+BACKEND_SENTENCE_TRANSFORMERS = "sentence-transformers"
+BACKEND_FAKE = "fake"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingBackend:
+    """
+    Interface shared by all embedding backends.
+
+    `encode` mirrors SentenceTransformer.encode: a single string yields a 1-D
+    array, a list of strings yields a 2-D array with one row per text.
+    """
+
+    name = "base"
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the vectors this backend produces (used to key caches)."""
+        raise NotImplementedError
+
+    @property
+    def dimension(self) -> int:
+        raise NotImplementedError
+
+    def encode(self, texts: Union[str, Sequence[str]], batch_size: int = 32) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Real embeddings from a SentenceTransformer model."""
+
+    name = BACKEND_SENTENCE_TRANSFORMERS
+
+    def __init__(self, model_name: str):
+        """
+        Args:
+            model_name: SentenceTransformer model to load
+        """
+        # Imported lazily so the fake backend works without the library installed
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    @property
+    def model_id(self) -> str:
+        return self.model_name
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size: int = 32) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size)
+
+
+class HashEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic fake embeddings based on feature hashing.
+
+    Every word token is hashed to a dimension and a sign, so texts that share
+    words get similar vectors (caches and similarity thresholds behave
+    plausibly) while the cost stays negligible. Latency is simulated with
+    `latency_ms` per call plus `per_item_latency_ms` per text.
+    """
+
+    name = BACKEND_FAKE
+
+    def __init__(self, dimension: int = 384, latency_ms: float = 0.0, per_item_latency_ms: float = 0.0):
+        """
+        Args:
+            dimension: Length of the produced vectors
+            latency_ms: Simulated fixed cost of one encode call
+            per_item_latency_ms: Simulated additional cost per encoded text
+        """
+        self._dimension = dimension
+        self.latency_ms = latency_ms
+        self.per_item_latency_ms = per_item_latency_ms
+
+    @property
+    def model_id(self) -> str:
+        return f"fake-hash-{self._dimension}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self._dimension, dtype=np.float32)
+        for token in _TOKEN_RE.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self._dimension] += 1.0 if (digest >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            vector[0] = 1.0  # Keep empty input at a valid unit vector
+            return vector
+        return vector / norm
+
+    def encode(self, texts, batch_size: int = 32) -> np.ndarray:
+        single = isinstance(texts, str)
+        items: List[str] = [texts] if single else list(texts)
+
+        simulated_ms = self.latency_ms + self.per_item_latency_ms * len(items)
+        if simulated_ms > 0:
+            time.sleep(simulated_ms / 1000.0)
+
+        matrix = np.stack([self._embed(text) for text in items]) if items else np.zeros((0, self._dimension), dtype=np.float32)
+        return matrix[0] if single else matrix
+
+
+def create_embedding_backend(model_name: str, backend: Optional[str] = None) -> EmbeddingBackend:
+    """
+    Creates the embedding backend selected by EMBEDDING_BACKEND.
+
+    Args:
+        model_name: SentenceTransformer model used by the real backend
+        backend: Overrides the EMBEDDING_BACKEND environment variable
+
+    Environment:
+        EMBEDDING_BACKEND: "sentence-transformers" (default) or "fake"
+        FAKE_EMBEDDING_DIM: Vector length of the fake backend (default 384)
+        FAKE_EMBEDDING_LATENCY_MS: Simulated latency per encode call (default 0)
+        FAKE_EMBEDDING_PER_ITEM_LATENCY_MS: Simulated latency per text (default 0)
+    """
+    backend = backend or os.getenv("EMBEDDING_BACKEND", BACKEND_SENTENCE_TRANSFORMERS)
+    if backend == BACKEND_FAKE:
+        return HashEmbeddingBackend(
+            dimension=int(os.getenv("FAKE_EMBEDDING_DIM", "384")),
+            latency_ms=float(os.getenv("FAKE_EMBEDDING_LATENCY_MS", "0")),
+            per_item_latency_ms=float(os.getenv("FAKE_EMBEDDING_PER_ITEM_LATENCY_MS", "0")),
+        )
+    if backend == BACKEND_SENTENCE_TRANSFORMERS:
+        return SentenceTransformerBackend(model_name)
+    raise ValueError(f"Unknown embedding backend '{backend}', expected '{BACKEND_SENTENCE_TRANSFORMERS}' or '{BACKEND_FAKE}'")
@@ -0,0 +1,138 @@
+# backend/embedding_batcher.py
+# Micro-batching engine for query embeddings. Concurrent FAQ lookups enqueue their
+# query text and a single batched encode call is made once the batch is full or
+# the batching window expires, so the embedding model works on a matrix instead
+# of one row at a time.
+
+import asyncio
+import inspect
+import time
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from histogram import Histogram
+
+# Batch sizes are small integers, so use integer-friendly bucket boundaries
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent embedding requests and encodes them in one batch.
+
+    A batch is dispatched as soon as either `max_batch_size` queries are waiting
+    or `max_wait_ms` has elapsed since the first query of the batch arrived.
+    Each caller's future is resolved with its own row of the batched result.
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], Sequence], max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        """
+        Args:
+            encode_fn: Callable (sync or async) that encodes a list of texts into a sequence of vectors
+            max_batch_size: Maximum number of queries encoded in one call
+            max_wait_ms: Maximum time the first query of a batch waits for company
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+
+        # Pending entries are (text, future, enqueue_time)
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # The loop only keeps weak references to running batches
+
+        # Metrics for tuning the batching window against request latency
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait_time_histogram = Histogram()  # milliseconds spent waiting for the batch
+        self.encode_time_histogram = Histogram()  # milliseconds spent in the batched encode
+        self.batches_dispatched = 0
+        self.queries_encoded = 0
+        self.errors = 0
+
+    async def encode(self, text: str):
+        """
+        Enqueues a text for embedding and waits for its row of the batch.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            The embedding vector produced for this text
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._dispatch)
+
+        return await future
+
+    def _dispatch(self) -> None:
+        """Takes the pending entries as one batch and schedules its encoding."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if self._pending:
+            # Leftovers start a fresh batching window of their own
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._dispatch)
+
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        """Encodes one batch and resolves every caller's future with its row."""
+        dispatch_time = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.wait_time_histogram.record((dispatch_time - enqueued_at) * 1000)
+        self.batch_size_histogram.record(len(batch))
+        self.batches_dispatched += 1
+
+        texts = [text for text, _, _ in batch]
+        try:
+            vectors = self.encode_fn(texts)
+            if inspect.isawaitable(vectors):
+                vectors = await vectors
+            vectors = list(vectors)  # Rows of a matrix, or any iterable of vectors
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.encode_time_histogram.record((time.perf_counter() - dispatch_time) * 1000)
+        if len(vectors) != len(batch):
+            self.errors += 1
+            error = RuntimeError(f"Embedding batch of {len(batch)} texts returned {len(vectors)} vectors")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        self.queries_encoded += len(batch)
+        for (_, future, _), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def get_stats(self) -> dict:
+        """Returns batching configuration and metrics for observability."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": len(self._pending),
+            "batches_dispatched": self.batches_dispatched,
+            "queries_encoded": self.queries_encoded,
+            "errors": self.errors,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "wait_time_ms": self.wait_time_histogram.snapshot(),
+            "encode_time_ms": self.encode_time_histogram.snapshot(),
+        }
@@ -0,0 +1,126 @@
+# backend/embedding_cache.py
+# In-memory LRU cache mapping normalized query text to its embedding, bounded by
+# entry count and bytes, with a time-to-live so stale entries eventually expire.
+
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalizes a query so trivially different spellings share a cache entry.
+
+    The embedding model is uncased, so lower-casing and collapsing whitespace
+    does not change which FAQ entries are retrieved.
+    """
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU cache of query embeddings.
+
+    Vectors are stored as compact float32 arrays. An entry is evicted when the
+    cache exceeds `max_entries` or `max_bytes` (least recently used first), and
+    is treated as a miss once it is older than `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            max_entries: Maximum number of cached embeddings
+            max_bytes: Maximum approximate memory used by keys and vectors
+            ttl_seconds: Lifetime of an entry; 0 disables expiry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (vector, created_at, size_bytes)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _entry_size(key: str, vector: array) -> int:
+        return sys.getsizeof(key) + vector.itemsize * len(vector)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Looks up a normalized query.
+
+        Returns:
+            The cached embedding as a list of floats, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, created_at, size = entry
+            if self.ttl_seconds and time.monotonic() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.tolist()
+
+    def put(self, key: str, vector: Sequence[float]) -> None:
+        """Stores the embedding for a normalized query, evicting LRU entries as needed."""
+        packed = array("f", vector)
+        size = self._entry_size(key, packed)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._entries[key] = (packed, time.monotonic(), size)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry while keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Returns cache configuration, occupancy and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
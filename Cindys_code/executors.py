@@ -0,0 +1,150 @@
+# backend/executors.py
+# Executor-backed execution of the CPU-bound RAG steps (query embedding and
+# ChromaDB search) so they never run on the FastAPI event loop.
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+# Supported execution modes
+EXECUTION_MODE_INLINE = "inline"  # Run on the event loop (original behaviour)
+EXECUTION_MODE_THREAD = "thread"  # Run on a dedicated bounded thread pool
+EXECUTION_MODE_PROCESS = "process"  # Thread pool, plus a process pool for embedding
+EXECUTION_MODES = (EXECUTION_MODE_INLINE, EXECUTION_MODE_THREAD, EXECUTION_MODE_PROCESS)
+
+# Per-process embedding model used by process pool workers
+_worker_embedding_model = None
+
+
+def init_embedding_worker(model_name: str) -> None:
+    """
+    Process pool initializer: loads the embedding backend once per worker process.
+
+    The backend is selected from the environment inherited from the parent.
+    """
+    global _worker_embedding_model
+    from embedding_backends import create_embedding_backend
+    _worker_embedding_model = create_embedding_backend(model_name)
+
+
+def encode_in_worker(texts: List[str], batch_size: int = 32):
+    """Encodes texts with the embedding model owned by the current worker process."""
+    return _worker_embedding_model.encode(texts, batch_size=batch_size)
+
+
+class BlockingExecutor:
+    """
+    Runs blocking callables off the event loop.
+
+    Thread pool work is executed inside a copy of the caller's contextvars context,
+    so the active OpenTelemetry span is visible from the worker thread and spans
+    created there nest under the caller's span. The number of submitted but not
+    yet finished calls is bounded by `max_pending`; further callers wait.
+    """
+
+    def __init__(self, mode: str = EXECUTION_MODE_THREAD, max_workers: int = 4, max_pending: int = 64,
+                 process_workers: int = 0, process_initializer: Optional[Callable] = None,
+                 process_initargs: tuple = ()):
+        """
+        Args:
+            mode: One of "inline", "thread" or "process"
+            max_workers: Size of the thread pool
+            max_pending: Maximum number of in-flight calls before callers wait
+            process_workers: Size of the process pool (only used in "process" mode)
+            process_initializer: Initializer run once in every worker process
+            process_initargs: Arguments passed to the process initializer
+        """
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}', expected one of {EXECUTION_MODES}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._thread_pool = None
+        self._process_pool = None
+        self._semaphore = None  # Created lazily inside the running event loop
+
+        if mode != EXECUTION_MODE_INLINE:
+            self._thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-worker")
+        if mode == EXECUTION_MODE_PROCESS and process_workers > 0:
+            # Spawn, not fork: this process already runs OTel batch threads, the thread pool and torch
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=process_initializer,
+                initargs=process_initargs,
+            )
+
+        self.calls = 0
+        self.in_flight = 0
+        self.total_wait_ms = 0.0  # Time spent waiting for a free slot
+
+    @property
+    def uses_process_pool(self) -> bool:
+        """True when CPU-bound embedding work is dispatched to worker processes."""
+        return self._process_pool is not None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._semaphore
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking callable on the thread pool with the caller's context.
+
+        In inline mode the callable is simply invoked on the event loop.
+        """
+        if self._thread_pool is None:
+            return func(*args, **kwargs)
+
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+        return await self._submit(self._thread_pool, call)
+
+    async def run_cpu(self, func: Callable, *args) -> Any:
+        """
+        Runs a picklable, CPU-bound callable on the process pool if one is configured,
+        falling back to the thread pool otherwise.
+
+        Tracing context is not carried into worker processes; spans should be opened
+        around the awaited call in the event loop instead.
+        """
+        if self._process_pool is None:
+            return await self.run(func, *args)
+        return await self._submit(self._process_pool, functools.partial(func, *args))
+
+    async def _submit(self, pool, call: Callable) -> Any:
+        semaphore = self._get_semaphore()
+        wait_start = time.perf_counter()
+        async with semaphore:
+            self.total_wait_ms += (time.perf_counter() - wait_start) * 1000
+            self.calls += 1
+            self.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, call)
+            finally:
+                self.in_flight -= 1
+
+    def get_stats(self) -> dict:
+        """Returns executor configuration and usage for observability."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "process_pool": self.uses_process_pool,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "total_wait_ms": round(self.total_wait_ms, 3),
+        }
+
+    def shutdown(self) -> None:
+        """Shuts down the underlying pools without waiting for queued work."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
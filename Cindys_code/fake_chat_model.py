@@ -0,0 +1,69 @@
+# backend/fake_chat_model.py
+# BeeAI ChatModel adapter around the shared offline FakeLLM (fake_llm.py in the
+# repository root), so the FAQ agent workflow and the streaming endpoint can run
+# without calling a real provider. Selected with LLM_BACKEND=fake.
+
+import json
+import uuid
+
+from beeai_framework.backend.chat import ChatModel
+from beeai_framework.backend.message import AssistantMessage, MessageToolCallContent
+from beeai_framework.backend.types import ChatModelInput, ChatModelOutput
+from beeai_framework.context import RunContext
+
+from fake_llm import FakeLLM
+
+FINAL_ANSWER_TOOL = "final_answer"
+
+
+class FakeChatModel(ChatModel):
+    """
+    ChatModel backed by FakeLLM.
+
+    The last message of the conversation is treated as the prompt. When the
+    calling agent offers a `final_answer` tool, the response is returned as a
+    call to that tool, which is how tool-calling agents expect to finish.
+    """
+
+    def __init__(self, fake_llm: FakeLLM | None = None):
+        """
+        Args:
+            fake_llm: The simulated model; configured from FAKE_LLM_* variables by default
+        """
+        super().__init__()
+        self.fake_llm = fake_llm or FakeLLM.from_env()
+
+    @property
+    def model_id(self) -> str:
+        return "fake-llm"
+
+    @property
+    def provider_id(self) -> str:
+        return "fake"
+
+    @staticmethod
+    def _prompt(input: ChatModelInput) -> str:
+        return input.messages[-1].text if input.messages else ""
+
+    @staticmethod
+    def _wants_final_answer_tool(input: ChatModelInput) -> bool:
+        return any(getattr(tool, "name", None) == FINAL_ANSWER_TOOL for tool in (input.tools or []))
+
+    def _to_output(self, input: ChatModelInput, text: str) -> ChatModelOutput:
+        if self._wants_final_answer_tool(input):
+            message = AssistantMessage(MessageToolCallContent(
+                id=f"call_{uuid.uuid4().hex[:12]}",
+                tool_name=FINAL_ANSWER_TOOL,
+                args=json.dumps({"response": text}),
+            ))
+        else:
+            message = AssistantMessage(text)
+        return ChatModelOutput(messages=[message], finish_reason="stop")
+
+    async def _create(self, input: ChatModelInput, run: RunContext) -> ChatModelOutput:
+        text = await self.fake_llm.generate(self._prompt(input))
+        return self._to_output(input, text)
+
+    async def _create_stream(self, input: ChatModelInput, run: RunContext):
+        async for token in self.fake_llm.stream(self._prompt(input)):
+            yield ChatModelOutput(messages=[AssistantMessage(token)])
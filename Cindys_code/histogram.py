@@ -0,0 +1,72 @@
+# backend/histogram.py
+# A small fixed-bucket histogram used to expose latency and size distributions
+# through get_observability_data() without pulling in a metrics library.
+
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+# Default bucket boundaries (upper bounds, inclusive) suitable for millisecond timings
+DEFAULT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram with fixed bucket boundaries.
+
+    Values above the last boundary are counted in an overflow bucket. Percentiles
+    are estimated from bucket upper bounds, which is accurate enough for tuning.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_MS_BUCKETS):
+        """
+        Args:
+            buckets: Sorted upper bounds of the histogram buckets
+        """
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        """Records a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def percentile(self, p: float) -> float:
+        """Estimates the p-th percentile (0-100) from the bucket upper bounds."""
+        with self._lock:
+            if self._count == 0:
+                return 0.0
+            target = self._count * p / 100.0
+            running = 0
+            for index, count in enumerate(self._counts):
+                running += count
+                if running >= target:
+                    return self.buckets[index] if index < len(self.buckets) else self._max
+            return self._max
+
+    def snapshot(self) -> Dict[str, object]:
+        """Returns a JSON-serializable summary of the histogram."""
+        with self._lock:
+            count = self._count
+            total = self._sum
+            maximum = self._max
+            counts = list(self._counts)
+        bucket_labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "max": maximum,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict(zip(bucket_labels, counts)),
+        }
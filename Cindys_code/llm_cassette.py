@@ -0,0 +1,297 @@
+# backend/llm_cassette.py
+# Record/replay cassette for LLM calls. In record mode every prompt -> response
+# exchange of the agent workflow is captured together with its latency and token
+# timing; in replay mode the recorded responses are served with the recorded
+# latency profile, so regression benchmarks of run_faq_agent and
+# stream_faq_agent are deterministic and need no LLM provider.
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+CASSETTE_MODE_OFF = "off"
+CASSETTE_MODE_RECORD = "record"
+CASSETTE_MODE_REPLAY = "replay"
+CASSETTE_MODES = (CASSETTE_MODE_OFF, CASSETTE_MODE_RECORD, CASSETTE_MODE_REPLAY)
+
+# Behaviour when a replayed prompt is not on the cassette
+MISS_POLICY_ERROR = "error"  # Raise CassetteMissError
+MISS_POLICY_PASSTHROUGH = "passthrough"  # Call the real LLM (not recorded)
+MISS_POLICIES = (MISS_POLICY_ERROR, MISS_POLICY_PASSTHROUGH)
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a prompt was never recorded."""
+
+
+def prompt_key(prompt: str) -> str:
+    """Stable key of a prompt (the prompt text itself is not stored)."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteEntry:
+    """One recorded exchange: the response, time to first token and per-token gaps."""
+
+    __slots__ = ("key", "response", "latency_ms", "ttft_ms", "tokens", "token_gaps_ms")
+
+    def __init__(self, key: str, response: str, latency_ms: float, ttft_ms: Optional[float] = None,
+                 tokens: Optional[List[str]] = None, token_gaps_ms: Optional[List[float]] = None):
+        self.key = key
+        self.response = response
+        self.latency_ms = latency_ms
+        self.ttft_ms = ttft_ms
+        self.tokens = tokens or []
+        self.token_gaps_ms = token_gaps_ms or []
+
+    def to_json(self) -> str:
+        # Short field names and rounded timings keep the cassette compact
+        record = {"k": self.key, "r": self.response, "l": round(self.latency_ms, 1)}
+        if self.tokens:
+            record["f"] = round(self.ttft_ms or 0.0, 1)
+            record["t"] = self.tokens
+            record["g"] = [round(gap, 1) for gap in self.token_gaps_ms]
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "CassetteEntry":
+        record = json.loads(line)
+        return cls(record["k"], record["r"], record["l"], record.get("f"), record.get("t"), record.get("g"))
+
+
+class TokenTimer:
+    """Collects token arrival times while a call is being recorded."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.tokens: List[str] = []
+        self.arrivals: List[float] = []
+
+    def on_token(self, text: str) -> None:
+        self.tokens.append(text)
+        self.arrivals.append(time.perf_counter())
+
+    def to_entry(self, key: str, response: str) -> CassetteEntry:
+        latency_ms = (time.perf_counter() - self.start) * 1000
+        if not self.tokens:
+            return CassetteEntry(key, response, latency_ms)
+        ttft_ms = (self.arrivals[0] - self.start) * 1000
+        gaps = [(b - a) * 1000 for a, b in zip(self.arrivals, self.arrivals[1:])]
+        return CassetteEntry(key, response, latency_ms, ttft_ms, self.tokens, gaps)
+
+
+class LLMCassette:
+    """
+    Gzip-compressed JSON-lines cassette of LLM exchanges keyed by prompt hash.
+
+    Recorded entries are buffered and appended as one gzip member per flush, so
+    an interrupted recording keeps everything flushed so far. Flushes triggered
+    from `run` / `run_stream` compress and write from a worker thread, never on
+    the event loop. A prompt recorded
+    several times is replayed round-robin over its recordings, which preserves
+    the latency distribution of repeated questions.
+    """
+
+    def __init__(self, path: str, mode: str = CASSETTE_MODE_REPLAY, miss_policy: str = MISS_POLICY_ERROR,
+                 replay_speed: float = 1.0, flush_every: int = 32):
+        """
+        Args:
+            path: Cassette file (conventionally *.jsonl.gz)
+            mode: "record" or "replay"
+            miss_policy: Replay behaviour for unknown prompts, "error" or "passthrough"
+            replay_speed: Divides recorded delays (2.0 replays twice as fast, 0 disables delays)
+            flush_every: Recorded entries buffered before they are written
+        """
+        if mode not in (CASSETTE_MODE_RECORD, CASSETTE_MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected '{CASSETTE_MODE_RECORD}' or '{CASSETTE_MODE_REPLAY}'")
+        if miss_policy not in MISS_POLICIES:
+            raise ValueError(f"Unknown cassette miss policy '{miss_policy}', expected one of {MISS_POLICIES}")
+
+        self.path = path
+        self.mode = mode
+        self.miss_policy = miss_policy
+        self.replay_speed = replay_speed
+        self.flush_every = flush_every
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Serializes appends to the cassette file
+        self._pending: List[CassetteEntry] = []
+        self._entries: Dict[str, List[CassetteEntry]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+        if mode == CASSETTE_MODE_REPLAY:
+            self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette file not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = CassetteEntry.from_json(line)
+                    self._entries[entry.key].append(entry)
+
+    @property
+    def entry_count(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _next_entry(self, key: str) -> Optional[CassetteEntry]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            entry = entries[self._cursors[key] % len(entries)]
+            self._cursors[key] += 1
+            return entry
+
+    async def _sleep(self, ms: float) -> None:
+        if self.replay_speed > 0 and ms > 0:
+            await asyncio.sleep(ms / 1000.0 / self.replay_speed)
+
+    async def stream(self, entry: CassetteEntry) -> AsyncIterator[str]:
+        """Yields the recorded tokens of an entry with the recorded timing."""
+        if not entry.tokens:
+            await self._sleep(entry.latency_ms)
+            yield entry.response
+            return
+        await self._sleep(entry.ttft_ms or 0.0)
+        for index, token in enumerate(entry.tokens):
+            if index:
+                await self._sleep(entry.token_gaps_ms[index - 1] if index - 1 < len(entry.token_gaps_ms) else 0.0)
+            yield token
+        # Time between the last token and the end of the call (e.g. agent post-processing)
+        await self._sleep(entry.latency_ms - (entry.ttft_ms or 0.0) - sum(entry.token_gaps_ms))
+
+    async def run(self, prompt: str, call: Callable[[TokenTimer], Awaitable[str]]) -> str:
+        """
+        Runs one LLM exchange through the cassette.
+
+        Args:
+            prompt: The prompt sent to the model (used as the cassette key)
+            call: Performs the real call; reports streamed tokens to the given TokenTimer
+                  and returns the final response text
+
+        Returns:
+            str: The recorded or freshly generated response
+        """
+        key = prompt_key(prompt)
+        if self.mode == CASSETTE_MODE_REPLAY:
+            entry = self._next_entry(key)
+            if entry is None:
+                self.misses += 1
+                if self.miss_policy == MISS_POLICY_PASSTHROUGH:
+                    return await call(TokenTimer())
+                raise CassetteMissError(f"Prompt {key} is not on cassette {self.path}")
+            self.replayed += 1
+            await asyncio.sleep(0)  # Always yield to the event loop, even without delays
+            if self.replay_speed <= 0:
+                return entry.response
+            async for _ in self.stream(entry):
+                pass
+            return entry.response
+
+        timer = TokenTimer()
+        response = await call(timer)
+        await self.record_async(timer.to_entry(key, response))
+        return response
+
+    async def run_stream(self, prompt: str, call: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of `run`: yields the response tokens as they arrive.
+
+        Args:
+            prompt: The prompt sent to the model (used as the cassette key)
+            call: Starts the real streaming call and returns an async iterator of its tokens
+
+        Yields:
+            str: Recorded tokens with the recorded timing, or the live tokens
+        """
+        key = prompt_key(prompt)
+        if self.mode == CASSETTE_MODE_REPLAY:
+            entry = self._next_entry(key)
+            if entry is None:
+                self.misses += 1
+                if self.miss_policy != MISS_POLICY_PASSTHROUGH:
+                    raise CassetteMissError(f"Prompt {key} is not on cassette {self.path}")
+                async for token in call():
+                    yield token
+                return
+            self.replayed += 1
+            await asyncio.sleep(0)  # Always yield to the event loop, even without delays
+            async for token in self.stream(entry):
+                yield token
+            return
+
+        timer = TokenTimer()
+        async for token in call():
+            timer.on_token(token)
+            yield token
+        # Only complete streams are recorded; an abandoned one never gets here
+        await self.record_async(timer.to_entry(key, "".join(timer.tokens)))
+
+    def _buffer(self, entry: CassetteEntry) -> List[CassetteEntry]:
+        """Buffers an entry; returns the entries to write once the buffer is full."""
+        with self._lock:
+            self._entries[entry.key].append(entry)
+            self._pending.append(entry)
+            self.recorded += 1
+            if len(self._pending) < self.flush_every:
+                return []
+            batch, self._pending = self._pending, []
+            return batch
+
+    def record(self, entry: CassetteEntry) -> None:
+        """Buffers a recorded entry, writing the buffer in the calling thread once it is full."""
+        batch = self._buffer(entry)
+        if batch:
+            self._write(batch)
+
+    async def record_async(self, entry: CassetteEntry) -> None:
+        """Buffers a recorded entry, writing a full buffer from a worker thread."""
+        batch = self._buffer(entry)
+        if batch:
+            await asyncio.to_thread(self._write, batch)
+
+    def _write(self, entries: List[CassetteEntry]) -> None:
+        if not entries:
+            return
+        payload = gzip.compress("".join(entry.to_json() + "\n" for entry in entries).encode("utf-8"))
+        with self._write_lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(payload)
+
+    def flush(self) -> None:
+        """Writes all buffered entries to the cassette file."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        self._write(batch)
+
+    def close(self) -> None:
+        if self.mode == CASSETTE_MODE_RECORD:
+            self.flush()
+
+    def get_stats(self) -> dict:
+        """Returns cassette configuration and counters for observability."""
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "entries": self.entry_count,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+            "pending_writes": len(self._pending),
+            "miss_policy": self.miss_policy,
+            "replay_speed": self.replay_speed,
+        }
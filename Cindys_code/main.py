@@ -1,18 +1,20 @@
 import os 
+import json 
 from fastapi import FastAPI, Request, HTTPException 
-from fastapi.responses import HTMLResponse, JSONResponse 
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse 
 from fastapi.templating import Jinja2Templates 
 from fastapi.staticfiles import StaticFiles 
 from pydantic import BaseModel 
 from dotenv import load_dotenv 
 from starlette.middleware.cors import CORSMiddleware # For allowing frontend to access API 
-from openinference.instrumentation.beeai import BeeAIInstrumentor 
- 
-from agent import run_faq_agent, _setup_rag_system, get_observability_data 
-import time # Added for observability endpoint
  
+# Load .env before importing the agent so its module-level configuration sees it 
 load_dotenv() 
  
+from agent import run_faq_agent, run_faq_agent_batch, stream_faq_agent, setup_rag_system_async, get_observability_data, shutdown_rag_system 
+import time # Added for observability endpoint
+from typing import List, Optional 
+ 
 app = FastAPI( 
     title="Company FAQ RAG API", 
     description="Backend API for the Company FAQ Retrieval Augmented Generation (RAG) system.", 
@@ -50,18 +52,47 @@ class ChatRequest(BaseModel):
  
 class ChatResponse(BaseModel): 
     answer: str 
+
+# Upper bound on the number of queries accepted by /chat/batch 
+CHAT_BATCH_MAX_QUERIES = int(os.environ.get("CHAT_BATCH_MAX_QUERIES", 500)) 
+# Upper bound on the client-supplied max_concurrency of /chat/batch 
+CHAT_BATCH_MAX_CONCURRENCY_LIMIT = int(os.environ.get("CHAT_BATCH_MAX_CONCURRENCY_LIMIT", 32)) 
+
+class BatchChatRequest(BaseModel): 
+    queries: List[str] 
+    max_concurrency: Optional[int] = None 
+
+class BatchChatItem(BaseModel): 
+    index: int 
+    query: str 
+    status: str 
+    answer: Optional[str] = None 
+    error: Optional[str] = None 
+    cached: bool = False 
+    retrieval_status: Optional[str] = None 
+    timings: dict = {} 
+
+class BatchChatResponse(BaseModel): 
+    results: List[BatchChatItem] 
+    total_ms: float 
  
  
 @app.on_event("startup") 
 async def startup_event(): 
     """Initializes the RAG system when the FastAPI app starts up.""" 
     print("FastAPI startup event: Initializing RAG system...") 
-    success = _setup_rag_system() 
+    success = await setup_rag_system_async() 
     if not success: 
         print("RAG system initialization failed during startup.") 
     else: 
         print("RAG system initialized successfully.") 
-    BeeAIInstrumentor().instrument() 
+ 
+ 
+@app.on_event("shutdown") 
+async def shutdown_event(): 
+    """Persists caches and releases RAG system resources when the app stops.""" 
+    print("FastAPI shutdown event: Releasing RAG system resources...") 
+    shutdown_rag_system() 
  
  
 @app.get("/", response_class=HTMLResponse) 
@@ -84,6 +115,52 @@ async def chat_endpoint(request_body: ChatRequest):
         print(f"Error processing chat request: {e}") 
         raise HTTPException(status_code=500, detail=f"Internal server error: {e}") 
 
+@app.post("/chat/batch", response_model=BatchChatResponse) 
+async def chat_batch_endpoint(request_body: BatchChatRequest): 
+    """ 
+    Batch endpoint for evaluation and cache pre-warming jobs. 
+    Retrieves context for all queries at once and answers them with bounded 
+    concurrency, returning per-item status and timings in input order. 
+    """ 
+    queries = request_body.queries 
+    if not queries: 
+        raise HTTPException(status_code=400, detail="queries must not be empty") 
+    if len(queries) > CHAT_BATCH_MAX_QUERIES: 
+        raise HTTPException(status_code=413, detail=f"At most {CHAT_BATCH_MAX_QUERIES} queries per batch") 
+    if request_body.max_concurrency is not None and not 1 <= request_body.max_concurrency <= CHAT_BATCH_MAX_CONCURRENCY_LIMIT: 
+        raise HTTPException(status_code=422, detail=f"max_concurrency must be between 1 and {CHAT_BATCH_MAX_CONCURRENCY_LIMIT}") 
+    print(f"Received batch of {len(queries)} queries") 
+    start = time.perf_counter() 
+    try: 
+        if request_body.max_concurrency is not None: 
+            results = await run_faq_agent_batch(queries, max_concurrency=request_body.max_concurrency) 
+        else: 
+            results = await run_faq_agent_batch(queries) 
+        return BatchChatResponse(results=results, total_ms=(time.perf_counter() - start) * 1000) 
+    except Exception as e: 
+        print(f"Error processing batch chat request: {e}") 
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}") 
+
+@app.post("/chat/stream") 
+async def chat_stream_endpoint(request_body: ChatRequest): 
+    """ 
+    Streaming variant of /chat using server-sent events. 
+    Emits retrieval status events, then answer tokens as the LLM produces them, 
+    then a final "done" (or "error") event. 
+    """ 
+    user_query = request_body.query 
+    print(f"Received streaming query: {user_query}") 
+
+    async def event_source(): 
+        async for event in stream_faq_agent(user_query): 
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n" 
+
+    return StreamingResponse( 
+        event_source(), 
+        media_type="text/event-stream", 
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}, 
+    ) 
+
 @app.get("/observability")
 async def observability_endpoint():
     """
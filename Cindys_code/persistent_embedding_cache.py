@@ -0,0 +1,281 @@
+# backend/persistent_embedding_cache.py
+# On-disk embedding cache that survives restarts. Embeddings are stored in a
+# memory-mapped .npy matrix next to a sorted array of 64-bit key hashes, so every
+# worker process maps the same pages read-only and looks keys up with a binary
+# search. New embeddings are buffered in memory and merged into a fresh file
+# generation by a background compaction thread. Once the cache holds max_entries
+# rows, each compaction evicts randomly chosen rows to make room for new ones.
+
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+class PersistentEmbeddingCache:
+    """
+    Memory-mapped embedding cache keyed by (model name, normalized text hash).
+
+    Layout of the cache directory:
+        meta.json           model name, dimension, dtype and current generation
+        keys-<gen>.npy      sorted uint64 key hashes
+        vectors-<gen>.npy   embedding matrix, row i belongs to keys[i]
+
+    The cache is invalidated automatically when it was built by a different
+    embedding model. Compaction is serialized across processes with a file lock.
+    Rows carry no recency information (hits are read from shared read-only
+    pages), so a full cache evicts by random replacement.
+    """
+
+    def __init__(self, directory: str, model_name: str, dtype: str = "float32",
+                 max_entries: int = 1_000_000, compaction_interval_s: float = 30.0):
+        """
+        Args:
+            directory: Directory holding the cache files
+            model_name: Name of the embedding model the vectors come from
+            dtype: On-disk vector type, "float32" or "float16"
+            max_entries: Upper bound on the number of persisted embeddings; random rows are evicted beyond it
+            compaction_interval_s: How often buffered embeddings are merged to disk
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype '{dtype}', expected one of {SUPPORTED_DTYPES}")
+
+        self.directory = directory
+        self.model_name = model_name
+        self.dtype = dtype
+        self.max_entries = max_entries
+        self.compaction_interval_s = compaction_interval_s
+
+        self._keys = None  # Memory-mapped sorted uint64 hashes
+        self._vectors = None  # Memory-mapped embedding matrix
+        self._generation = -1
+        self._loaded = False
+        self._pending: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._rng = np.random.default_rng()
+
+        self.hits = 0
+        self.misses = 0
+        self.compactions = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key_hash(self, normalized_text: str) -> int:
+        digest = hashlib.blake2b(f"{self.model_name}\0{normalized_text}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.directory, META_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _ensure_loaded(self) -> None:
+        """Maps the current generation on first use and starts the compactor."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            meta = self._read_meta()
+            if meta and meta.get("model_name") != self.model_name:
+                self._invalidate()
+            self._reload()
+            self._loaded = True
+
+        self._compactor = threading.Thread(target=self._compaction_loop, name="embedding-cache-compactor", daemon=True)
+        self._compactor.start()
+
+    def warm(self) -> None:
+        """Maps the cache files ahead of the first lookup, so `get` never touches the filesystem."""
+        self._ensure_loaded()
+
+    def _invalidate(self) -> None:
+        """Removes cache files written for a different embedding model."""
+        with self._file_lock():
+            for path in glob.glob(os.path.join(self.directory, "*.npy")) + [os.path.join(self.directory, META_FILE)]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        self.invalidations += 1
+        print(f"Persistent embedding cache invalidated (model changed to '{self.model_name}').")
+
+    def _reload(self) -> None:
+        """Maps the generation referenced by meta.json if it changed."""
+        meta = self._read_meta()
+        if not meta or meta.get("model_name") != self.model_name:
+            return
+        generation = meta["generation"]
+        if generation == self._generation:
+            return
+        try:
+            self._keys = np.load(os.path.join(self.directory, f"keys-{generation}.npy"), mmap_mode="r")
+            self._vectors = np.load(os.path.join(self.directory, f"vectors-{generation}.npy"), mmap_mode="r")
+            self._generation = generation
+        except OSError as e:
+            print(f"⚠️  Could not map persistent embedding cache generation {generation}: {e}")
+
+    def _file_lock(self):
+        return _DirectoryLock(os.path.join(self.directory, LOCK_FILE))
+
+    def get(self, normalized_text: str) -> Optional[List[float]]:
+        """
+        Looks up an embedding for a normalized query.
+
+        Returns:
+            The cached embedding as a list of floats, or None on a miss
+        """
+        self._ensure_loaded()
+        key = self._key_hash(normalized_text)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return pending.astype(np.float32).tolist()
+
+        keys, vectors = self._keys, self._vectors
+        if keys is not None and len(keys):
+            index = int(np.searchsorted(keys, np.uint64(key)))
+            if index < len(keys) and int(keys[index]) == key:
+                self.hits += 1
+                return np.asarray(vectors[index], dtype=np.float32).tolist()
+
+        self.misses += 1
+        return None
+
+    def put(self, normalized_text: str, vector: Sequence[float]) -> None:
+        """Buffers an embedding; it is persisted by the next compaction."""
+        self._ensure_loaded()
+        with self._lock:
+            self._pending[self._key_hash(normalized_text)] = np.asarray(vector, dtype=self.dtype)
+
+    def _compaction_loop(self) -> None:
+        while not self._stop_event.wait(self.compaction_interval_s):
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"⚠️  Persistent embedding cache compaction failed: {e}")
+
+    def compact(self) -> None:
+        """
+        Merges buffered embeddings into a new on-disk generation.
+
+        Other processes may have compacted in the meantime, so the newest
+        generation is re-read under the file lock before merging.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+
+        with self._file_lock():
+            self._reload()
+            if not pending:
+                return
+
+            keys = np.fromiter(pending.keys(), dtype=np.uint64, count=len(pending))
+            vectors = np.stack(list(pending.values())).astype(self.dtype)
+            if self._keys is not None and len(self._keys):
+                # Existing rows win over duplicates
+                is_new = ~np.isin(keys, self._keys)
+                keys, vectors = keys[is_new][:self.max_entries], vectors[is_new][:self.max_entries]
+                if not len(keys):
+                    return  # Another process already persisted them; keep the current generation
+                existing_keys, existing_vectors = np.asarray(self._keys), np.asarray(self._vectors, dtype=self.dtype)
+                overflow = len(existing_keys) + len(keys) - self.max_entries
+                if overflow > 0:
+                    # Random replacement makes room for the new rows
+                    keep = np.sort(self._rng.choice(len(existing_keys), len(existing_keys) - overflow, replace=False))
+                    existing_keys, existing_vectors = existing_keys[keep], existing_vectors[keep]
+                    self.evictions += overflow
+                keys = np.concatenate([existing_keys, keys])
+                vectors = np.concatenate([existing_vectors, vectors])
+            else:
+                keys, vectors = keys[:self.max_entries], vectors[:self.max_entries]
+
+            order = np.argsort(keys, kind="stable")
+            keys, vectors = keys[order], vectors[order]
+
+            previous = self._generation
+            generation = previous + 1
+            np.save(os.path.join(self.directory, f"keys-{generation}.npy"), keys)
+            np.save(os.path.join(self.directory, f"vectors-{generation}.npy"), vectors)
+
+            meta_tmp = os.path.join(self.directory, META_FILE + ".tmp")
+            with open(meta_tmp, "w") as f:
+                json.dump({
+                    "model_name": self.model_name,
+                    "dim": int(vectors.shape[1]),
+                    "dtype": self.dtype,
+                    "count": int(len(keys)),
+                    "generation": generation,
+                    "updated_at": time.time(),
+                }, f)
+            os.replace(meta_tmp, os.path.join(self.directory, META_FILE))
+
+            # Readers that still map the old generation keep their pages after unlink
+            for name in (f"keys-{previous}.npy", f"vectors-{previous}.npy"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+            self._reload()
+            self.compactions += 1
+
+    def close(self) -> None:
+        """Stops the compactor and persists any buffered embeddings."""
+        self._stop_event.set()
+        if self._loaded:
+            self.compact()
+
+    def get_stats(self) -> dict:
+        """Returns occupancy and counters for observability."""
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "model_name": self.model_name,
+            "dtype": self.dtype,
+            "loaded": self._loaded,
+            "generation": self._generation,
+            "entries": int(len(self._keys)) if self._keys is not None else 0,
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "compactions": self.compactions,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class _DirectoryLock:
+    """Exclusive advisory lock on a file, shared by all processes using the cache."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
@@ -0,0 +1,95 @@
+# backend/singleflight.py
+# Request coalescing ("single flight"): concurrent callers asking for the same key
+# share one in-flight execution instead of each running the full pipeline.
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+
+class FlightCancelledError(RuntimeError):
+    """Raised to followers when the leader was cancelled (e.g. its client disconnected) before finishing."""
+
+
+class Flight:
+    """One in-flight execution shared by a leader and any number of followers."""
+
+    __slots__ = ("key", "future", "leader_span_context", "status", "followers")
+
+    def __init__(self, key: Hashable, future: asyncio.Future):
+        self.key = key
+        self.future = future
+        self.leader_span_context = None  # Set by the leader so followers can link to its trace
+        self.status = None  # Outcome reported by the leader (e.g. "success", "error") for followers' spans
+        self.followers = 0
+
+    async def wait(self):
+        """Waits for the leader's result without letting a follower cancel the leader."""
+        self.followers += 1
+        return await asyncio.shield(self.future)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent executions for identical keys.
+
+    The first caller for a key becomes the leader and runs the work; callers that
+    arrive while it is running get the same `Flight` back from `get()` and wait
+    for the leader's result. The key is released as soon as the leader finishes,
+    so later callers trigger a fresh execution. A cancelled leader does not
+    cancel its followers: they get a FlightCancelledError and can run again.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Optional[Flight]:
+        """Returns the in-flight execution for a key and counts the caller as coalesced."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        return flight
+
+    async def run(self, key: Hashable, fn: Callable[[Flight], Awaitable]):
+        """
+        Runs `fn` as the leader for `key` and publishes its outcome to followers.
+
+        Args:
+            key: The coalescing key
+            fn: Coroutine function receiving the Flight (to record the leader span)
+
+        Returns:
+            Whatever `fn` returns
+        """
+        flight = Flight(key, asyncio.get_running_loop().create_future())
+        self._flights[key] = flight
+        self.leaders += 1
+        try:
+            result = await fn(flight)
+        except asyncio.CancelledError:
+            # Only the leader's caller went away; followers must not see a cancellation of their own
+            self._fail(flight, FlightCancelledError(f"Leader for {key!r} was cancelled"))
+            raise
+        except Exception as e:
+            self._fail(flight, e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._flights.pop(key, None)
+
+    @staticmethod
+    def _fail(flight: Flight, error: BaseException) -> None:
+        flight.future.set_exception(error)
+        if not flight.followers:
+            flight.future.exception()  # Mark as retrieved; nobody else is waiting
+
+    def get_stats(self) -> dict:
+        """Returns coalescing counters for observability."""
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced_requests": self.coalesced,
+        }
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the semantic answer cache in answer_cache.py.
+Run with: python -m pytest Cindys_code/test_answer_cache.py
+"""
+
+import pytest
+
+import answer_cache
+from answer_cache import SemanticAnswerCache
+
+
+class FakeClock:
+    """Stand-in for the `time` module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(answer_cache, "time", fake)
+    return fake
+
+
+def test_answer_cache_reuses_answer_for_similar_query():
+    cache = SemanticAnswerCache(similarity_threshold=0.95)
+    cache.store(["faq-2", "faq-1"], [1.0, 0.0], "20 days", generation_ms=800.0)
+    hit = cache.lookup(["faq-1", "faq-2"], [0.99, 0.05])  # Same FAQ set in another order
+    assert hit is not None
+    assert hit.answer == "20 days"
+    assert hit.similarity >= 0.95
+    assert cache.get_stats()["saved_ms"] == 800.0
+
+
+def test_answer_cache_misses_on_dissimilar_query_or_other_faqs():
+    cache = SemanticAnswerCache(similarity_threshold=0.95)
+    cache.store(["faq-1"], [1.0, 0.0], "20 days", generation_ms=800.0)
+    assert cache.lookup(["faq-1"], [0.0, 1.0]) is None
+    assert cache.lookup(["faq-3"], [1.0, 0.0]) is None
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_answer_cache_entries_expire(clock):
+    cache = SemanticAnswerCache(ttl_seconds=60)
+    cache.store(["faq-1"], [1.0, 0.0], "20 days", generation_ms=800.0)
+    clock.now += 61
+    assert cache.lookup(["faq-1"], [1.0, 0.0]) is None
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["keys"]) == (0, 0)
+
+
+def test_answer_cache_bounds_entries_per_key_and_overall():
+    cache = SemanticAnswerCache(max_entries=3, max_entries_per_key=2)
+    for i in range(3):
+        cache.store(["faq-1"], [1.0, float(i)], f"answer {i}", generation_ms=1.0)
+    assert cache.get_stats()["entries"] == 2
+    cache.store(["faq-2"], [1.0, 0.0], "other", generation_ms=1.0)
+    cache.store(["faq-3"], [1.0, 0.0], "third", generation_ms=1.0)
+    stats = cache.get_stats()
+    assert stats["entries"] <= 3
+    assert cache.lookup(["faq-1"], [1.0, 2.0]) is None  # Least recently used key went first
+
+
+def test_answer_cache_invalidate_drops_everything():
+    cache = SemanticAnswerCache()
+    cache.store(["faq-1"], [1.0, 0.0], "20 days", generation_ms=800.0)
+    cache.invalidate(reason="test")
+    assert cache.lookup(["faq-1"], [1.0, 0.0]) is None
+    stats = cache.get_stats()
+    assert (stats["entries"], stats["invalidations"]) == (0, 1)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the query embedding cache in embedding_cache.py.
+Run with: python -m pytest Cindys_code/test_embedding_cache.py
+"""
+
+from array import array
+
+import pytest
+
+import embedding_cache
+from embedding_cache import EmbeddingCache, normalize_query
+
+
+class FakeClock:
+    """Stand-in for the `time` module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(embedding_cache, "time", fake)
+    return fake
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    assert normalize_query("  How many   Vacation\tdays? ") == "how many vacation days?"
+
+
+def test_embedding_cache_hit_and_miss():
+    cache = EmbeddingCache()
+    assert cache.get("q") is None
+    cache.put("q", [0.5, 0.25])
+    assert cache.get("q") == [0.5, 0.25]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_embedding_cache_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", [3.0])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_embedding_cache_respects_byte_budget():
+    cache = EmbeddingCache(max_bytes=EmbeddingCache._entry_size("a", array("f", [0.0] * 8)) + 1)
+    cache.put("a", [0.0] * 8)
+    cache.put("b", [0.0] * 8)
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+    cache.put("huge", [0.0] * 1000)  # Larger than the whole cache: not stored
+    assert cache.get("huge") is None
+
+
+def test_embedding_cache_entries_expire(clock):
+    cache = EmbeddingCache(ttl_seconds=10)
+    cache.put("q", [1.0])
+    clock.now += 5
+    assert cache.get("q") == [1.0]
+    clock.now += 6
+    assert cache.get("q") is None
+    stats = cache.get_stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for request coalescing in singleflight.py.
+Run with: python -m pytest Cindys_code/test_singleflight.py
+"""
+
+import asyncio
+
+import pytest
+
+from singleflight import FlightCancelledError, SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    """Followers arriving while the leader runs get the leader's result."""
+
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work(flight):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "answer"
+
+        async def caller():
+            flight = flights.get("q")
+            if flight is not None:
+                return await flight.wait()
+            return await flights.run("q", work)
+
+        tasks = [asyncio.create_task(caller()) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        return calls, await asyncio.gather(*tasks), flights.get_stats()
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["answer"] * 5
+    assert stats == {"in_flight": 0, "leaders": 1, "coalesced_requests": 4}
+
+
+def test_key_is_released_after_the_leader_finishes():
+    """Later callers trigger a fresh execution instead of reusing an old result."""
+
+    async def scenario():
+        flights = SingleFlight()
+        counter = iter(range(10))
+
+        async def work(flight):
+            return next(counter)
+
+        first = await flights.run("q", work)
+        assert flights.get("q") is None
+        second = await flights.run("q", work)
+        return first, second, flights.get_stats()
+
+    first, second, stats = asyncio.run(scenario())
+    assert (first, second) == (0, 1)
+    assert stats["leaders"] == 2
+    assert stats["coalesced_requests"] == 0
+
+
+def test_leader_error_is_propagated_to_followers():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def work(flight):
+            started.set()
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        leader = asyncio.create_task(flights.run("q", work))
+        await started.wait()
+        follower = asyncio.create_task(flights.get("q").wait())
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader_result, follower_result = asyncio.run(scenario())
+    assert isinstance(leader_result, ValueError)
+    assert isinstance(follower_result, ValueError)
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    """Followers get FlightCancelledError (not CancelledError) and can retry."""
+
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def work(flight):
+            started.set()
+            await asyncio.sleep(10)
+
+        leader = asyncio.create_task(flights.run("q", work))
+        await started.wait()
+        follower = asyncio.create_task(flights.get("q").wait())
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        with pytest.raises(FlightCancelledError):
+            await follower
+        return flights.get_stats()
+
+    assert asyncio.run(scenario())["in_flight"] == 0
+
+
+def test_follower_cancellation_does_not_cancel_the_leader():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def work(flight):
+            started.set()
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.create_task(flights.run("q", work))
+        await started.wait()
+        follower = asyncio.create_task(flights.get("q").wait())
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+        return await leader, follower
+
+    result, follower = asyncio.run(scenario())
+    assert result == "answer"
+    assert follower.cancelled()
@@ -0,0 +1,137 @@
+# backend/vector_index.py
+# In-process mirror of a small ChromaDB collection. All embeddings are held in a
+# contiguous float32 matrix so a top-k lookup is a single vectorized
+# matrix-vector product instead of a trip through Chroma's SQLite/HNSW path.
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+SUPPORTED_SPACES = ("cosine", "l2", "ip")
+
+
+class InMemoryVectorIndex:
+    """
+    Exact nearest-neighbour index over a collection snapshot.
+
+    Results are returned in the same shape as `chromadb.Collection.query`, and
+    distances follow the collection's configured space (Chroma's "l2" is the
+    squared Euclidean distance), so callers can switch between the two paths.
+    """
+
+    def __init__(self, ids: List[str], embeddings, documents: List[str], metadatas: List[dict], space: str = "l2"):
+        """
+        Args:
+            ids: FAQ ids, row-aligned with the embeddings
+            embeddings: Matrix-like of shape (n, dim)
+            documents: Document text per row
+            metadatas: Metadata dict per row
+            space: Distance space of the source collection ("cosine", "l2" or "ip")
+        """
+        if space not in SUPPORTED_SPACES:
+            raise ValueError(f"Unsupported space '{space}', expected one of {SUPPORTED_SPACES}")
+
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [m or {} for m in metadatas]
+        self.space = space
+
+        matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(self.ids), -1)
+        self.squared_norms = np.einsum("ij,ij->i", matrix, matrix)
+        if space == "cosine":
+            # Normalize once so cosine similarity becomes a plain dot product
+            norms = np.sqrt(self.squared_norms)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms[:, None]
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    @classmethod
+    def from_collection(cls, collection, max_rows: int) -> Optional["InMemoryVectorIndex"]:
+        """
+        Loads every row of a Chroma collection into memory.
+
+        Returns:
+            The index, or None when the collection has more than `max_rows` rows
+            (callers then keep querying Chroma directly)
+        """
+        count = collection.count()
+        if count > max_rows:
+            return None
+
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        embeddings = data.get("embeddings")
+        if embeddings is None:
+            embeddings = []
+        metadata = getattr(collection, "metadata", None) or {}
+        space = metadata.get("hnsw:space", "l2")
+        return cls(
+            ids=data["ids"],
+            embeddings=embeddings if len(embeddings) else np.zeros((0, 0), dtype=np.float32),
+            documents=data.get("documents") or [""] * len(data["ids"]),
+            metadatas=data.get("metadatas") or [{}] * len(data["ids"]),
+            space=space,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _distances(self, queries: np.ndarray) -> np.ndarray:
+        """Distances from each query (rows) to every indexed vector (columns)."""
+        if self.space == "cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return 1.0 - (queries / norms) @ self.matrix.T
+        if self.space == "ip":
+            return 1.0 - queries @ self.matrix.T
+        query_norms = np.einsum("ij,ij->i", queries, queries)
+        return query_norms[:, None] + self.squared_norms[None, :] - 2.0 * (queries @ self.matrix.T)
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 3, include: Sequence[str] = ("documents", "metadatas")) -> dict:
+        """
+        Returns the `n_results` nearest rows for each query embedding.
+
+        Args:
+            query_embeddings: One or more query vectors
+            n_results: Number of neighbours per query
+            include: Fields to return besides ids ("documents", "metadatas", "distances")
+
+        Returns:
+            dict: Chroma-style result with one inner list per query
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        k = min(n_results, len(self.ids))
+        if k == 0:
+            for _ in range(len(queries)):
+                for field in result.values():
+                    field.append([])
+            return self._select(result, include)
+
+        distances = self._distances(queries)
+        # argpartition finds the k smallest in O(n); only those k are sorted
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        for row, candidates in enumerate(top):
+            ordered = candidates[np.argsort(distances[row, candidates])]
+            result["ids"].append([self.ids[i] for i in ordered])
+            result["documents"].append([self.documents[i] for i in ordered])
+            result["metadatas"].append([self.metadatas[i] for i in ordered])
+            result["distances"].append(distances[row, ordered].tolist())
+        return self._select(result, include)
+
+    @staticmethod
+    def _select(result: dict, include: Sequence[str]) -> dict:
+        return {key: value for key, value in result.items() if key == "ids" or key in include}
+
+    def get_stats(self) -> dict:
+        """Returns index size for observability."""
+        return {
+            "rows": len(self.ids),
+            "dim": int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0,
+            "space": self.space,
+            "bytes": int(self.matrix.nbytes),
+        }
@@ -7,22 +7,39 @@ Integrated with Splunk SignalFX OTEL for production use.
 """
 
 import os
+import argparse
 import asyncio
 import logging
 import time
 from typing import Dict, Any
 from dotenv import load_dotenv
 
+from conversation_history import ConversationHistory, ConversationRecord
+from conversation_log import ConversationLog
+from fake_llm import FakeLLM
+from load_driver import LOOP_CLOSED, LOOP_MODES, LoadDriver, load_corpus
+
 # Load environment variables
 load_dotenv()
 
+# LLM backend: "simulated" keeps the fixed 0.1s delay, "fake" uses the configurable FakeLLM (see fake_llm.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "simulated")
+
+# Conversation history: most recent exchanges kept in memory, older ones optionally spilled to a JSONL file
+CONVERSATION_HISTORY_CAPACITY = int(os.getenv("CONVERSATION_HISTORY_CAPACITY", "1000"))
+CONVERSATION_HISTORY_SPILL_PATH = os.getenv("CONVERSATION_HISTORY_SPILL_PATH") or None
+CONVERSATION_HISTORY_SPILL_MAX_PENDING = int(os.getenv("CONVERSATION_HISTORY_SPILL_MAX_PENDING", "64"))
+
+# Durable audit log of finished conversations (SQLite WAL, batched background writes); unset to disable
+CONVERSATION_LOG_PATH = os.getenv("CONVERSATION_LOG_PATH") or None
+CONVERSATION_LOG_BATCH_SIZE = int(os.getenv("CONVERSATION_LOG_BATCH_SIZE", "100"))
+CONVERSATION_LOG_FLUSH_INTERVAL_MS = float(os.getenv("CONVERSATION_LOG_FLUSH_INTERVAL_MS", "200"))
+CONVERSATION_LOG_QUEUE_SIZE = int(os.getenv("CONVERSATION_LOG_QUEUE_SIZE", "10000"))
+CONVERSATION_LOG_OVERFLOW = os.getenv("CONVERSATION_LOG_OVERFLOW", "drop")  # drop | block
+
 # OpenTelemetry imports for Splunk integration
 try:
-    from opentelemetry import trace
-    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-    from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor
-    from opentelemetry.sdk.resources import Resource
+    from telemetry import get_span_processor_stats, get_telemetry_stats, get_tracer, instrument_beeai, setup_telemetry, test_span_export
     OTEL_AVAILABLE = True
     print("✅ OpenTelemetry available for Splunk integration")
 except ImportError:
@@ -82,15 +99,6 @@ class BaseAgent:
         self.description = description
         self.instructions = instructions
 
-# OpenTelemetry instrumentation for BeeAI
-try:
-    from openinference.instrumentation.beeai import BeeAIInstrumentor
-    OBSERVABILITY_ENABLED = True
-    print("✅ OpenTelemetry instrumentation available")
-except ImportError:
-    OBSERVABILITY_ENABLED = False
-    print("⚠️  OpenTelemetry instrumentation not available. Install with: pip install openinference-instrumentation-beeai")
-
 class GeminiFlashAgent(BaseAgent):
     """A BeeAI agent that uses Gemini Flash 1.5 with observability."""
     
@@ -112,39 +120,57 @@ class GeminiFlashAgent(BaseAgent):
             description="Google's Gemini Flash 1.5 model for fast, efficient AI responses"
         )
         
-        # Track conversation history for observability
-        self.conversation_history = []
+        # Optional offline fake LLM with realistic latency, streaming and failure injection
+        self.fake_llm = FakeLLM.from_env() if LLM_BACKEND == "fake" else None
+        
+        # Track recent conversation history for observability (bounded ring buffer)
+        self.conversation_history = ConversationHistory(
+            capacity=CONVERSATION_HISTORY_CAPACITY,
+            spill_path=CONVERSATION_HISTORY_SPILL_PATH,
+            spill_max_pending=CONVERSATION_HISTORY_SPILL_MAX_PENDING,
+        )
+        
+        # Persist finished conversations for audits without writing on the request path
+        self.conversation_log = ConversationLog(
+            path=CONVERSATION_LOG_PATH,
+            batch_size=CONVERSATION_LOG_BATCH_SIZE,
+            flush_interval_ms=CONVERSATION_LOG_FLUSH_INTERVAL_MS,
+            max_queue_size=CONVERSATION_LOG_QUEUE_SIZE,
+            overflow=CONVERSATION_LOG_OVERFLOW,
+        ) if CONVERSATION_LOG_PATH else None
         self.request_count = 0
+        self.error_count = 0
         
         # Initialize tracer for this agent
         if OTEL_AVAILABLE:
-            self.tracer = trace.get_tracer("beeai-gemini-agent")
+            self.tracer = get_tracer("beeai-gemini-agent")
         else:
             self.tracer = None
         
     async def process_message(self, message: str, context: Dict[str, Any] = None) -> str:
         """Process a user message with full observability."""
         
-        # Increment request counter
+        # Increment request counter (kept locally: concurrent calls interleave)
         self.request_count += 1
+        request_id = self.request_count
         
         # Log the incoming message
-        self.logger.info(f"Processing message #{self.request_count}: {message[:50]}...")
+        self.logger.info(f"Processing message #{request_id}: {message[:50]}...")
         
         # Add to conversation history
-        self.conversation_history.append({
-            "request_id": self.request_count,
-            "user_message": message,
-            "timestamp": asyncio.get_event_loop().time(),
-            "context": context or {}
-        })
+        entry = self.conversation_history.append(ConversationRecord(
+            request_id=request_id,
+            user_message=message,
+            timestamp=asyncio.get_event_loop().time(),
+            context=context,
+        ))
         
         # Start OTEL span for message processing
         if self.tracer:
             with self.tracer.start_as_current_span("process_message") as span:
                 span.set_attribute("service.name", "beeai-gemini-agent")
                 span.set_attribute("agent.name", self.name)
-                span.set_attribute("request.id", self.request_count)
+                span.set_attribute("request.id", request_id)
                 span.set_attribute("llm.prompt", message)
                 span.set_attribute("llm.model", "gemini-flash-1.5")
                 
@@ -154,26 +180,28 @@ class GeminiFlashAgent(BaseAgent):
                     response = await self._generate_response(message, context)
                     
                     # Log successful response
-                    self.logger.info(f"Generated response for request #{self.request_count}")
+                    self.logger.info(f"Generated response for request #{request_id}")
                     
                     # Update conversation history with response
-                    self.conversation_history[-1]["agent_response"] = response
-                    self.conversation_history[-1]["status"] = "success"
+                    entry.agent_response = response
+                    entry.status = "success"
                     
                     # Set span attributes for successful response
                     span.set_attribute("llm.response", response)
                     span.set_attribute("llm.status", "success")
                     span.set_attribute("llm.response_length", len(response))
                     
+                    await self._log_conversation(entry)
                     return response
                     
                 except Exception as e:
                     # Log error for observability
-                    self.logger.error(f"Error processing request #{self.request_count}: {str(e)}")
+                    self.logger.error(f"Error processing request #{request_id}: {str(e)}")
+                    self.error_count += 1
                     
                     # Update conversation history with error
-                    self.conversation_history[-1]["status"] = "error"
-                    self.conversation_history[-1]["error"] = str(e)
+                    entry.status = "error"
+                    entry.error = str(e)
                     
                     # Set span attributes for error
                     span.set_attribute("llm.status", "error")
@@ -181,28 +209,49 @@ class GeminiFlashAgent(BaseAgent):
                     span.set_attribute("error.type", type(e).__name__)
                     
                     # Return fallback response
+                    await self._log_conversation(entry)
                     return f"I apologize, but I encountered an error: {str(e)}"
         else:
             # Fallback without OTEL
             try:
                 response = await self._generate_response(message, context)
-                self.logger.info(f"Generated response for request #{self.request_count}")
-                self.conversation_history[-1]["agent_response"] = response
-                self.conversation_history[-1]["status"] = "success"
+                self.logger.info(f"Generated response for request #{request_id}")
+                entry.agent_response = response
+                entry.status = "success"
+                await self._log_conversation(entry)
                 return response
             except Exception as e:
-                self.logger.error(f"Error processing request #{self.request_count}: {str(e)}")
-                self.conversation_history[-1]["status"] = "error"
-                self.conversation_history[-1]["error"] = str(e)
+                self.logger.error(f"Error processing request #{request_id}: {str(e)}")
+                self.error_count += 1
+                entry.status = "error"
+                entry.error = str(e)
+                await self._log_conversation(entry)
                 return f"I apologize, but I encountered an error: {str(e)}"
     
+    async def _log_conversation(self, entry: ConversationRecord):
+        """Queue a finished conversation for the durable log (never writes on the request path)."""
+        if self.conversation_log:
+            await self.conversation_log.submit(entry.to_dict())
+    
+    async def shutdown(self):
+        """Flush spilled history and write all queued conversation log records."""
+        await asyncio.to_thread(self.conversation_history.flush)
+        if self.conversation_log:
+            await self.conversation_log.close()
+    
     async def _generate_response(self, message: str, context: Dict[str, Any] = None) -> str:
         """Generate a response using Gemini Flash 1.5 (simulated)."""
         
+        # Use the fake LLM's latency, streaming and failure model when configured
+        if self.fake_llm:
+            return await self.fake_llm.generate(message, response_text=self._canned_response(message))
+        
         # Simulate API call delay
         await asyncio.sleep(0.1)
-        
-        # Simple response logic (replace with actual Gemini API call)
+        return self._canned_response(message)
+    
+    def _canned_response(self, message: str) -> str:
+        """Simple response logic (replace with actual Gemini API call)."""
         if "hello" in message.lower():
             return "Hello! I'm your Gemini Flash 1.5 powered AI assistant. How can I help you today?"
         elif "help" in message.lower():
@@ -219,99 +268,134 @@ class GeminiFlashAgent(BaseAgent):
         return {
             "agent_name": self.name,
             "total_requests": self.request_count,
+            "total_errors": self.error_count,
             "conversation_count": len(self.conversation_history),
-            "recent_conversations": self.conversation_history[-5:] if self.conversation_history else [],
+            "conversation_history": self.conversation_history.get_stats(),
+            "conversation_log": self.conversation_log.get_stats() if self.conversation_log else {"enabled": False},
+            "recent_conversations": [record.to_dict() for record in self.conversation_history.recent(5)],
+            "telemetry": get_telemetry_stats() if OTEL_AVAILABLE else {"available": False},
+            "llm_backend": self.fake_llm.get_stats() if self.fake_llm else {"backend": LLM_BACKEND},
             "status": "active"
         }
 
-def setup_splunk_otel():
-    """Set up OpenTelemetry for Splunk SignalFX."""
-    if not OTEL_AVAILABLE:
-        print("⚠️  OpenTelemetry not available - skipping OTEL setup")
-        return None
-    
-    try:
-        # Configuration - REPLACE THESE VALUES with your production settings
-        OTEL_ENDPOINT = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")  # Your Splunk SignalFX OTEL endpoint
-        SERVICE_NAME = os.getenv("SERVICE_NAME", "beeai-gemini-demo")
-        ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-        
-        print(f"🔧 Setting up Splunk SignalFX OTEL integration...")
-        print(f"   Endpoint: {OTEL_ENDPOINT}")
-        print(f"   Service: {SERVICE_NAME}")
-        print(f"   Environment: {ENVIRONMENT}")
-        
-        # Create resource with service information
-        resource = Resource.create({
-            "service.name": SERVICE_NAME,
-            "service.version": "1.0.0",
-            "deployment.environment": ENVIRONMENT,
-            "telemetry.sdk.name": "beeai-framework",
-            "telemetry.sdk.version": "0.1.17"
-        })
-        
-        # Create tracer provider
-        tracer_provider = TracerProvider(resource=resource)
-        
-        # Create OTLP exporter for Splunk SignalFX
-        otlp_exporter = OTLPSpanExporter(
-            endpoint=OTEL_ENDPOINT,
-            headers={
-                # Add any required headers for your Splunk setup
-                # "Authorization": "Bearer your-token",
-                # "X-SF-TOKEN": "your-signalfx-token"
-            }
-        )
-        
-        # Add batch processor
-        tracer_provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
-        
-        # Set as global tracer provider
-        trace.set_tracer_provider(tracer_provider)
-        
-        print("✅ Splunk SignalFX OTEL integration configured successfully")
-        return tracer_provider
-        
-    except Exception as e:
-        print(f"⚠️  Failed to configure Splunk SignalFX OTEL: {e}")
-        print("💡 Check your OTEL endpoint and configuration")
-        return None
+# Sample messages used by the demo and as the default load test corpus
+TEST_MESSAGES = [
+    "Hello! How are you today?",
+    "Can you tell me about BeeAI?",
+    "What is observability?",
+    "How does Gemini Flash 1.5 work?",
+    "Can you help me with a coding problem?"
+]
 
-def test_span_export(tracer_provider, endpoint: str):
-    """Test that spans can be exported successfully to verify connectivity."""
-    try:
-        print(f"🧪 Testing span export to {endpoint}...")
-        
-        # Create a test span
-        test_tracer = trace.get_tracer("span-test")
-        with test_tracer.start_as_current_span("test_span") as span:
-            span.set_attribute("test.attribute", "span_export_test")
-            span.set_attribute("test.timestamp", time.time())
-            span.set_attribute("test.service", "beeai-sidecar-test")
-        
-        # Force export by shutting down the tracer provider
-        tracer_provider.force_flush()
-        
-        print("✅ Span export test completed successfully")
-        print("💡 Check your Splunk dashboard for the test span")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Span export test failed: {e}")
-        print("💡 Check your OTEL endpoint connectivity")
-        return False
+def parse_args(argv=None):
+    """Parse command line flags; without --load the demo runs the sample messages once."""
+    parser = argparse.ArgumentParser(description="BeeAI Python Demo with Observability")
+    load = parser.add_argument_group("load test")
+    load.add_argument("--load", action="store_true", help="Run the concurrent load driver instead of the sample messages")
+    load.add_argument("--concurrency", type=int,
+                      help="Workers (closed loop, default 10) or in-flight cap (open loop, default unlimited; "
+                           "shed arrivals are excluded from the percentiles)")
+    load.add_argument("--rps", type=float, default=0.0, help="Target requests per second (required for open loop, 0 = unpaced)")
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds to generate load")
+    load.add_argument("--corpus", help="File with one message per line (default: the sample messages)")
+    load.add_argument("--loop", choices=LOOP_MODES, default=LOOP_CLOSED, help="Open loop (fixed arrival rate) or closed loop")
+    load.add_argument("--tracing", choices=("on", "off", "both"), default="on",
+                      help="Run with tracing, without it, or both back to back for comparison")
+    load.add_argument("--measure-span-overhead", action="store_true",
+                      help="Time the per-span tracing overhead at startup and check it against OTEL_SPAN_OVERHEAD_BUDGET_US")
+    receiver = parser.add_argument_group("local OTLP receiver")
+    receiver.add_argument("--local-receiver", action="store_true",
+                          help="Send traces to an in-process stand-in collector (otlp_receiver.py) instead of OTEL_ENDPOINT")
+    receiver.add_argument("--receiver-latency-ms", type=float, default=0.0, help="Delay the stand-in adds to each export request")
+    receiver.add_argument("--receiver-error-rate", type=float, default=0.0, help="Fraction of export requests answered with 503")
+    receiver.add_argument("--receiver-throttle-rate", type=float, default=0.0, help="Fraction of export requests answered with 429")
+    return parser.parse_args(argv)
 
+async def run_load_test(agent: GeminiFlashAgent, args, tracer_provider=None):
+    """Drive the agent with the load driver and print throughput and latency percentiles."""
+    messages = load_corpus(args.corpus, TEST_MESSAGES)
+    passes = {"on": [True], "off": [False], "both": [False, True]}[args.tracing]
+    
+    # Per-request logging would dominate the measurement
+    agent.logger.logger.setLevel(LoggerLevel.WARNING)
+    tracer = agent.tracer
+    
+    print(f"\n🏋️  Load test: {len(messages)} messages, {args.duration}s per run")
+    results = []
+    for traced in passes:
+        agent.tracer = tracer if traced else None
+        if traced and not tracer:
+            print("⚠️  Tracing requested but OpenTelemetry is not configured - skipping traced run")
+            continue
+        errors_before = agent.error_count
+        driver = LoadDriver(
+            handler=agent.process_message,
+            messages=messages,
+            concurrency=args.concurrency,
+            target_rps=args.rps,
+            duration_s=args.duration,
+            loop=args.loop,
+        )
+        result = await driver.run(label="tracing on" if traced else "tracing off")
+        # process_message turns failures into apology responses; count them as errors
+        result.errors += agent.error_count - errors_before
+        if traced and tracer_provider:
+            flush_start = time.perf_counter()
+            tracer_provider.force_flush()
+            print(f"  Span flush after run: {(time.perf_counter() - flush_start) * 1000:.1f} ms")
+            for name, stats in get_span_processor_stats().items():
+                print(f"  Span processor '{name}': dropped {stats['dropped_spans']} of {stats['received_spans']}, "
+                      f"avg batch {stats['avg_batch_size']}, export p99 {stats['export_latency_ms']['p99']} ms")
+        result.print_report()
+        results.append(result)
+    agent.tracer = tracer
+    
+    if len(results) == 2:
+        off, on = results[0].summary(), results[1].summary()
+        print("\n⚖️  Tracing overhead:")
+        print("=" * 50)
+        for key in ("throughput_rps", "p50_ms", "p90_ms", "p99_ms", "max_ms"):
+            print(f"  {key}: {off[key]} -> {on[key]} ({on[key] - off[key]:+.3f})")
+    return results
 
+def print_receiver_report(receiver, tracer_provider=None):
+    """Flush pending spans and print what the local OTLP receiver decoded."""
+    if receiver is None:
+        return
+    if tracer_provider:
+        tracer_provider.force_flush()
+    stats = receiver.get_stats()
+    print("\n📡 Local OTLP Receiver:")
+    print("=" * 50)
+    print(f"  Requests: {stats['requests']} (accepted {stats['accepted_requests']}, "
+          f"5xx {stats['errors_injected']}, 429 {stats['throttled']})")
+    print(f"  Spans received: {stats['spans_received']} | by service: {stats['spans_by_service']}")
+    print(f"  Bytes on the wire: {stats['bytes_received']} ({stats['bytes_per_span']} per span, "
+          f"encodings {stats['content_encodings']})")
+    receiver.stop()
 
-async def main():
+async def main(args=None):
     """Main function to demonstrate BeeAI with observability."""
+    args = args or parse_args([])
     
     print("🐝 Welcome to BeeAI Python Demo with Observability!")
     print("🚀 Using Gemini Flash 1.5 with Splunk SignalFX OTEL")
     
-    # Set up OpenTelemetry integration for Splunk
+    # Optional stand-in collector: spans are decoded and counted locally instead of going to Splunk
+    local_receiver = None
+    if args.local_receiver and OTEL_AVAILABLE:
+        from otlp_receiver import OTLPReceiver
+        local_receiver = OTLPReceiver(
+            latency_ms=args.receiver_latency_ms,
+            error_rate=args.receiver_error_rate,
+            throttle_rate=args.receiver_throttle_rate,
+        ).start()
+        os.environ["OTEL_ENDPOINT"] = local_receiver.endpoint
+        print(f"📡 Local OTLP receiver listening on {local_receiver.endpoint}")
+
+    # Set up OpenTelemetry integration for Splunk (skipped when the load test runs without tracing)
     tracer_provider = None
-    if OTEL_AVAILABLE:
+    if OTEL_AVAILABLE and not (args.load and args.tracing == "off"):
         try:
             # Get Splunk configuration from environment variables
             otel_endpoint = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")
@@ -319,7 +403,8 @@ async def main():
             environment = os.getenv("ENVIRONMENT", "sidecar-agent")
             
             # Configure OpenTelemetry to send traces to Splunk
-            tracer_provider = setup_splunk_otel()
+            tracer_provider = setup_telemetry(default_service_name="beeai-gemini-demo", default_environment="development",
+                                              measure_overhead=args.measure_span_overhead or None)
  
             if tracer_provider:
                 print("✅ OpenTelemetry configured for Splunk successfully")
@@ -330,18 +415,14 @@ async def main():
             print(f"⚠️  Failed to configure OpenTelemetry for Splunk: {e}")
             print("💡 Check your OTEL endpoint and configuration")
     
-    # Enable OpenTelemetry instrumentation if available
-    if OBSERVABILITY_ENABLED and tracer_provider:
-        try:
-            BeeAIInstrumentor().instrument()
-            print("✅ OpenTelemetry instrumentation enabled")
-        except Exception as e:
-            print(f"⚠️  Failed to enable instrumentation: {e}")
+    # Enable OpenTelemetry instrumentation if available (no-op if already instrumented)
+    if tracer_provider:
+        instrument_beeai()
     
     # Test span export to confirm connectivity
     if tracer_provider:
         otel_endpoint = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")
-        span_test_success = test_span_export(tracer_provider, otel_endpoint)
+        span_test_success = test_span_export(tracer_provider, otel_endpoint, service="beeai-sidecar-test")
         if not span_test_success:
             print("⚠️  Warning: Span export test failed - traces may not be reaching Splunk")
         else:
@@ -356,15 +437,17 @@ async def main():
     # Create the agent
     agent = GeminiFlashAgent()
     print(f"✅ Agent created: {agent.name}")
+    if args.load and (args.tracing == "off" or not tracer_provider):
+        agent.tracer = None  # Without a configured provider spans would only add no-op overhead
+    
+    if args.load:
+        await run_load_test(agent, args, tracer_provider)
+        await agent.shutdown()
+        print_receiver_report(local_receiver, tracer_provider)
+        return
     
     # Demonstrate the agent with some test messages
-    test_messages = [
-        "Hello! How are you today?",
-        "Can you tell me about BeeAI?",
-        "What is observability?",
-        "How does Gemini Flash 1.5 work?",
-        "Can you help me with a coding problem?"
-    ]
+    test_messages = TEST_MESSAGES
     
     print("\n🤖 Testing the agent with sample messages:")
     print("=" * 50)
@@ -386,6 +469,7 @@ async def main():
             print(f"  {key}: {value}")
     
     print(f"\n  recent_conversations: {len(obs_data['recent_conversations'])} items")
+    await agent.shutdown()
     
     # Final span export confirmation
     if tracer_provider:
@@ -397,6 +481,7 @@ async def main():
         print(f"  Environment: {os.getenv('ENVIRONMENT', 'sidecar-agent')}")
         print("  Status: ✅ Spans exported to Splunk OTEL")
     
+    print_receiver_report(local_receiver, tracer_provider)
     print("\n🎉 Demo completed successfully!")
     
     if tracer_provider:
@@ -412,4 +497,4 @@ async def main():
 
 if __name__ == "__main__":
     # Run the async main function
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Export-size benchmark for the span attribute policy.
+
+Records the spans of representative requests - a FAQ /chat request with a large
+RAG prompt (including the prompt/response the BeeAI instrumentation records as
+input.value/output.value) and a demo process_message call - and encodes them
+exactly as the OTLP/HTTP exporter would. Reports protobuf and gzip bytes per
+request without the policy and with it.
+"""
+
+import argparse
+import gzip
+import time
+
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+
+from telemetry.attributes import AttributePolicy, AttributePolicySpanProcessor
+
+FAQ_ENTRY = ("Q: How many vacation days do new employees get?\n"
+             "A: Full-time employees accrue 20 days of paid time off per year, prorated in the first year. "
+             "Unused days up to 5 carry over to the next calendar year; requests go through the HR portal "
+             "at least two weeks in advance and require manager approval.\n")
+
+
+class _CapturingExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _record_chat_request(tracer, query: str, contexts: int):
+    """Spans of one /chat request, using the attribute names agent.py sets."""
+    retrieved_info = FAQ_ENTRY * contexts
+    prompt = f"Answer the question using only this context:\n{retrieved_info}\nQuestion: {query}"
+    answer = "New employees get 20 days of paid time off per year, prorated in the first year. " * 4
+    with tracer.start_as_current_span("faq_agent_workflow") as span:
+        span.set_attribute("workflow.name", "Company FAQ Assistant")
+        span.set_attribute("workflow.query", query)
+        span.set_attribute("workflow.query_length", len(query))
+        span.set_attribute("workflow.timestamp", time.time())
+        with tracer.start_as_current_span("faq_tool_execution") as tool_span:
+            tool_span.set_attribute("tool.name", "faq_lookup_tool")
+            with tracer.start_as_current_span("faq_lookup") as lookup_span:
+                lookup_span.set_attribute("faq.query", query)
+                lookup_span.set_attribute("faq.query_length", len(query))
+                lookup_span.set_attribute("faq.status", "success")
+                lookup_span.set_attribute("faq.response_length", len(retrieved_info))
+            tool_span.set_attribute("tool.response_length", len(retrieved_info))
+            tool_span.set_attribute("tool.success", True)
+        with tracer.start_as_current_span("prompt_construction") as prompt_span:
+            prompt_span.set_attribute("prompt.retrieved_info_length", len(retrieved_info))
+            prompt_span.set_attribute("prompt.final_length", len(prompt))
+        with tracer.start_as_current_span("agent_workflow_execution") as workflow_span:
+            workflow_span.set_attribute("workflow.agent_name", "FAQAgent")
+            workflow_span.set_attribute("workflow.llm_model", "gpt-4o-mini")
+            with tracer.start_as_current_span("ChatModel") as llm_span:
+                llm_span.set_attribute("input.value", prompt)
+                llm_span.set_attribute("output.value", answer)
+            workflow_span.set_attribute("workflow.response_length", len(answer))
+        span.set_attribute("workflow.status", "success")
+
+
+def _record_demo_message(tracer, message: str):
+    """Span of one GeminiFlashAgent.process_message call."""
+    response = f"Thanks for your question about '{message}'. " * 12
+    with tracer.start_as_current_span("process_message") as span:
+        span.set_attribute("service.name", "beeai-gemini-agent")
+        span.set_attribute("agent.name", "GeminiFlashAgent")
+        span.set_attribute("request.id", 1)
+        span.set_attribute("llm.prompt", message)
+        span.set_attribute("llm.model", "gemini-flash-1.5")
+        span.set_attribute("llm.response", response)
+        span.set_attribute("llm.status", "success")
+        span.set_attribute("llm.response_length", len(response))
+
+
+def measure(policy, requests: int, contexts: int):
+    exporter = _CapturingExporter()
+    processor = SimpleSpanProcessor(exporter)
+    provider = TracerProvider()
+    provider.add_span_processor(AttributePolicySpanProcessor(processor, policy) if policy else processor)
+    tracer = provider.get_tracer("attribute-policy-benchmark")
+
+    start = time.perf_counter()
+    for i in range(requests):
+        _record_chat_request(tracer, f"How many vacation days do new employees get? (request {i})", contexts)
+        _record_demo_message(tracer, f"Explain our travel policy for request {i} in detail " * 20)
+    elapsed_s = time.perf_counter() - start
+    provider.shutdown()
+
+    payload = encode_spans(exporter.spans).SerializeToString()
+    return {
+        "bytes_per_request": len(payload) / requests,
+        "gzip_bytes_per_request": len(gzip.compress(payload)) / requests,
+        "record_us_per_request": elapsed_s / requests * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OTLP export bytes per request with and without the attribute policy")
+    parser.add_argument("--requests", type=int, default=500, help="Requests recorded per configuration")
+    parser.add_argument("--contexts", type=int, default=20, help="FAQ entries in the RAG prompt")
+    parser.add_argument("--max-length", type=int, default=256, help="Attribute max length for the truncating policy")
+    parser.add_argument("--hash-keys", default="input.value,output.value,llm.prompt,llm.response,workflow.query,faq.query",
+                        help="Keys hashed by the hashing policy")
+    args = parser.parse_args()
+
+    configurations = [
+        ("no policy", None),
+        (f"truncate to {args.max_length}", AttributePolicy(max_length=args.max_length)),
+        ("hash prompt/response keys", AttributePolicy(max_length=args.max_length, hash_keys=args.hash_keys.split(","))),
+        ("deny prompt/response keys", AttributePolicy(max_length=args.max_length, deny_keys=args.hash_keys.split(","))),
+    ]
+
+    print("📦 Span Attribute Policy Export-Size Benchmark")
+    print("=" * 50)
+    print(f"  Requests: {args.requests:,} | RAG contexts per prompt: {args.contexts}")
+    print(f"\n  {'policy':<28} | {'bytes/req':>10} | {'gzip/req':>9} | {'record µs/req':>13}")
+    baseline = None
+    for label, policy in configurations:
+        result = measure(policy, args.requests, args.contexts)
+        baseline = baseline or result["bytes_per_request"]
+        print(f"  {label:<28} | {result['bytes_per_request']:>10,.0f} | {result['gzip_bytes_per_request']:>9,.0f} | "
+              f"{result['record_us_per_request']:>13,.1f}  ({result['bytes_per_request'] / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for GeminiFlashAgent's conversation history.
+
+Sends a large number of messages through GeminiFlashAgent.process_message with a
+zero-latency fake LLM and no tracing, sampling the process RSS as it goes. With
+the bounded history, RSS should level off once the ring buffer is full and stay
+flat for the rest of the run.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import time
+
+# Zero-latency fake LLM so the run measures the agent's bookkeeping, not the model
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_DISTRIBUTION", "fixed")
+os.environ.setdefault("FAKE_LLM_LATENCY_MEDIAN_MS", "0")
+os.environ.setdefault("FAKE_LLM_TOKENS_PER_SECOND", "0")
+
+from beeai_python_demo import GeminiFlashAgent, LoggerLevel, TEST_MESSAGES  # noqa: E402
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(requests: int, samples: int, concurrency: int):
+    agent = GeminiFlashAgent()
+    agent.tracer = None
+    agent.logger.logger.setLevel(LoggerLevel.WARNING)
+    messages = [f"{message} (variant {i})" for i in range(50) for message in TEST_MESSAGES]
+
+    print("🧠 Conversation History Memory Benchmark")
+    print("=" * 50)
+    print(f"  Requests: {requests:,} | capacity: {agent.conversation_history.capacity:,} | concurrency: {concurrency}")
+    print(f"  Spill: {agent.conversation_history.spill_path or 'disabled'}")
+    print(f"\n  {'requests':>12} | {'RSS MiB':>9} | {'req/s':>9}")
+
+    rss = []
+    sent = 0
+    interval = max(1, requests // samples)
+    start = time.perf_counter()
+    while sent < requests:
+        batch = min(interval, requests - sent)
+        for offset in range(0, batch, concurrency):
+            await asyncio.gather(*(
+                agent.process_message(messages[(sent + offset + i) % len(messages)])
+                for i in range(min(concurrency, batch - offset))
+            ))
+        sent += batch
+        rss.append(current_rss_mb())
+        print(f"  {sent:>12,} | {rss[-1]:>9.1f} | {sent / (time.perf_counter() - start):>9,.0f}")
+
+    await agent.shutdown()
+    # Compare the second half of the run with the point where the buffer was first full
+    steady = rss[len(rss) // 2:]
+    print(f"\n📊 RSS after first sample: {rss[0]:.1f} MiB | final: {rss[-1]:.1f} MiB | "
+          f"drift over second half: {max(steady) - min(steady):+.1f} MiB")
+    print(f"  History stats: {agent.conversation_history.get_stats()}")
+    print(f"  get_observability_data(): {len(agent.get_observability_data()['recent_conversations'])} recent items")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2_000_000, help="Messages to send")
+    parser.add_argument("--samples", type=int, default=20, help="RSS samples taken over the run")
+    parser.add_argument("--concurrency", type=int, default=32, help="Messages processed concurrently")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.samples, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for OTLP/HTTP span export.
+
+Pushes a fixed number of representative agent spans through a
+MeteredBatchSpanProcessor into the local stand-in receiver (otlp_receiver.py, in
+its own process, with a per-request delay to model network round trips), for each
+combination of compression and concurrent in-flight exports. Reports spans/sec
+from first enqueue to the final flush, bytes on the wire and export outcomes.
+"""
+
+import argparse
+import time
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult, SimpleSpanProcessor
+
+from otlp_receiver import ReceiverProcess
+from telemetry.export_pool import build_otlp_exporter
+from telemetry.span_metrics import MeteredBatchSpanProcessor
+
+
+class _Capture(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+
+def make_spans(count: int):
+    """Records `count` spans shaped like the demo's process_message spans."""
+    capture = _Capture()
+    provider = TracerProvider(resource=Resource.create({"service.name": "beeai-export-benchmark"}))
+    provider.add_span_processor(SimpleSpanProcessor(capture))
+    tracer = provider.get_tracer("otlp-export-benchmark")
+    for i in range(count):
+        with tracer.start_as_current_span("process_message") as span:
+            span.set_attribute("agent.name", "GeminiFlashAgent")
+            span.set_attribute("request.id", i)
+            span.set_attribute("llm.model", "gemini-flash-1.5")
+            span.set_attribute("llm.prompt", f"How many vacation days do new employees get? (request {i})")
+            span.set_attribute("llm.status", "success")
+            span.set_attribute("llm.response_length", 240)
+    return capture.spans
+
+
+def run(spans, receiver, compression, in_flight, args):
+    exporter = build_otlp_exporter(receiver.endpoint, timeout_s=10, compression=compression, max_in_flight=in_flight)
+    processor = MeteredBatchSpanProcessor(exporter, name=f"bench-{compression}-{in_flight}", max_queue_size=len(spans),
+                                          max_export_batch_size=args.batch_size, schedule_delay_millis=50,
+                                          max_in_flight=in_flight)
+    receiver.reset()
+    start = time.perf_counter()
+    for span in spans:
+        processor.on_end(span)
+    processor.force_flush(120000)
+    elapsed_s = time.perf_counter() - start
+    stats = processor.get_stats()
+    processor.shutdown()
+    received = receiver.get_stats()
+    return {
+        "spans_per_s": len(spans) / elapsed_s,
+        "wire_bytes": received["bytes_received"],
+        "requests": received["requests"],
+        "received": received["spans_received"],
+        "exported": stats["exported_spans"],
+        "failed_batches": stats["failed_batches"],
+        "dropped": stats["dropped_spans"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OTLP export throughput by compression and concurrency")
+    parser.add_argument("--spans", type=int, default=50000, help="Spans exported per configuration")
+    parser.add_argument("--batch-size", type=int, default=512, help="Spans per export request")
+    parser.add_argument("--delay-ms", type=float, default=20, help="Receiver delay per request (models network RTT)")
+    parser.add_argument("--compressions", default="none,gzip", help="Compressions to compare")
+    parser.add_argument("--in-flight", default="1,4", help="Concurrent export counts to compare")
+    args = parser.parse_args()
+
+    receiver = ReceiverProcess(latency_ms=args.delay_ms)
+    spans = make_spans(args.spans)
+    print("🚚 OTLP Export Throughput Benchmark")
+    print("=" * 50)
+    print(f"  {args.spans:,} spans, batch {args.batch_size}, receiver delay {args.delay_ms:g} ms/request")
+    print(f"\n  {'compression':<11} | {'in flight':>9} | {'spans/s':>9} | {'wire MiB':>8} | {'bytes/span':>10} | {'requests':>8} | {'received':>8} | {'failed':>6}")
+    try:
+        for compression in args.compressions.split(","):
+            for in_flight in (int(n) for n in args.in_flight.split(",")):
+                r = run(spans, receiver, compression, in_flight, args)
+                print(f"  {compression:<11} | {in_flight:>9} | {r['spans_per_s']:>9,.0f} | {r['wire_bytes'] / 1048576:>8.2f} | "
+                      f"{r['wire_bytes'] / args.spans:>10.1f} | {r['requests']:>8} | {r['received']:>8,} | {r['failed_batches']:>6}")
+    finally:
+        receiver.stop()
+
+
+if __name__ == "__main__":
+    main()
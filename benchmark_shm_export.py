@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Request-latency benchmark for in-process vs. shared-memory span export.
+
+Runs an open-loop load (load_driver.py) against an async handler that does a
+little CPU work and records a configurable number of spans per request, once
+with the in-process MeteredBatchSpanProcessor and once with the shared-memory
+ring and its exporter process. Spans go to the stand-in OTLP receiver
+(otlp_receiver.py) running in its own process. At high span rates the batch
+thread's protobuf encoding and HTTP export compete with request handling for
+the GIL; the shared-memory mode moves that work out of the serving process,
+which shows up in p99 latency.
+"""
+
+import argparse
+import asyncio
+import time
+
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+
+from load_driver import LOOP_OPEN, LoadDriver
+from otlp_receiver import ReceiverProcess
+from telemetry.shm_export import EXPORT_MODE_INPROCESS, EXPORT_MODE_SHM, ShmRingSpanProcessor
+from telemetry.span_metrics import MeteredBatchSpanProcessor
+
+RESOURCE_ATTRIBUTES = {"service.name": "beeai-shm-export-benchmark"}
+
+
+def build_processor(mode: str, endpoint: str, args):
+    if mode == EXPORT_MODE_SHM:
+        return ShmRingSpanProcessor(endpoint, RESOURCE_ATTRIBUTES, name="bench-shm",
+                                    max_export_batch_size=args.batch_size, schedule_delay_millis=args.schedule_delay)
+    return MeteredBatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint), name="bench-inprocess",
+                                     max_queue_size=args.queue_size, max_export_batch_size=args.batch_size,
+                                     schedule_delay_millis=args.schedule_delay)
+
+
+async def run_mode(mode: str, endpoint: str, args):
+    processor = build_processor(mode, endpoint, args)
+    provider = TracerProvider(resource=Resource.create(RESOURCE_ATTRIBUTES))
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer("shm-export-benchmark")
+
+    async def handler(message: str):
+        with tracer.start_as_current_span("process_message") as span:
+            span.set_attribute("llm.prompt", message)
+            span.set_attribute("agent.name", "GeminiFlashAgent")
+            for i in range(args.spans_per_request - 1):
+                with tracer.start_as_current_span("step") as child:
+                    child.set_attribute("step.index", i)
+                    child.set_attribute("step.detail", message)
+            sum(range(args.work))  # Request CPU work
+        await asyncio.sleep(0)
+
+    driver = LoadDriver(handler, [f"How many vacation days do new employees get? #{i}" for i in range(100)],
+                        concurrency=args.concurrency, target_rps=args.rps, duration_s=args.duration, loop=LOOP_OPEN)
+    time.sleep(1.0)  # Let the exporter process start
+    result = await driver.run(label=mode)
+    provider.force_flush(30000)
+    stats = processor.get_stats()
+    provider.shutdown()
+    return result, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare request latency with in-process and shared-memory span export")
+    parser.add_argument("--rps", type=float, default=500, help="Open-loop request rate")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per mode")
+    parser.add_argument("--concurrency", type=int, default=0, help="Maximum requests in flight (0 = unlimited; shed arrivals are not measured)")
+    parser.add_argument("--spans-per-request", type=int, default=20, help="Spans recorded per request")
+    parser.add_argument("--work", type=int, default=5000, help="CPU work per request (range length summed)")
+    parser.add_argument("--batch-size", type=int, default=512, help="Spans per export request")
+    parser.add_argument("--queue-size", type=int, default=8192, help="In-process batch processor queue size")
+    parser.add_argument("--schedule-delay", type=float, default=200, help="Longest wait before a partial batch is exported (ms)")
+    parser.add_argument("--modes", default=f"{EXPORT_MODE_INPROCESS},{EXPORT_MODE_SHM}", help="Modes to run")
+    args = parser.parse_args()
+
+    receiver = ReceiverProcess()
+    endpoint = receiver.endpoint
+    print("🧵 Span Export Mode Latency Benchmark")
+    print("=" * 50)
+    print(f"  {args.rps:g} req/s x {args.spans_per_request} spans for {args.duration:g} s per mode, receiver {endpoint}")
+    results = {}
+    try:
+        for mode in args.modes.split(","):
+            receiver.reset()
+            result, stats = asyncio.run(run_mode(mode, endpoint, args))
+            results[mode] = result.summary()
+            result.print_report()
+            print(f"  spans exported: {stats['exported_spans']:,} | dropped: {stats['dropped_spans']:,} | "
+                  f"received: {receiver.get_stats()['spans_received']:,}")
+    finally:
+        receiver.stop()
+
+    if len(results) > 1:
+        print(f"\n  {'mode':<10} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8}")
+        for mode, summary in results.items():
+            print(f"  {mode:<10} | {summary['p50_ms']:>8.2f} | {summary['p99_ms']:>8.2f} | {summary['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput and drop benchmark for the tracing pipeline.
+
+For each scenario a fresh process configures telemetry exactly as the demo and
+the FAQ backend do (setup_telemetry(), so sampling, the attribute policy,
+batching, compression and concurrent export all come from the OTEL_* variables
+in effect) and records request-shaped traces at a fixed rate. Spans go to the
+stand-in receiver (otlp_receiver.py), which injects the scenario's faults and
+counts what actually arrives. The report compares spans recorded, dropped from
+the queue, in failed batches, and received, with throughput and wire bytes.
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+
+from otlp_receiver import ReceiverProcess
+
+# name -> OTLPReceiver fault options
+SCENARIOS = {
+    "healthy": {},
+    "slow": {"latency_ms": 250, "latency_distribution": "lognormal"},
+    "errors": {"error_rate": 0.2},
+    "throttled": {"throttle_rate": 0.3},
+    "down": {"error_rate": 1.0},
+}
+
+
+def _record_traces(endpoint: str, args, results) -> None:
+    """Scenario process: set up telemetry against `endpoint` and record traces at the target rate."""
+    os.environ["OTEL_ENDPOINT"] = endpoint
+    os.environ.setdefault("OTEL_BSP_EXPORT_TIMEOUT", str(args.export_timeout_ms))
+    os.environ.setdefault("OTEL_BSP_SCHEDULE_DELAY", "200")
+
+    from telemetry import get_telemetry_stats, get_tracer, setup_telemetry
+
+    provider = setup_telemetry(default_service_name="beeai-pipeline-benchmark", default_environment="benchmark")
+    tracer = get_tracer("pipeline-benchmark")
+    interval_s = 1.0 / args.rps
+    requests = 0
+    start = time.perf_counter()
+    deadline = start + args.duration
+    while time.perf_counter() < deadline:
+        with tracer.start_as_current_span("process_message") as span:
+            span.set_attribute("agent.name", "GeminiFlashAgent")
+            span.set_attribute("request.id", requests)
+            span.set_attribute("llm.prompt", f"How many vacation days do new employees get? (request {requests})")
+            for step in range(args.spans_per_request - 1):
+                with tracer.start_as_current_span("faq_lookup") as child:
+                    child.set_attribute("faq.step", step)
+        requests += 1
+        pause = start + requests * interval_s - time.perf_counter()
+        if pause > 0:
+            time.sleep(pause)
+    recorded_s = time.perf_counter() - start
+
+    flush_start = time.perf_counter()
+    provider.force_flush(args.export_timeout_ms * 4)
+    flush_s = time.perf_counter() - flush_start
+    stats = get_telemetry_stats()
+    provider.shutdown()
+    processor = stats["span_processors"].get("splunk", {})
+    results.put({
+        "requests": requests,
+        "recorded": requests * args.spans_per_request,
+        "recorded_s": recorded_s,
+        "flush_s": flush_s,
+        "queue_dropped": processor.get("dropped_spans", 0),
+        "failed_batches": processor.get("failed_batches", 0),
+        "export_p99_ms": (processor.get("export_latency_ms") or {}).get("p99"),
+    })
+
+
+def run_scenario(name: str, faults: dict, args) -> dict:
+    with ReceiverProcess(seed=1, **faults) as receiver:
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=_record_traces, args=(receiver.endpoint, args, results))
+        process.start()
+        result = results.get(timeout=args.duration + args.export_timeout_ms / 1000 * 10 + 60)
+        process.join(timeout=30)
+        received = receiver.get_stats()
+    result.update(
+        scenario=name,
+        received=received["spans_received"],
+        requests_sent=received["requests"],
+        rejected=received["errors_injected"] + received["throttled"],
+        bytes_per_span=received["bytes_per_span"],
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure tracing pipeline throughput and drops against a faulty collector")
+    parser.add_argument("--rps", type=float, default=200, help="Traced requests per second")
+    parser.add_argument("--spans-per-request", type=int, default=10, help="Spans per traced request")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per scenario")
+    parser.add_argument("--export-timeout-ms", type=int, default=2000, help="OTEL_BSP_EXPORT_TIMEOUT unless already set")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    args = parser.parse_args()
+
+    print("🔬 Tracing Pipeline Benchmark")
+    print("=" * 50)
+    print(f"  {args.rps:g} req/s x {args.spans_per_request} spans for {args.duration:g} s per scenario")
+    rows = [run_scenario(name, SCENARIOS[name], args) for name in args.scenarios.split(",")]
+
+    print(f"\n  {'scenario':<10} | {'recorded':>8} | {'q-dropped':>9} | {'received':>8} | {'delivered':>9} | "
+          f"{'recv/s':>8} | {'rejected':>8} | {'B/span':>6} | {'flush s':>7}")
+    for r in rows:
+        delivered = r["received"] / r["recorded"] if r["recorded"] else 0.0
+        print(f"  {r['scenario']:<10} | {r['recorded']:>8,} | {r['queue_dropped']:>9,} | {r['received']:>8,} | "
+              f"{delivered:>9.1%} | {r['received'] / (r['recorded_s'] + r['flush_s']):>8,.0f} | {r['rejected']:>8} | "
+              f"{r['bytes_per_span'] or 0:>6} | {r['flush_s']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
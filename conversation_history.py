@@ -0,0 +1,180 @@
+"""
+Bounded conversation history for long-running agents.
+
+ConversationHistory keeps the most recent `capacity` exchanges in a fixed-size
+ring buffer of compact `__slots__` records, so memory stays flat no matter how
+much traffic the agent serves. Records pushed out of the ring can optionally be
+spilled to a JSON-lines file instead of being dropped; the file is written by a
+background thread, so `append` never does I/O on the caller's (event loop) thread.
+At most `spill_max_pending` batches wait for that thread; if the disk falls
+further behind, new batches are dropped and counted rather than held in memory.
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ConversationRecord:
+    """One user message and the agent's outcome."""
+
+    __slots__ = ("request_id", "user_message", "timestamp", "context", "agent_response", "status", "error")
+
+    def __init__(self, request_id: int, user_message: str, timestamp: float, context: Optional[Dict[str, Any]] = None):
+        self.request_id = request_id
+        self.user_message = user_message
+        self.timestamp = timestamp
+        self.context = context or None  # Most requests have no context; don't keep an empty dict each
+        self.agent_response = None
+        self.status = "pending"
+        self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the record in the dict shape the agent used to store."""
+        record = {
+            "request_id": self.request_id,
+            "user_message": self.user_message,
+            "timestamp": self.timestamp,
+            "context": self.context or {},
+            "status": self.status,
+        }
+        if self.agent_response is not None:
+            record["agent_response"] = self.agent_response
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+
+class ConversationHistory:
+    """
+    Fixed-capacity ring buffer of ConversationRecord objects.
+
+    Appending is O(1) and never allocates beyond the preallocated slots; the
+    oldest record is overwritten once the buffer is full. With `spill_path` set,
+    overwritten records are handed to a writer thread in batches of
+    `spill_batch_size` and appended to that file there. Records still in flight
+    when they are pushed out are spilled as they are. Batches that find
+    `spill_max_pending` batches already queued are dropped (see `spill_dropped`).
+    """
+
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None, spill_batch_size: int = 256,
+                 spill_max_pending: int = 64):
+        """
+        Args:
+            capacity: Number of most recent records kept in memory
+            spill_path: Optional JSON-lines file receiving evicted records
+            spill_batch_size: Evicted records buffered before a write
+            spill_max_pending: Batches queued for the writer before new ones are dropped
+        """
+        if capacity < 1:
+            raise ValueError("Conversation history capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch_size = spill_batch_size
+        self.spill_max_pending = spill_max_pending
+
+        self._slots: List[Optional[ConversationRecord]] = [None] * capacity
+        self._next = 0  # Slot the next record is written to
+        self._size = 0
+        self._spill_buffer: List[ConversationRecord] = []
+        self._spill_queue: "queue.Queue[Optional[List[ConversationRecord]]]" = queue.Queue(maxsize=spill_max_pending)
+        self._spill_writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.total_appended = 0
+        self.evicted = 0
+        self.spilled = 0
+        self.spill_dropped = 0  # Evicted records discarded because the writer fell behind
+
+    def append(self, record: ConversationRecord) -> ConversationRecord:
+        """Adds a record, evicting (and optionally spilling) the oldest when full."""
+        with self._lock:
+            oldest = self._slots[self._next]
+            if oldest is not None:
+                self.evicted += 1
+                if self.spill_path:
+                    self._spill_buffer.append(oldest)
+                    if len(self._spill_buffer) >= self.spill_batch_size:
+                        self._hand_off_spill_locked(block=False)
+            self._slots[self._next] = record
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self.total_appended += 1
+        return record
+
+    def recent(self, n: int) -> List[ConversationRecord]:
+        """Returns up to the `n` most recent records, oldest first (O(n))."""
+        n = min(n, self._size)
+        return [self._slots[(self._next - n + i) % self.capacity] for i in range(n)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[ConversationRecord]:
+        return iter(self.recent(self._size))
+
+    def _hand_off_spill_locked(self, block: bool) -> None:
+        """
+        Queues the buffered evicted records for the writer thread.
+
+        Args:
+            block: Wait for queue space instead of dropping the batch when full
+        """
+        if not self._spill_buffer:
+            return
+        if self._spill_writer is None:
+            self._spill_writer = threading.Thread(target=self._spill_loop, name="conversation-spill-writer", daemon=True)
+            self._spill_writer.start()
+        try:
+            self._spill_queue.put(self._spill_buffer, block=block)
+        except queue.Full:
+            self.spill_dropped += len(self._spill_buffer)
+            if self.spill_dropped == len(self._spill_buffer):
+                print("⚠️  Conversation spill writer is falling behind; dropping evicted records")
+        self._spill_buffer = []
+
+    def _spill_loop(self) -> None:
+        while True:
+            batch = self._spill_queue.get()
+            try:
+                if batch is None:
+                    return
+                self._write_spill(batch)
+            except Exception as e:
+                print(f"⚠️  Failed to spill {len(batch)} conversation records: {e}")
+            finally:
+                self._spill_queue.task_done()
+
+    def _write_spill(self, batch: List[ConversationRecord]) -> None:
+        lines = [json.dumps(record.to_dict(), default=str) for record in batch]
+        directory = os.path.dirname(self.spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        self.spilled += len(batch)
+
+    def flush(self) -> None:
+        """
+        Writes buffered evicted records to the spill file and waits for the writer.
+
+        Blocks on file I/O; async callers should run it with `asyncio.to_thread`.
+        """
+        with self._lock:
+            self._hand_off_spill_locked(block=True)
+        self._spill_queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns capacity and counters (O(1))."""
+        return {
+            "capacity": self.capacity,
+            "size": self._size,
+            "total_appended": self.total_appended,
+            "evicted": self.evicted,
+            "spilled": self.spilled,
+            "spill_dropped": self.spill_dropped,
+            "spill_pending_batches": self._spill_queue.qsize(),
+            "spill_path": self.spill_path,
+        }
@@ -0,0 +1,187 @@
+"""
+Durable, append-only conversation log for audits.
+
+ConversationLog stores finished conversations in a SQLite database in WAL mode.
+Requests never touch the database: `submit()` only enqueues the record, and a
+background writer task groups queued records into one transaction per batch
+(by count or time, whichever comes first) and commits it from a worker thread.
+When the queue is full, records are either dropped and counted, or the caller
+waits for space (backpressure). `close()` drains the queue and flushes.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP, OVERFLOW_BLOCK)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id INTEGER,
+    timestamp REAL,
+    logged_at REAL NOT NULL,
+    status TEXT,
+    user_message TEXT,
+    agent_response TEXT,
+    error TEXT,
+    context TEXT
+)
+"""
+
+_INSERT = """
+INSERT INTO conversations (request_id, timestamp, logged_at, status, user_message, agent_response, error, context)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class ConversationLog:
+    """SQLite (WAL) conversation store fed by a batching background writer."""
+
+    def __init__(self, path: str, batch_size: int = 100, flush_interval_ms: float = 200.0,
+                 max_queue_size: int = 10000, overflow: str = OVERFLOW_DROP):
+        """
+        Args:
+            path: SQLite database file
+            batch_size: Records written per transaction at most
+            flush_interval_ms: Longest time a queued record waits for its batch to fill
+            max_queue_size: Records queued before the overflow policy applies
+            overflow: "drop" (count and discard) or "block" (callers wait for space)
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue_size = max_queue_size
+        self.overflow = overflow
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Only the writer uses the connection, one batch at a time, but from pool threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable across process crashes; WAL fsyncs at checkpoints
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+        self._queue: Optional[asyncio.Queue] = None  # Created lazily inside the running event loop
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.last_batch_ms = 0.0
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._writer = asyncio.create_task(self._run_writer())
+        return self._queue
+
+    async def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Queues a conversation record for writing.
+
+        Returns:
+            bool: False if the record was dropped because the queue was full or the log is closed
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+        queue = self._ensure_writer()
+        row = (
+            record.get("request_id"),
+            record.get("timestamp"),
+            time.time(),
+            record.get("status"),
+            record.get("user_message"),
+            record.get("agent_response"),
+            record.get("error"),
+            json.dumps(record["context"], default=str) if record.get("context") else None,
+        )
+        if self.overflow == OVERFLOW_BLOCK:
+            await queue.put(row)
+        else:
+            try:
+                queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return False
+        self.submitted += 1
+        return True
+
+    async def _run_writer(self) -> None:
+        """Collects batches from the queue and writes them off the event loop."""
+        queue = self._queue
+        while True:
+            row = await queue.get()
+            if row is None:
+                return
+            batch = [row]
+            deadline = time.monotonic() + self.flush_interval_ms / 1000.0
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    row = queue.get_nowait()  # Cheap path while records are already queued
+                except asyncio.QueueEmpty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if row is None:
+                    stop = True
+                    break
+                batch.append(row)
+            await asyncio.to_thread(self._write_batch, batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        start = time.perf_counter()
+        try:
+            with self._conn:  # One transaction per batch
+                self._conn.executemany(_INSERT, batch)
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.write_errors += 1
+            print(f"⚠️  Failed to write {len(batch)} conversation log records: {e}")
+        self.last_batch_ms = (time.perf_counter() - start) * 1000
+
+    async def close(self) -> None:
+        """Stops accepting records, writes everything still queued and closes the database."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            await self._queue.put(None)  # Sentinel after all queued records
+            await self._writer
+        self._conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns writer configuration and counters for observability."""
+        return {
+            "path": self.path,
+            "overflow": self.overflow,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+        }
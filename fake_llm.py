@@ -0,0 +1,190 @@
+"""
+Offline fake LLM for capacity planning and load testing.
+
+FakeLLM simulates a chat model without any network access: time to first token
+is drawn from a configurable latency distribution (fixed, lognormal or a
+heavy-tailed Pareto), tokens are emitted at a configurable rate, and errors and
+timeouts can be injected at given rates. It is used by GeminiFlashAgent in
+beeai_python_demo.py and, through a BeeAI ChatModel adapter, by the FAQ agent in
+Cindys_code/ (select it with LLM_BACKEND=fake).
+"""
+
+import asyncio
+import math
+import os
+import random
+from typing import AsyncIterator, Dict, List, Optional
+
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "pareto")
+
+
+class FakeLLMError(RuntimeError):
+    """Injected model failure (the fake equivalent of a 5xx from the provider)."""
+
+
+class LatencyModel:
+    """
+    Samples latencies in milliseconds.
+
+    - fixed: always `median_ms`
+    - lognormal: median `median_ms`, shape `sigma` (p99 is about median * e^(2.33 * sigma))
+    - pareto: minimum `median_ms / 2^(1/alpha)` so the median is `median_ms`; smaller
+      `alpha` means a heavier tail
+    Samples are clamped to `max_ms`.
+    """
+
+    def __init__(self, distribution: str = "lognormal", median_ms: float = 300.0, sigma: float = 0.5,
+                 alpha: float = 2.0, max_ms: float = 60000.0, rng: Optional[random.Random] = None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}', expected one of {LATENCY_DISTRIBUTIONS}")
+        self.distribution = distribution
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.alpha = alpha
+        self.max_ms = max_ms
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        if self.distribution == "fixed":
+            value = self.median_ms
+        elif self.distribution == "lognormal":
+            value = self.rng.lognormvariate(math.log(max(self.median_ms, 1e-6)), self.sigma)
+        else:
+            scale = self.median_ms / (2 ** (1.0 / self.alpha))
+            value = scale * self.rng.paretovariate(self.alpha)
+        return min(max(value, 0.0), self.max_ms)
+
+
+class FakeLLM:
+    """
+    Simulated LLM with realistic latency, streaming and failure behaviour.
+
+    A call waits for the sampled time to first token, then produces the response
+    at `tokens_per_second`. With probability `error_rate` the call fails with
+    FakeLLMError after the first-token delay; with probability `timeout_rate` it
+    hangs for `timeout_s` and raises TimeoutError.
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None, tokens_per_second: float = 50.0,
+                 response_tokens: int = 60, error_rate: float = 0.0, timeout_rate: float = 0.0,
+                 timeout_s: float = 30.0, seed: Optional[int] = None):
+        """
+        Args:
+            latency: Distribution of the time to first token
+            tokens_per_second: Generation speed after the first token; 0 emits everything at once
+            response_tokens: Length of generated answers when no response text is given
+            error_rate: Probability of an injected FakeLLMError
+            timeout_rate: Probability of an injected timeout
+            timeout_s: How long an injected timeout hangs before raising
+            seed: Seed for reproducible latency and failure sequences
+        """
+        self.rng = random.Random(seed)
+        self.latency = latency or LatencyModel(rng=self.rng)
+        self.latency.rng = self.rng
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_s = timeout_s
+
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.tokens_generated = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeLLM":
+        """
+        Builds a FakeLLM from FAKE_LLM_* environment variables.
+
+        Environment:
+            FAKE_LLM_LATENCY_DISTRIBUTION: fixed | lognormal | pareto (default lognormal)
+            FAKE_LLM_LATENCY_MEDIAN_MS: Median time to first token (default 300)
+            FAKE_LLM_LATENCY_SIGMA: Lognormal shape (default 0.5)
+            FAKE_LLM_LATENCY_ALPHA: Pareto tail index (default 2.0)
+            FAKE_LLM_LATENCY_MAX_MS: Clamp for sampled latencies (default 60000)
+            FAKE_LLM_TOKENS_PER_SECOND: Streaming speed (default 50)
+            FAKE_LLM_RESPONSE_TOKENS: Generated answer length (default 60)
+            FAKE_LLM_ERROR_RATE: Probability of an injected error (default 0)
+            FAKE_LLM_TIMEOUT_RATE: Probability of an injected timeout (default 0)
+            FAKE_LLM_TIMEOUT_S: Duration of an injected timeout (default 30)
+            FAKE_LLM_SEED: Seed for reproducible runs (default unseeded)
+        """
+        seed = os.getenv("FAKE_LLM_SEED")
+        return cls(
+            latency=LatencyModel(
+                distribution=os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "lognormal"),
+                median_ms=float(os.getenv("FAKE_LLM_LATENCY_MEDIAN_MS", "300")),
+                sigma=float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5")),
+                alpha=float(os.getenv("FAKE_LLM_LATENCY_ALPHA", "2.0")),
+                max_ms=float(os.getenv("FAKE_LLM_LATENCY_MAX_MS", "60000")),
+            ),
+            tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "50")),
+            response_tokens=int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", "60")),
+            error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            timeout_rate=float(os.getenv("FAKE_LLM_TIMEOUT_RATE", "0")),
+            timeout_s=float(os.getenv("FAKE_LLM_TIMEOUT_S", "30")),
+            seed=int(seed) if seed else None,
+        )
+
+    def _default_response(self, prompt: str) -> str:
+        """Deterministic filler answer built from the prompt's words."""
+        words = prompt.split() or ["answer"]
+        body = [words[i % len(words)] for i in range(max(self.response_tokens - 4, 1))]
+        return "Based on the FAQs: " + " ".join(body)
+
+    @staticmethod
+    def _tokenize(text: str) -> List[str]:
+        tokens = text.split(" ")
+        return [token + " " for token in tokens[:-1]] + [tokens[-1]]
+
+    async def _start(self) -> None:
+        """Waits for the first token and applies failure injection."""
+        self.calls += 1
+        roll = self.rng.random()
+        if roll < self.timeout_rate:
+            self.timeouts += 1
+            await asyncio.sleep(self.timeout_s)
+            raise TimeoutError(f"Fake LLM timed out after {self.timeout_s}s")
+
+        await asyncio.sleep(self.latency.sample() / 1000.0)
+        if roll < self.timeout_rate + self.error_rate:
+            self.errors += 1
+            raise FakeLLMError("Injected fake LLM failure")
+
+    async def stream(self, prompt: str, response_text: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streams the response token by token.
+
+        Args:
+            prompt: The prompt (used to build the default response)
+            response_text: Text to emit instead of the generated filler
+        """
+        await self._start()
+        tokens = self._tokenize(response_text if response_text is not None else self._default_response(prompt))
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for index, token in enumerate(tokens):
+            if index and interval:
+                await asyncio.sleep(interval)
+            self.tokens_generated += 1
+            yield token
+
+    async def generate(self, prompt: str, response_text: Optional[str] = None) -> str:
+        """Returns the complete response after the simulated generation time."""
+        parts = [token async for token in self.stream(prompt, response_text)]
+        return "".join(parts)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns configuration and counters for observability."""
+        return {
+            "backend": "fake",
+            "latency_distribution": self.latency.distribution,
+            "latency_median_ms": self.latency.median_ms,
+            "tokens_per_second": self.tokens_per_second,
+            "error_rate": self.error_rate,
+            "timeout_rate": self.timeout_rate,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "tokens_generated": self.tokens_generated,
+        }
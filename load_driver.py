@@ -0,0 +1,220 @@
+"""
+Concurrent load driver for async request handlers.
+
+Drives an `async def handler(message)` either as a closed loop (a fixed number
+of workers sending back to back, optionally paced to a target rate) or as an
+open loop (requests start on a fixed schedule regardless of how many are still
+in flight), then reports throughput and a latency histogram. In open-loop mode
+latency is measured from the scheduled start time, so queueing caused by a
+slow handler is not hidden (no coordinated omission). By default the open loop
+does not cap requests in flight; with a cap, arrivals beyond it are shed and
+only counted, so the percentiles then exclude them and must be read together
+with the shed count.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+LOOP_OPEN = "open"
+LOOP_CLOSED = "closed"
+LOOP_MODES = (LOOP_OPEN, LOOP_CLOSED)
+
+# Upper bounds (ms) of the printed latency histogram buckets
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def load_corpus(path: Optional[str], default: Sequence[str]) -> List[str]:
+    """Reads one message per line from `path`, skipping blank lines and # comments."""
+    if not path:
+        return list(default)
+    with open(path, encoding="utf-8") as f:
+        messages = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    if not messages:
+        raise ValueError(f"Message corpus '{path}' is empty")
+    return messages
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class LoadResult:
+    """Latencies and counters collected during one load run."""
+
+    def __init__(self, label: str, loop: str, concurrency: int, target_rps: float):
+        self.label = label
+        self.loop = loop
+        self.concurrency = concurrency
+        self.target_rps = target_rps
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.shed = 0  # Open-loop arrivals dropped at the in-flight cap (not part of the latencies)
+        self.max_in_flight = 0
+        self.elapsed_s = 0.0
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def throughput_rps(self) -> float:
+        return self.completed / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": self.completed,
+            "errors": self.errors,
+            "shed": self.shed,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_rps": round(self.throughput_rps, 2),
+            "max_in_flight": self.max_in_flight,
+            "p50_ms": round(percentile(ordered, 50), 3),
+            "p90_ms": round(percentile(ordered, 90), 3),
+            "p99_ms": round(percentile(ordered, 99), 3),
+            "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        }
+
+    def histogram(self) -> List[tuple]:
+        """Returns (label, count) rows for the latency histogram."""
+        counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for latency in self.latencies_ms:
+            for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+                if latency <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        labels = [f"<= {bound} ms" for bound in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+        return list(zip(labels, counts))
+
+    def print_report(self) -> None:
+        summary = self.summary()
+        rate = f"{self.target_rps:g} rps target" if self.target_rps > 0 else "unpaced"
+        concurrency = self.concurrency or "unlimited"
+        print(f"\n📈 Load run: {self.label} ({self.loop} loop, concurrency {concurrency}, {rate})")
+        print("=" * 50)
+        print(f"  Requests: {summary['requests']} in {summary['elapsed_s']} s | errors: {summary['errors']} | shed: {summary['shed']}")
+        print(f"  Throughput: {summary['throughput_rps']} req/s | max in flight: {summary['max_in_flight']}")
+        print(f"  Latency: p50 {summary['p50_ms']} ms | p90 {summary['p90_ms']} ms | "
+              f"p99 {summary['p99_ms']} ms | max {summary['max_ms']} ms")
+        rows = [(label, count) for label, count in self.histogram() if count]
+        peak = max((count for _, count in rows), default=1)
+        for label, count in rows:
+            print(f"  {label:>12} | {'█' * max(1, round(count / peak * 40))} {count}")
+
+
+class LoadDriver:
+    """
+    Runs a handler under load for a fixed duration.
+
+    Closed loop: `concurrency` workers each send the next message as soon as the
+    previous one finished; with `target_rps` > 0 they share a pacing schedule.
+    Open loop: a request is started every 1 / `target_rps` seconds regardless of
+    how many are in flight. With an in-flight cap (`concurrency` > 0), arrivals
+    that find no free slot are shed: counted, but not delayed and not included
+    in the latency percentiles.
+    """
+
+    def __init__(self, handler: Callable[[str], Awaitable[object]], messages: Sequence[str],
+                 concurrency: Optional[int] = None, target_rps: float = 0.0, duration_s: float = 10.0,
+                 loop: str = LOOP_CLOSED):
+        """
+        Args:
+            handler: Async callable processing one message; exceptions count as errors
+            messages: Corpus cycled through in order
+            concurrency: Workers (closed loop, default 10) or in-flight cap
+                (open loop, default 0 = unlimited so every arrival is measured)
+            target_rps: Target request rate; 0 means unpaced (closed loop only)
+            duration_s: How long new requests are started
+            loop: "open" or "closed"
+        """
+        if loop not in LOOP_MODES:
+            raise ValueError(f"Unknown loop mode '{loop}', expected one of {LOOP_MODES}")
+        if loop == LOOP_OPEN and target_rps <= 0:
+            raise ValueError("Open-loop load requires a target rate (target_rps > 0)")
+        if not messages:
+            raise ValueError("Load driver needs at least one message")
+        self.handler = handler
+        self.messages = list(messages)
+        if loop == LOOP_OPEN:
+            self.concurrency = max(0, concurrency or 0)
+        else:
+            self.concurrency = max(1, 10 if concurrency is None else concurrency)
+        self.target_rps = target_rps
+        self.duration_s = duration_s
+        self.loop = loop
+        self._sent = 0
+        self._in_flight = 0
+
+    def _next_message(self) -> str:
+        message = self.messages[self._sent % len(self.messages)]
+        self._sent += 1
+        return message
+
+    async def _call(self, result: LoadResult, message: str, start: float) -> None:
+        self._in_flight += 1
+        result.max_in_flight = max(result.max_in_flight, self._in_flight)
+        try:
+            await self.handler(message)
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+        except Exception:
+            result.errors += 1
+        finally:
+            self._in_flight -= 1
+
+    async def run(self, label: str = "load") -> LoadResult:
+        """Runs the load for `duration_s` and waits for outstanding requests."""
+        result = LoadResult(label, self.loop, self.concurrency, self.target_rps)
+        self._sent = 0
+        started = time.perf_counter()
+        deadline = started + self.duration_s
+        if self.loop == LOOP_OPEN:
+            await self._run_open(result, started, deadline)
+        else:
+            await self._run_closed(result, started, deadline)
+        result.elapsed_s = time.perf_counter() - started
+        return result
+
+    async def _run_open(self, result: LoadResult, started: float, deadline: float) -> None:
+        interval = 1.0 / self.target_rps
+        tasks = set()
+        scheduled = started
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.concurrency and len(tasks) >= self.concurrency:
+                result.shed += 1  # The system is not keeping up with the offered rate
+            else:
+                task = asyncio.create_task(self._call(result, self._next_message(), scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            scheduled += interval
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _run_closed(self, result: LoadResult, started: float, deadline: float) -> None:
+        interval = 1.0 / self.target_rps if self.target_rps > 0 else 0.0
+        next_slot = [started]
+
+        async def worker():
+            while True:
+                if interval:
+                    slot = next_slot[0]
+                    next_slot[0] += interval
+                    if slot >= deadline:
+                        return
+                    delay = slot - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif time.perf_counter() >= deadline:
+                    return
+                await self._call(result, self._next_message(), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OTLP/HTTP trace collector.
+
+OTLPReceiver accepts `POST /v1/traces` like the Splunk collector does, decodes
+the (optionally gzip/deflate compressed) ExportTraceServiceRequest and counts
+requests, spans and bytes. Faults can be injected to see how the export
+pipeline behaves when the collector degrades: per-request latency (fixed,
+lognormal or Pareto, using fake_llm.LatencyModel), 5xx responses at a given
+rate and 429 throttling with a Retry-After header.
+
+It runs on a background thread of the calling process (`OTLPReceiver`), or in
+its own process (`ReceiverProcess`) when the receiver must not compete with the
+code being measured for the GIL. From the command line:
+
+    python otlp_receiver.py --port 4328 --latency-ms 50 --error-rate 0.05
+
+and point OTEL_ENDPOINT at http://localhost:4328/v1/traces.
+"""
+
+import argparse
+import gzip
+import multiprocessing
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+
+from fake_llm import LatencyModel
+
+TRACES_PATH = "/v1/traces"
+
+
+class OTLPReceiver:
+    """
+    OTLP/HTTP trace receiver with span counting and fault injection.
+
+    Spans are only counted for accepted requests; rejected (5xx/429) requests are
+    counted separately, since a well-behaved exporter sends them again.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 latency_distribution: str = "fixed", error_rate: float = 0.0, error_status: int = 503,
+                 throttle_rate: float = 0.0, retry_after_s: int = 1, seed: Optional[int] = None):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port (see `endpoint`)
+            latency_ms: Median delay before each response
+            latency_distribution: fixed, lognormal or pareto
+            error_rate: Fraction of requests answered with `error_status`
+            error_status: Status code of injected errors (500, 502, 503 or 504)
+            throttle_rate: Fraction of requests answered with 429
+            retry_after_s: Retry-After value sent with 429 responses
+            seed: Seed for reproducible fault injection
+        """
+        self.host = host
+        self.port = port
+        self.error_status = error_status
+        self.retry_after_s = retry_after_s
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._spans_arrived = threading.Condition(self._lock)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.set_faults(latency_ms=latency_ms, latency_distribution=latency_distribution,
+                        error_rate=error_rate, throttle_rate=throttle_rate)
+        self.reset()
+
+    def set_faults(self, latency_ms: float = 0.0, latency_distribution: str = "fixed",
+                   error_rate: float = 0.0, throttle_rate: float = 0.0) -> None:
+        """Changes the injected faults; takes effect for the next request."""
+        self.latency = LatencyModel(latency_distribution, median_ms=latency_ms, rng=self._rng)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+
+    def reset(self) -> None:
+        """Clears all counters."""
+        with self._lock:
+            self.requests = 0
+            self.accepted_requests = 0
+            self.errors_injected = 0
+            self.throttled = 0
+            self.decode_failures = 0
+            self.spans_received = 0
+            self.bytes_received = 0  # On the wire, i.e. compressed
+            self.bytes_decoded = 0
+            self.spans_by_service: Counter = Counter()
+            self.content_encodings: Counter = Counter()
+            self.first_request_at: Optional[float] = None
+            self.last_request_at: Optional[float] = None
+
+    @property
+    def endpoint(self) -> str:
+        """URL to use as OTEL_ENDPOINT."""
+        return f"http://{self.host}:{self.port}{TRACES_PATH}"
+
+    def start(self) -> "OTLPReceiver":
+        """Starts serving on a daemon thread."""
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like a real collector
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, headers = receiver._handle(self.path, self.headers.get("Content-Encoding", ""), body)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name="otlp-receiver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "OTLPReceiver":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handle(self, path: str, encoding: str, body: bytes):
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += len(body)
+            self.content_encodings[encoding or "identity"] += 1
+            self.first_request_at = self.first_request_at or now
+            self.last_request_at = now
+            roll = self._rng.random()
+        delay_ms = self.latency.sample()
+        if delay_ms:
+            time.sleep(delay_ms / 1000.0)
+
+        if path.split("?")[0] != TRACES_PATH:
+            return 404, {}
+        if roll < self.throttle_rate:
+            with self._lock:
+                self.throttled += 1
+            return 429, {"Retry-After": str(self.retry_after_s)}
+        if roll < self.throttle_rate + self.error_rate:
+            with self._lock:
+                self.errors_injected += 1
+            return self.error_status, {}
+
+        try:
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "deflate":
+                body = zlib.decompress(body)
+            request = ExportTraceServiceRequest.FromString(body)
+        except Exception:
+            with self._lock:
+                self.decode_failures += 1
+            return 400, {}
+
+        spans = 0
+        by_service: Counter = Counter()
+        for resource_spans in request.resource_spans:
+            service = next((a.value.string_value for a in resource_spans.resource.attributes if a.key == "service.name"),
+                           "unknown")
+            count = sum(len(scope_spans.spans) for scope_spans in resource_spans.scope_spans)
+            by_service[service] += count
+            spans += count
+        with self._spans_arrived:
+            self.accepted_requests += 1
+            self.bytes_decoded += len(body)
+            self.spans_received += spans
+            self.spans_by_service.update(by_service)
+            self._spans_arrived.notify_all()
+        return 200, {"Content-Type": "application/x-protobuf"}
+
+    def wait_for_spans(self, count: int, timeout_s: float = 10.0) -> bool:
+        """Blocks until at least `count` spans were accepted; returns False on timeout."""
+        with self._spans_arrived:
+            return self._spans_arrived.wait_for(lambda: self.spans_received >= count, timeout_s)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns request, span and byte counters."""
+        with self._lock:
+            active_s = (self.last_request_at - self.first_request_at) if self.first_request_at else 0.0
+            return {
+                "endpoint": self.endpoint,
+                "requests": self.requests,
+                "accepted_requests": self.accepted_requests,
+                "errors_injected": self.errors_injected,
+                "throttled": self.throttled,
+                "decode_failures": self.decode_failures,
+                "spans_received": self.spans_received,
+                "bytes_received": self.bytes_received,
+                "bytes_decoded": self.bytes_decoded,
+                "bytes_per_span": round(self.bytes_received / self.spans_received, 1) if self.spans_received else None,
+                "spans_per_second": round(self.spans_received / active_s, 1) if active_s > 0 else None,
+                "spans_by_service": dict(self.spans_by_service),
+                "content_encodings": dict(self.content_encodings),
+            }
+
+
+def _serve_in_process(connection, options: dict) -> None:
+    receiver = OTLPReceiver(**options).start()
+    connection.send(receiver.endpoint)
+    while True:
+        command, argument = connection.recv()
+        if command == "stats":
+            connection.send(receiver.get_stats())
+        elif command == "reset":
+            receiver.reset()
+            connection.send(True)
+        elif command == "faults":
+            receiver.set_faults(**argument)
+            connection.send(True)
+        elif command == "wait":
+            connection.send(receiver.wait_for_spans(*argument))
+        elif command == "stop":
+            receiver.stop()
+            connection.send(True)
+            return
+
+
+class ReceiverProcess:
+    """Runs an OTLPReceiver in a separate process and proxies its controls."""
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: OTLPReceiver arguments (latency_ms, error_rate, throttle_rate, ...)
+        """
+        context = multiprocessing.get_context("spawn")
+        self._connection, child = context.Pipe()
+        self._lock = threading.Lock()
+        self._process = context.Process(target=_serve_in_process, args=(child, options), name="otlp-receiver", daemon=True)
+        self._process.start()
+        self.endpoint = self._connection.recv()
+
+    def _call(self, command: str, argument=None):
+        with self._lock:
+            self._connection.send((command, argument))
+            return self._connection.recv()
+
+    def get_stats(self) -> Dict[str, object]:
+        return self._call("stats")
+
+    def reset(self) -> None:
+        self._call("reset")
+
+    def set_faults(self, **faults) -> None:
+        self._call("faults", faults)
+
+    def wait_for_spans(self, count: int, timeout_s: float = 10.0) -> bool:
+        return self._call("wait", (count, timeout_s))
+
+    def stop(self) -> None:
+        if self._process.is_alive():
+            try:
+                self._call("stop")
+            except (EOFError, OSError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+
+    def __enter__(self) -> "ReceiverProcess":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OTLP/HTTP trace receiver with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4328)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median response delay")
+    parser.add_argument("--latency-distribution", default="fixed", help="fixed, lognormal or pareto")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between stats lines")
+    args = parser.parse_args()
+
+    receiver = OTLPReceiver(args.host, args.port, args.latency_ms, args.latency_distribution,
+                            args.error_rate, args.error_status, args.throttle_rate).start()
+    print(f"📡 OTLP receiver listening on {receiver.endpoint}")
+    try:
+        while True:
+            time.sleep(args.report_every)
+            stats = receiver.get_stats()
+            print(f"  requests {stats['requests']} | spans {stats['spans_received']} | bytes {stats['bytes_received']} | "
+                  f"5xx {stats['errors_injected']} | 429 {stats['throttled']} | services {stats['spans_by_service']}")
+    except KeyboardInterrupt:
+        receiver.stop()
+
+
+if __name__ == "__main__":
+    main()
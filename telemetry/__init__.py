@@ -0,0 +1,43 @@
+"""
+Shared OpenTelemetry setup for the BeeAI demo and the FAQ backend.
+
+Both entry points import from here, so a process gets exactly one tracer
+provider and one span processor however often setup is requested.
+"""
+
+from .attributes import AttributePolicy, AttributePolicySpanProcessor
+from .destinations import FanOutSpanProcessor, parse_destinations
+from .export_pool import ConcurrentSpanExporter, build_otlp_exporter
+from .overhead import SPAN_OVERHEAD_BUDGET_US, measure_span_overhead
+from .provider import (
+    get_telemetry_stats,
+    get_tracer,
+    get_tracer_provider,
+    instrument_beeai,
+    setup_telemetry,
+    test_span_export,
+)
+from .shm_export import ShmRingSpanProcessor
+from .span_metrics import MeteredBatchSpanProcessor, get_span_processor_stats
+from .spool import SpoolingSpanExporter
+
+__all__ = [
+    "AttributePolicy",
+    "AttributePolicySpanProcessor",
+    "ConcurrentSpanExporter",
+    "FanOutSpanProcessor",
+    "MeteredBatchSpanProcessor",
+    "SPAN_OVERHEAD_BUDGET_US",
+    "ShmRingSpanProcessor",
+    "SpoolingSpanExporter",
+    "build_otlp_exporter",
+    "get_span_processor_stats",
+    "get_telemetry_stats",
+    "get_tracer",
+    "get_tracer_provider",
+    "instrument_beeai",
+    "measure_span_overhead",
+    "parse_destinations",
+    "setup_telemetry",
+    "test_span_export",
+]
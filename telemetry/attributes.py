@@ -0,0 +1,227 @@
+"""
+Central attribute policy for exported spans.
+
+Prompts, responses and queries are recorded as span attributes, and with RAG
+context a single prompt can be many kilobytes. AttributePolicy rewrites span
+and span event attributes (e.g. `exception.stacktrace`) before spans reach the
+export queue:
+
+- keys can be restricted with an allow list and/or removed with a deny list
+- selected keys can be replaced by a content hash, keeping spans joinable
+  ("same prompt") without shipping the text
+- long string values are truncated with a marker that records the original length
+
+Key lists are comma-separated fnmatch patterns, e.g. "llm.*,workflow.query".
+"""
+
+import fnmatch
+import hashlib
+import os
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from opentelemetry.attributes import BoundedAttributes
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import Event, ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.util import BoundedList
+
+ATTRIBUTE_POLICY_ENABLED = os.getenv("OTEL_ATTRIBUTE_POLICY_ENABLED", "true").lower() == "true"
+ATTRIBUTE_MAX_LENGTH = int(os.getenv("OTEL_ATTRIBUTE_MAX_LENGTH", "1024"))  # 0 disables truncation
+ATTRIBUTE_HASH_KEYS = os.getenv("OTEL_ATTRIBUTE_HASH_KEYS", "")  # Keys exported as a content hash instead of text
+ATTRIBUTE_ALLOW_KEYS = os.getenv("OTEL_ATTRIBUTE_ALLOW_KEYS", "")  # If set, only these keys are exported
+ATTRIBUTE_DENY_KEYS = os.getenv("OTEL_ATTRIBUTE_DENY_KEYS", "")  # Keys never exported
+
+TRUNCATION_MARKER = "...[truncated {omitted} of {length} chars]"
+
+_KEEP, _DROP, _HASH = 0, 1, 2
+
+
+def _patterns(value: str) -> Tuple[str, ...]:
+    return tuple(pattern.strip() for pattern in value.split(",") if pattern.strip())
+
+
+def content_hash(value: str) -> str:
+    """Short, stable digest used in place of hashed attribute values."""
+    return "sha256:" + hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+class AttributePolicy:
+    """
+    Decides per attribute key whether to keep, drop or hash it, and truncates long strings.
+
+    Decisions are cached per key, so the steady-state cost is a dict lookup per attribute.
+    """
+
+    def __init__(self, max_length: int = ATTRIBUTE_MAX_LENGTH, hash_keys: Sequence[str] = (),
+                 allow_keys: Sequence[str] = (), deny_keys: Sequence[str] = ()):
+        """
+        Args:
+            max_length: Longest exported string value; 0 disables truncation
+            hash_keys: Patterns of keys whose string values are replaced by content_hash()
+            allow_keys: If non-empty, patterns of the only keys that are exported
+            deny_keys: Patterns of keys that are never exported (wins over allow_keys)
+        """
+        self.max_length = max_length
+        self.hash_keys = tuple(hash_keys)
+        self.allow_keys = tuple(allow_keys)
+        self.deny_keys = tuple(deny_keys)
+        self._actions: Dict[str, int] = {}
+
+        self.attributes_truncated = 0
+        self.attributes_hashed = 0
+        self.attributes_dropped = 0
+        self.chars_removed = 0
+
+    @classmethod
+    def from_env(cls) -> "AttributePolicy":
+        """Builds the policy from the OTEL_ATTRIBUTE_* environment variables."""
+        return cls(
+            max_length=ATTRIBUTE_MAX_LENGTH,
+            hash_keys=_patterns(ATTRIBUTE_HASH_KEYS),
+            allow_keys=_patterns(ATTRIBUTE_ALLOW_KEYS),
+            deny_keys=_patterns(ATTRIBUTE_DENY_KEYS),
+        )
+
+    def _matches(self, key: str, patterns: Tuple[str, ...]) -> bool:
+        return any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns)
+
+    def _action(self, key: str) -> int:
+        action = self._actions.get(key)
+        if action is None:
+            if self._matches(key, self.deny_keys) or (self.allow_keys and not self._matches(key, self.allow_keys)):
+                action = _DROP
+            elif self._matches(key, self.hash_keys):
+                action = _HASH
+            else:
+                action = _KEEP
+            self._actions[key] = action
+        return action
+
+    def apply(self, attributes: Optional[Mapping]) -> Optional[Mapping]:
+        """
+        Returns the attributes as they should be exported.
+
+        The input mapping itself is returned when nothing changes, so callers can
+        skip copying the span.
+        """
+        if not attributes:
+            return attributes
+        result = None
+        for key, value in attributes.items():
+            action = self._action(key)
+            new_value = value
+            if action == _DROP:
+                self.attributes_dropped += 1
+                new_value = None
+            elif isinstance(value, str):
+                if action == _HASH:
+                    new_value = content_hash(value)
+                    self.attributes_hashed += 1
+                elif self.max_length and len(value) > self.max_length:
+                    marker = TRUNCATION_MARKER.format(omitted=len(value) - self.max_length, length=len(value))
+                    new_value = value[:self.max_length] + marker
+                    self.attributes_truncated += 1
+                self.chars_removed += max(0, len(value) - len(new_value))
+
+            if new_value is not value and result is None:
+                # First change: copy everything seen so far
+                result = {}
+                for seen_key, seen_value in attributes.items():
+                    if seen_key == key:
+                        break
+                    result[seen_key] = seen_value
+            if result is not None and new_value is not None:
+                result[key] = new_value
+        return attributes if result is None else result
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns configuration and counters for observability."""
+        return {
+            "max_length": self.max_length,
+            "hash_keys": list(self.hash_keys),
+            "allow_keys": list(self.allow_keys),
+            "deny_keys": list(self.deny_keys),
+            "attributes_truncated": self.attributes_truncated,
+            "attributes_hashed": self.attributes_hashed,
+            "attributes_dropped": self.attributes_dropped,
+            "chars_removed": self.chars_removed,
+        }
+
+
+def _bounded_attributes(attributes: Mapping, dropped: int) -> BoundedAttributes:
+    """Immutable attributes that keep the SDK's dropped-attribute count."""
+    bounded = BoundedAttributes(attributes=attributes, immutable=True)
+    bounded.dropped = dropped
+    return bounded
+
+
+def _bounded_list(items: Sequence, dropped: int) -> BoundedList:
+    """Events or links that keep the SDK's dropped count."""
+    bounded = BoundedList.from_seq(None, items)
+    bounded.dropped = dropped
+    return bounded
+
+
+class AttributePolicySpanProcessor(SpanProcessor):
+    """Applies an AttributePolicy to the attributes and events of ended spans before passing them to `downstream`."""
+
+    def __init__(self, downstream: SpanProcessor, policy: Optional[AttributePolicy] = None):
+        """
+        Args:
+            downstream: Processor receiving the rewritten spans (e.g. the batch span processor)
+            policy: Policy to apply; configured from the environment by default
+        """
+        self.downstream = downstream
+        self.policy = policy or AttributePolicy.from_env()
+        self.spans_rewritten = 0
+        self.events_rewritten = 0
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.downstream.on_start(span, parent_context=parent_context)
+
+    def _apply_to_events(self, events: Sequence[Event]) -> Optional[list]:
+        """Returns the events with the policy applied, or None when none changed."""
+        result = None
+        for index, event in enumerate(events):
+            attributes = self.policy.apply(event.attributes)
+            if attributes is event.attributes:
+                if result is not None:
+                    result.append(event)
+                continue
+            if result is None:
+                result = list(events[:index])
+            self.events_rewritten += 1
+            result.append(Event(event.name, _bounded_attributes(attributes, event.dropped_attributes), event.timestamp))
+        return result
+
+    def on_end(self, span: ReadableSpan) -> None:
+        attributes = self.policy.apply(span.attributes)
+        events = self._apply_to_events(span.events)
+        if attributes is not span.attributes or events is not None:
+            self.spans_rewritten += 1
+            span = ReadableSpan(
+                name=span.name,
+                context=span.context,
+                parent=span.parent,
+                resource=span.resource,
+                attributes=_bounded_attributes(attributes, span.dropped_attributes),
+                events=_bounded_list(span.events if events is None else events, span.dropped_events),
+                links=_bounded_list(span.links, span.dropped_links),
+                kind=span.kind,
+                status=span.status,
+                start_time=span.start_time,
+                end_time=span.end_time,
+                instrumentation_scope=span.instrumentation_scope,
+            )
+        self.downstream.on_end(span)
+
+    def shutdown(self) -> None:
+        self.downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.downstream.force_flush(timeout_millis)
+
+    def get_stats(self) -> Dict[str, object]:
+        stats = self.policy.get_stats()
+        stats["spans_rewritten"] = self.spans_rewritten
+        stats["events_rewritten"] = self.events_rewritten
+        return stats
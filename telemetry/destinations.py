@@ -0,0 +1,122 @@
+"""
+Fan-out of finished spans to several trace backends.
+
+Splunk (OTEL_ENDPOINT) is always the primary destination. Additional backends
+are listed in OTEL_EXPORT_DESTINATIONS as comma-separated `name=url` pairs, e.g.
+
+    OTEL_EXPORT_DESTINATIONS=phoenix=http://localhost:6006/v1/traces
+
+Every destination gets its own MeteredBatchSpanProcessor, i.e. its own bounded
+queue, export thread, timeout and drop counters. Handing a span to a destination
+only appends it to that destination's queue, so a slow or unreachable backend
+fills (and drops from) its own queue without delaying requests or the other
+backends. Limits can be set per destination with
+OTEL_EXPORT_<NAME>_MAX_QUEUE_SIZE, OTEL_EXPORT_<NAME>_MAX_EXPORT_BATCH_SIZE,
+OTEL_EXPORT_<NAME>_SCHEDULE_DELAY and OTEL_EXPORT_<NAME>_TIMEOUT (milliseconds);
+the OTEL_BSP_* values apply otherwise.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+
+from .span_metrics import BSP_EXPORT_TIMEOUT_MS, BSP_MAX_EXPORT_BATCH_SIZE, BSP_MAX_QUEUE_SIZE, BSP_SCHEDULE_DELAY_MS
+
+EXPORT_DESTINATIONS = os.getenv("OTEL_EXPORT_DESTINATIONS", "")  # Extra backends as name=url,name=url
+
+
+class Destination:
+    """Endpoint and batching limits of one trace backend."""
+
+    __slots__ = ("name", "endpoint", "max_queue_size", "max_export_batch_size", "schedule_delay_millis",
+                 "export_timeout_millis")
+
+    def __init__(self, name: str, endpoint: str):
+        prefix = f"OTEL_EXPORT_{name.upper().replace('-', '_')}_"
+        self.name = name
+        self.endpoint = endpoint
+        self.max_queue_size = int(os.getenv(prefix + "MAX_QUEUE_SIZE", str(BSP_MAX_QUEUE_SIZE)))
+        self.max_export_batch_size = int(os.getenv(prefix + "MAX_EXPORT_BATCH_SIZE", str(BSP_MAX_EXPORT_BATCH_SIZE)))
+        self.schedule_delay_millis = float(os.getenv(prefix + "SCHEDULE_DELAY", str(BSP_SCHEDULE_DELAY_MS)))
+        self.export_timeout_millis = float(os.getenv(prefix + "TIMEOUT", str(BSP_EXPORT_TIMEOUT_MS)))
+
+
+def parse_destinations(value: str = EXPORT_DESTINATIONS) -> List[Destination]:
+    """
+    Parses `name=url` pairs into destinations.
+
+    Args:
+        value: Comma-separated `name=url` pairs; malformed or duplicate entries are skipped with a warning
+
+    Returns:
+        List[Destination]: Destinations in the order given
+    """
+    destinations: List[Destination] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, endpoint = item.partition("=")
+        name, endpoint = name.strip(), endpoint.strip()
+        if not name or not endpoint:
+            print(f"⚠️  Ignoring export destination '{item}' (expected name=url)")
+            continue
+        if any(destination.name == name for destination in destinations):
+            print(f"⚠️  Ignoring duplicate export destination '{name}'")
+            continue
+        destinations.append(Destination(name, endpoint))
+    return destinations
+
+
+class FanOutSpanProcessor(SpanProcessor):
+    """
+    Passes every span to each destination processor.
+
+    Destinations are expected to only enqueue in on_end (as batch processors do),
+    so one backend's export speed never reaches the caller. A destination that
+    raises is counted and skipped; the others still receive the span.
+    """
+
+    def __init__(self, processors: Sequence[SpanProcessor], names: Optional[Sequence[str]] = None):
+        """
+        Args:
+            processors: One processor per destination
+            names: Destination names for error accounting, parallel to `processors`
+        """
+        self.processors = list(processors)
+        self.names = list(names) if names else [str(i) for i in range(len(self.processors))]
+        self.errors: Dict[str, int] = {name: 0 for name in self.names}
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        for processor in self.processors:
+            processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        for name, processor in zip(self.names, self.processors):
+            try:
+                processor.on_end(span)
+            except Exception:
+                self.errors[name] += 1
+
+    def shutdown(self) -> None:
+        for processor in self.processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Flushed in parallel so a slow backend does not use up the others' time
+        results = [False] * len(self.processors)
+
+        def flush(index: int, processor: SpanProcessor) -> None:
+            results[index] = processor.force_flush(timeout_millis)
+
+        threads = [threading.Thread(target=flush, args=(i, p), daemon=True) for i, p in enumerate(self.processors)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout_millis / 1000.0
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        return all(results)
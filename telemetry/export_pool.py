@@ -0,0 +1,172 @@
+"""
+Faster OTLP/HTTP export: compression, connection reuse and concurrent requests.
+
+`build_otlp_exporter` creates the OTLPSpanExporter every destination uses, with
+gzip compression (OTEL_EXPORTER_OTLP_COMPRESSION) and a requests session whose
+connection pool is sized for the number of concurrent exports, so connections
+are kept alive between batches instead of being re-established.
+
+`ConcurrentSpanExporter` lets the batch processor have up to
+OTEL_EXPORT_MAX_IN_FLIGHT export requests outstanding. `export()` hands the
+batch to a worker and returns as soon as a slot is free; when all slots are busy
+it blocks, which makes the batch processor's queue absorb (and, when full,
+drop) the excess as before. Completions are accounted in submission order:
+`acknowledged_spans` only advances over a contiguous prefix of finished
+batches, so it never claims a later batch while an earlier one is still open.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import requests
+from opentelemetry.exporter.otlp.proto.http import Compression
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+OTLP_COMPRESSION = os.getenv("OTEL_EXPORTER_OTLP_COMPRESSION", "gzip").lower()  # gzip | deflate | none
+EXPORT_MAX_IN_FLIGHT = int(os.getenv("OTEL_EXPORT_MAX_IN_FLIGHT", "2"))  # Concurrent export requests per destination
+
+
+def _compression(name: str) -> Compression:
+    try:
+        return Compression(name)
+    except ValueError:
+        print(f"⚠️  Unknown OTLP compression '{name}', sending uncompressed")
+        return Compression.NoCompression
+
+
+def build_otlp_exporter(endpoint: str, timeout_s: float, headers: Optional[Dict[str, str]] = None,
+                        compression: str = OTLP_COMPRESSION, max_in_flight: int = EXPORT_MAX_IN_FLIGHT) -> OTLPSpanExporter:
+    """
+    Creates an OTLP/HTTP span exporter with compression and a pooled keep-alive session.
+
+    Args:
+        endpoint: OTLP/HTTP traces URL
+        timeout_s: Timeout of one export request
+        headers: Extra request headers (e.g. auth tokens)
+        compression: gzip, deflate or none
+        max_in_flight: Concurrent requests the connection pool must serve without opening new connections
+
+    Returns:
+        OTLPSpanExporter: The configured exporter
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_in_flight))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return OTLPSpanExporter(
+        endpoint=endpoint,
+        timeout=timeout_s,
+        headers=headers or {},
+        compression=_compression(compression),
+        session=session,
+    )
+
+
+class ConcurrentSpanExporter(SpanExporter):
+    """Runs up to `max_in_flight` exports of `exporter` at a time, accounting for them in submission order."""
+
+    def __init__(self, exporter: SpanExporter, max_in_flight: int = EXPORT_MAX_IN_FLIGHT, name: str = "otlp"):
+        """
+        Args:
+            exporter: Exporter doing the actual requests; must be safe to call from several threads
+            max_in_flight: Export requests allowed to be outstanding at once
+            name: Label used for the worker threads
+        """
+        self.exporter = exporter
+        self.max_in_flight = max(1, max_in_flight)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix=f"otel-export-{name}")
+        self._lock = threading.Condition()
+        self._next_sequence = 0
+        self._acknowledged_sequence = 0  # Every batch below this sequence number has finished
+        self._finished: Dict[int, tuple] = {}  # sequence -> (span_count, succeeded) for batches finished out of order
+        self._in_flight = 0
+        self._shutdown = False
+
+        self.max_observed_in_flight = 0
+        self.submitted_batches = 0
+        self.submitted_spans = 0
+        self.acknowledged_spans = 0
+        self.failed_spans = 0
+        self.failed_batches = 0
+        self.out_of_order_completions = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+        self._slots.acquire()
+        with self._lock:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            self._in_flight += 1
+            self.max_observed_in_flight = max(self.max_observed_in_flight, self._in_flight)
+            self.submitted_batches += 1
+            self.submitted_spans += len(spans)
+        try:
+            self._executor.submit(self._run, sequence, list(spans))
+        except RuntimeError:
+            # Shut down while this batch waited for a slot
+            self._slots.release()
+            self._complete(sequence, len(spans), False)
+            return SpanExportResult.FAILURE
+        # Accepted; the outcome is accounted when the request finishes
+        return SpanExportResult.SUCCESS
+
+    def _run(self, sequence: int, spans: Sequence[ReadableSpan]) -> None:
+        succeeded = False
+        try:
+            succeeded = self.exporter.export(spans) is SpanExportResult.SUCCESS
+        except Exception as e:
+            print(f"⚠️  Span export failed: {e}")
+        finally:
+            self._slots.release()
+            self._complete(sequence, len(spans), succeeded)
+
+    def _complete(self, sequence: int, span_count: int, succeeded: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if sequence != self._acknowledged_sequence:
+                self.out_of_order_completions += 1
+            self._finished[sequence] = (span_count, succeeded)
+            while self._acknowledged_sequence in self._finished:
+                count, ok = self._finished.pop(self._acknowledged_sequence)
+                if ok:
+                    self.acknowledged_spans += count
+                else:
+                    self.failed_spans += count
+                    self.failed_batches += 1
+                self._acknowledged_sequence += 1
+            self._lock.notify_all()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Waits until every batch submitted so far has finished."""
+        with self._lock:
+            target = self._next_sequence
+            return self._lock.wait_for(lambda: self._acknowledged_sequence >= target, timeout_millis / 1000.0)
+
+    def shutdown(self) -> None:
+        if self._shutdown:
+            return
+        self._shutdown = True
+        self._executor.shutdown(wait=True)
+        self.exporter.shutdown()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns concurrency and ordered delivery counters for observability."""
+        with self._lock:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "max_observed_in_flight": self.max_observed_in_flight,
+                "submitted_batches": self.submitted_batches,
+                "submitted_spans": self.submitted_spans,
+                "acknowledged_spans": self.acknowledged_spans,
+                "failed_batches": self.failed_batches,
+                "failed_spans": self.failed_spans,
+                "pending_batches": self._next_sequence - self._acknowledged_sequence,
+                "out_of_order_completions": self.out_of_order_completions,
+            }
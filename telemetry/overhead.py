@@ -0,0 +1,89 @@
+"""
+Per-span overhead measurement against a budget.
+
+The cost a span adds to a request is what runs on the request path: creating
+it, setting attributes, ending it and handing it to the batch processor. This
+module times that on a private provider (nothing is exported) and compares it
+with a non-recording tracer, so the result can be checked against
+OTEL_SPAN_OVERHEAD_BUDGET_US and reported in /observability. The measurement
+is a short microbenchmark, so setup only runs it when asked to
+(OTEL_MEASURE_SPAN_OVERHEAD=true or the demo's --measure-span-overhead).
+"""
+
+import os
+import time
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from .span_metrics import MeteredBatchSpanProcessor
+
+SPAN_OVERHEAD_BUDGET_US = float(os.getenv("OTEL_SPAN_OVERHEAD_BUDGET_US", "50"))  # Allowed cost per span
+SPAN_OVERHEAD_MEASURE = os.getenv("OTEL_MEASURE_SPAN_OVERHEAD", "false").lower() == "true"  # Measure during setup (opt-in)
+SPAN_OVERHEAD_ITERATIONS = int(os.getenv("OTEL_SPAN_OVERHEAD_ITERATIONS", "2000"))
+
+# Attributes similar to what the agents set on a typical span
+_PROBE_ATTRIBUTES = {
+    "agent.name": "GeminiFlashAgent",
+    "request.id": 12345,
+    "llm.model": "gemini-flash-1.5",
+    "llm.prompt": "How many vacation days do new employees get?",
+    "llm.status": "success",
+    "llm.response_length": 240,
+}
+
+
+class _DiscardingExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _time_spans(tracer, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with tracer.start_as_current_span("overhead_probe") as span:
+            for key, value in _PROBE_ATTRIBUTES.items():
+                span.set_attribute(key, value)
+    return time.perf_counter() - start
+
+
+def measure_span_overhead(iterations: int = SPAN_OVERHEAD_ITERATIONS, budget_us: float = SPAN_OVERHEAD_BUDGET_US) -> dict:
+    """
+    Measures the request-path cost of one recorded span.
+
+    Args:
+        iterations: Spans timed per tracer
+        budget_us: Allowed overhead per span in microseconds
+
+    Returns:
+        dict: per_span_us, baseline_us, budget_us and within_budget
+    """
+    provider = TracerProvider()
+    processor = MeteredBatchSpanProcessor(_DiscardingExporter(), name="overhead-probe", max_in_flight=1)
+    provider.add_span_processor(processor)
+    try:
+        recording = provider.get_tracer("span-overhead-probe")
+        baseline = trace.NoOpTracer()
+        _time_spans(recording, min(iterations, 200))  # Warm up
+        recorded_s = _time_spans(recording, iterations)
+        baseline_s = _time_spans(baseline, iterations)
+    finally:
+        provider.shutdown()
+
+    per_span_us = max(0.0, (recorded_s - baseline_s) / iterations * 1e6)
+    result = {
+        "per_span_us": round(per_span_us, 2),
+        "baseline_us": round(baseline_s / iterations * 1e6, 2),
+        "budget_us": budget_us,
+        "within_budget": per_span_us <= budget_us,
+        "iterations": iterations,
+    }
+    if result["within_budget"]:
+        print(f"✅ Span overhead {result['per_span_us']} µs/span (budget {budget_us:g} µs)")
+    else:
+        print(f"⚠️  Span overhead {result['per_span_us']} µs/span exceeds the budget of {budget_us:g} µs")
+    return result
@@ -0,0 +1,287 @@
+"""
+Process-wide OpenTelemetry setup for Splunk SignalFX.
+
+`setup_telemetry()` creates the tracer provider, the OTLP exporter and its span
+processor exactly once per process, no matter how many entry points or startup
+hooks call it; later calls return the same provider. BeeAI instrumentation is
+guarded the same way, and tracers are only created when first requested.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+
+from .attributes import ATTRIBUTE_POLICY_ENABLED, AttributePolicySpanProcessor
+from .destinations import FanOutSpanProcessor, parse_destinations
+from .export_pool import EXPORT_MAX_IN_FLIGHT, OTLP_COMPRESSION, build_otlp_exporter
+from .overhead import SPAN_OVERHEAD_MEASURE, measure_span_overhead
+from .sampling import HEAD_SAMPLE_RATIO, TAIL_SAMPLING_ENABLED, TailSamplingSpanProcessor, build_sampler
+from .shm_export import EXPORT_MODE, EXPORT_MODE_SHM, ShmRingSpanProcessor
+from .span_metrics import (
+    BSP_EXPORT_TIMEOUT_MS,
+    BSP_MAX_EXPORT_BATCH_SIZE,
+    BSP_SCHEDULE_DELAY_MS,
+    MeteredBatchSpanProcessor,
+    get_span_processor_stats,
+    setup_metrics_export,
+)
+from .spool import SPOOL_ENABLED, SpoolingSpanExporter
+
+_lock = threading.RLock()
+_tracer_provider: Optional[TracerProvider] = None
+_span_processor: Optional[SpanProcessor] = None
+_destination_processors: Dict[str, SpanProcessor] = {}
+_tail_sampler: Optional[TailSamplingSpanProcessor] = None
+_attribute_policy: Optional[AttributePolicySpanProcessor] = None
+_spool: Optional[SpoolingSpanExporter] = None
+_service_name: Optional[str] = None
+_setup_calls = 0
+_tracers: Dict[str, trace.Tracer] = {}
+_beeai_instrumented = False
+_span_overhead: Optional[dict] = None
+
+
+def setup_telemetry(default_service_name: str = "beeai-agent", default_environment: str = "development",
+                    measure_overhead: Optional[bool] = None) -> Optional[TracerProvider]:
+    """
+    Set up OpenTelemetry for Splunk SignalFX once per process.
+
+    Args:
+        default_service_name: Service name used when SERVICE_NAME is not set
+        default_environment: Deployment environment used when ENVIRONMENT is not set
+        measure_overhead: Time the per-span overhead after setup; None follows OTEL_MEASURE_SPAN_OVERHEAD
+
+    Returns:
+        TracerProvider: The process-wide provider, or None if setup failed
+    """
+    global _tracer_provider, _span_processor, _destination_processors, _tail_sampler, _attribute_policy, _spool, _service_name, _setup_calls, _span_overhead
+    with _lock:
+        _setup_calls += 1
+        if _tracer_provider is not None:
+            print("✅ OpenTelemetry already configured - reusing the existing tracer provider")
+            return _tracer_provider
+
+        # Another library (e.g. an auto-instrumentation agent) may have installed an SDK provider already
+        existing = trace.get_tracer_provider()
+        if isinstance(existing, TracerProvider):
+            print("✅ Reusing the tracer provider configured outside this application")
+            _tracer_provider = existing
+            return _tracer_provider
+
+        try:
+            # Configuration from environment variables
+            OTEL_ENDPOINT = os.getenv("OTEL_ENDPOINT", "http://localhost:4328")
+            SERVICE_NAME = os.getenv("SERVICE_NAME", default_service_name)
+            ENVIRONMENT = os.getenv("ENVIRONMENT", default_environment)
+
+            print(f"🔧 Setting up Splunk SignalFX OTEL integration...")
+            print(f"   Endpoint: {OTEL_ENDPOINT}")
+            print(f"   Service: {SERVICE_NAME}")
+            print(f"   Environment: {ENVIRONMENT}")
+
+            # Create resource with service information
+            resource = Resource.create({
+                "service.name": SERVICE_NAME,
+                "service.version": "1.0.0",
+                "deployment.environment": ENVIRONMENT,
+                "telemetry.sdk.name": "beeai-framework",
+                "telemetry.sdk.version": "0.1.17"
+            })
+
+            # Create tracer provider with parent-based ratio head sampling
+            tracer_provider = TracerProvider(resource=resource, sampler=build_sampler(HEAD_SAMPLE_RATIO))
+
+            spool = None
+            if EXPORT_MODE == EXPORT_MODE_SHM:
+                # Encoding and export run in a separate process fed through a shared-memory ring
+                span_processor = ShmRingSpanProcessor(
+                    OTEL_ENDPOINT, resource_attributes=dict(resource.attributes), name="splunk",
+                    max_export_batch_size=BSP_MAX_EXPORT_BATCH_SIZE, schedule_delay_millis=BSP_SCHEDULE_DELAY_MS,
+                    export_timeout_millis=BSP_EXPORT_TIMEOUT_MS,
+                )
+                if SPOOL_ENABLED:
+                    print("⚠️  OTEL_SPOOL_ENABLED is ignored with OTEL_EXPORT_MODE=shm")
+            else:
+                # Create OTLP exporter for Splunk SignalFX (the shm exporter process builds its own)
+                # (compression and pooled keep-alive session configured in export_pool.py)
+                otlp_exporter = build_otlp_exporter(
+                    endpoint=OTEL_ENDPOINT,
+                    timeout_s=BSP_EXPORT_TIMEOUT_MS / 1000,
+                    headers={
+                        # Add any required headers for your Splunk setup
+                        # "Authorization": "Bearer your-token",
+                        # "X-SF-TOKEN": "your-signalfx-token"
+                    }
+                )
+
+                # Optional disk spool: failed batches are kept on disk and replayed when the collector is back
+                spool = SpoolingSpanExporter(otlp_exporter, endpoint=OTEL_ENDPOINT, timeout_s=BSP_EXPORT_TIMEOUT_MS / 1000,
+                                             name="splunk") if SPOOL_ENABLED else None
+
+                # Add batch processor (limits from OTEL_BSP_*, queue/drop/export metrics in span_metrics.py)
+                span_processor = MeteredBatchSpanProcessor(spool or otlp_exporter, name="splunk")
+            destination_processors = {"splunk": span_processor}
+
+            # Extra backends from OTEL_EXPORT_DESTINATIONS, each with its own queue, export thread and timeout
+            for destination in parse_destinations():
+                if destination.name in destination_processors:
+                    print(f"⚠️  Ignoring export destination '{destination.name}' (name already in use)")
+                    continue
+                destination_processors[destination.name] = MeteredBatchSpanProcessor(
+                    build_otlp_exporter(destination.endpoint, timeout_s=destination.export_timeout_millis / 1000),
+                    name=destination.name,
+                    max_queue_size=destination.max_queue_size,
+                    max_export_batch_size=destination.max_export_batch_size,
+                    schedule_delay_millis=destination.schedule_delay_millis,
+                    export_timeout_millis=destination.export_timeout_millis,
+                )
+                print(f"   Destination: {destination.name} -> {destination.endpoint}")
+            export_processor = span_processor if len(destination_processors) == 1 else FanOutSpanProcessor(
+                list(destination_processors.values()), names=list(destination_processors))
+
+            # Optional tail sampling in front of it: keeps errors and slow traces, samples the rest
+            tail_sampler = TailSamplingSpanProcessor(export_processor) if TAIL_SAMPLING_ENABLED else None
+            # Attribute policy first: truncates/hashes/filters attributes before anything is buffered or queued
+            attribute_policy = AttributePolicySpanProcessor(tail_sampler or export_processor) if ATTRIBUTE_POLICY_ENABLED else None
+            tracer_provider.add_span_processor(attribute_policy or tail_sampler or export_processor)
+            setup_metrics_export()
+            if isinstance(span_processor, ShmRingSpanProcessor):
+                print(f"   Export: shared-memory ring of {span_processor.capacity / 1024 / 1024:g} MiB, "
+                      f"exporter process pid {span_processor.get_stats()['exporter_pid']}")
+            print(f"   Transport: {OTLP_COMPRESSION} compression, keep-alive session, "
+                  f"{EXPORT_MAX_IN_FLIGHT} concurrent export(s) per destination")
+            print(f"   Batching: queue {getattr(span_processor, 'max_queue_size', 'ring')}, batch {span_processor.max_export_batch_size}, "
+                  f"delay {span_processor.schedule_delay_millis:g} ms, timeout {span_processor.export_timeout_millis:g} ms")
+            print(f"   Sampling: head ratio {HEAD_SAMPLE_RATIO:g}" + (
+                f", tail ratio {tail_sampler.sample_ratio:g} (always keeping errors and traces >= "
+                f"{tail_sampler.latency_threshold_ms:g} ms)" if tail_sampler else ", tail sampling off"))
+            if spool:
+                print(f"   Spool: {spool.spool_dir} (max {spool.max_bytes / 1024 / 1024:g} MiB, "
+                      f"replay {spool.replay_spans_per_second:g} spans/s)")
+            if attribute_policy:
+                policy = attribute_policy.policy
+                print(f"   Attributes: max length {policy.max_length or 'unlimited'}, hashed {list(policy.hash_keys) or 'none'}, "
+                      f"allowed {list(policy.allow_keys) or 'all'}, denied {list(policy.deny_keys) or 'none'}")
+
+            # Set as global tracer provider
+            trace.set_tracer_provider(tracer_provider)
+            _tracer_provider, _span_processor, _tail_sampler, _service_name = tracer_provider, span_processor, tail_sampler, SERVICE_NAME
+            _attribute_policy, _spool, _destination_processors = attribute_policy, spool, destination_processors
+
+            if SPAN_OVERHEAD_MEASURE if measure_overhead is None else measure_overhead:
+                _span_overhead = measure_span_overhead()
+
+            print("✅ Splunk SignalFX OTEL integration configured successfully")
+            return tracer_provider
+
+        except Exception as e:
+            print(f"⚠️  Failed to configure Splunk SignalFX OTEL: {e}")
+            print("💡 Check your OTEL endpoint and configuration")
+            return None
+
+
+def get_tracer_provider() -> Optional[TracerProvider]:
+    """Returns the provider created by setup_telemetry(), if any."""
+    return _tracer_provider
+
+
+def get_tracer(name: str) -> trace.Tracer:
+    """
+    Returns the tracer for `name`, creating it on first use.
+
+    Tracers requested before setup_telemetry() are proxies that start recording
+    once the provider is installed.
+    """
+    tracer = _tracers.get(name)
+    if tracer is None:
+        with _lock:
+            tracer = _tracers.get(name)
+            if tracer is None:
+                tracer = trace.get_tracer(name)
+                _tracers[name] = tracer
+    return tracer
+
+
+def instrument_beeai() -> bool:
+    """
+    Enables OpenInference instrumentation of the BeeAI framework once per process.
+
+    Returns:
+        bool: True if BeeAI is instrumented
+    """
+    global _beeai_instrumented
+    with _lock:
+        if _beeai_instrumented:
+            return True
+        try:
+            from openinference.instrumentation.beeai import BeeAIInstrumentor
+        except ImportError:
+            print("⚠️  OpenTelemetry instrumentation not available. Install with: pip install openinference-instrumentation-beeai")
+            return False
+        try:
+            instrumentor = BeeAIInstrumentor()
+            if not instrumentor.is_instrumented_by_opentelemetry:
+                instrumentor.instrument()
+            _beeai_instrumented = True
+            print("✅ OpenTelemetry instrumentation enabled")
+        except Exception as e:
+            print(f"⚠️  Failed to enable instrumentation: {e}")
+        return _beeai_instrumented
+
+
+def test_span_export(tracer_provider, endpoint: str, service: str = "beeai-agent") -> bool:
+    """Test that spans can be exported successfully to verify connectivity."""
+    try:
+        print(f"🧪 Testing span export to {endpoint}...")
+
+        # Create a test span
+        test_tracer = get_tracer("span-test")
+        with test_tracer.start_as_current_span("test_span") as span:
+            span.set_attribute("test.attribute", "span_export_test")
+            span.set_attribute("test.timestamp", time.time())
+            span.set_attribute("test.service", service)
+            span.set_attribute("sampling.priority", 1)  # Never dropped by tail sampling
+
+        # Force export of the queued spans
+        tracer_provider.force_flush()
+
+        if _spool is not None and _spool.spans_spooled:
+            print(f"⚠️  Collector unreachable - spans are spooled to {_spool.spool_dir} and replayed when it recovers")
+            return False
+
+        print("✅ Span export test completed successfully")
+        print("💡 Check your Splunk dashboard for the test span")
+        return True
+
+    except Exception as e:
+        print(f"❌ Span export test failed: {e}")
+        print("💡 Check your OTEL endpoint connectivity")
+        return False
+
+
+def get_telemetry_stats() -> dict:
+    """Returns telemetry setup state, span processor statistics and the span overhead measurement."""
+    return {
+        "configured": _tracer_provider is not None,
+        "service_name": _service_name,
+        "setup_calls": _setup_calls,
+        "span_processor_count": len(_destination_processors),
+        "destinations": sorted(_destination_processors),
+        "tracers": sorted(_tracers),
+        "beeai_instrumented": _beeai_instrumented,
+        "export_mode": EXPORT_MODE,
+        "span_processors": get_span_processor_stats(),
+        "shm_export": _span_processor.get_stats() if isinstance(_span_processor, ShmRingSpanProcessor) else {"enabled": False},
+        "sampling": {
+            "head_sample_ratio": HEAD_SAMPLE_RATIO,
+            "tail": _tail_sampler.get_stats() if _tail_sampler else {"enabled": False},
+        },
+        "spool": _spool.get_stats() if _spool else {"enabled": False},
+        "attribute_policy": _attribute_policy.get_stats() if _attribute_policy else {"enabled": False},
+        "span_overhead": _span_overhead,
+    }
@@ -0,0 +1,243 @@
+"""
+Head and tail sampling of agent traces.
+
+Head sampling (`build_sampler`) is a parent-based trace-id ratio sampler: the
+decision is made when a trace starts and children follow their parent, so an
+unsampled request costs almost nothing. It cannot know how a request will end,
+though, so on its own it drops errors and slow requests at the same rate as
+everything else.
+
+Tail sampling (`TailSamplingSpanProcessor`) sits in front of the exporting
+processor, buffers the spans of each trace until its local root span ends and
+then decides: traces containing an error or slower than a latency threshold are
+always kept, the rest are kept at a baseline ratio. For the tail sampler to see
+every error, head sampling should stay at 1.0 when it is enabled.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, Sampler, TraceIdRatioBased
+from opentelemetry.trace import StatusCode
+
+# Head sampling: fraction of new traces recorded at all
+HEAD_SAMPLE_RATIO = float(os.getenv("OTEL_TRACES_HEAD_SAMPLE_RATIO", "1.0"))
+
+# Tail sampling: buffer traces and keep errors, slow requests and a baseline fraction of the rest
+TAIL_SAMPLING_ENABLED = os.getenv("OTEL_TAIL_SAMPLING_ENABLED", "false").lower() == "true"
+TAIL_SAMPLE_RATIO = float(os.getenv("OTEL_TAIL_SAMPLE_RATIO", "0.1"))  # Kept fraction of normal traces
+TAIL_LATENCY_THRESHOLD_MS = float(os.getenv("OTEL_TAIL_LATENCY_THRESHOLD_MS", "2000"))  # Slower traces are always kept
+TAIL_MAX_TRACE_AGE_MS = float(os.getenv("OTEL_TAIL_MAX_TRACE_AGE_MS", "30000"))  # Decide traces whose root never ends
+TAIL_MAX_BUFFERED_TRACES = int(os.getenv("OTEL_TAIL_MAX_BUFFERED_TRACES", "5000"))  # Oldest trace is decided early beyond this
+
+_ERROR_ATTRIBUTES = ("error.type", "error.message")
+_PRIORITY_ATTRIBUTE = "sampling.priority"  # > 0 forces a trace to be kept (e.g. connectivity test spans)
+_DECIDED_TRACES_REMEMBERED = 10000  # Decisions kept for spans that end after their root
+_TRACE_ID_LIMIT = 2 ** 64
+
+
+def build_sampler(ratio: float = HEAD_SAMPLE_RATIO) -> Sampler:
+    """Parent-based trace-id ratio sampler; new root spans are sampled with probability `ratio`."""
+    return ParentBased(TraceIdRatioBased(ratio))
+
+
+def _is_forced(span: ReadableSpan) -> bool:
+    priority = (span.attributes or {}).get(_PRIORITY_ATTRIBUTE)
+    return isinstance(priority, (int, float)) and priority > 0
+
+
+def _is_error(span: ReadableSpan) -> bool:
+    if span.status is not None and span.status.status_code is StatusCode.ERROR:
+        return True
+    attributes = span.attributes or {}
+    return any(key in attributes for key in _ERROR_ATTRIBUTES)
+
+
+class _BufferedTrace:
+    __slots__ = ("spans", "first_start_ns", "buffered_at", "has_error", "forced")
+
+    def __init__(self):
+        self.spans: List[ReadableSpan] = []
+        self.first_start_ns: Optional[int] = None
+        self.buffered_at = time.monotonic()
+        self.has_error = False
+        self.forced = False
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Buffers spans per trace and forwards only kept traces to `downstream`.
+
+    A trace is decided when a span without a local parent (the request's root
+    span) ends, when it has been buffered longer than `max_trace_age_ms`, or
+    when the buffer exceeds `max_buffered_traces` (oldest first). Age expiry
+    also runs from a daemon thread, so a trace whose root never ends is decided
+    even when no other span ends. Spans ending after their trace was decided
+    follow the earlier decision.
+    """
+
+    def __init__(self, downstream: SpanProcessor, sample_ratio: float = TAIL_SAMPLE_RATIO,
+                 latency_threshold_ms: float = TAIL_LATENCY_THRESHOLD_MS,
+                 max_trace_age_ms: float = TAIL_MAX_TRACE_AGE_MS,
+                 max_buffered_traces: int = TAIL_MAX_BUFFERED_TRACES):
+        """
+        Args:
+            downstream: Processor receiving the spans of kept traces (e.g. the batch span processor)
+            sample_ratio: Fraction of traces without errors or high latency that are kept
+            latency_threshold_ms: Traces at least this slow are always kept
+            max_trace_age_ms: Longest a trace is buffered before it is decided anyway
+            max_buffered_traces: Buffered traces before the oldest is decided early
+        """
+        self.downstream = downstream
+        self.sample_ratio = sample_ratio
+        self.latency_threshold_ms = latency_threshold_ms
+        self.max_trace_age_ms = max_trace_age_ms
+        self.max_buffered_traces = max_buffered_traces
+        self._id_bound = round(sample_ratio * _TRACE_ID_LIMIT)
+
+        self._lock = threading.Lock()
+        self._traces: "OrderedDict[int, _BufferedTrace]" = OrderedDict()
+        self._decided: "OrderedDict[int, bool]" = OrderedDict()
+
+        self.traces_kept = 0
+        self.traces_dropped = 0
+        self.kept_errors = 0
+        self.kept_slow = 0
+        self.kept_baseline = 0
+        self.decided_early = 0
+        self.spans_forwarded = 0
+        self.spans_dropped = 0
+
+        self._stop = threading.Event()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="otel-tail-sampling-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.downstream.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if not (span.context and span.context.trace_flags.sampled):
+            return
+        trace_id = span.context.trace_id
+        forward: List[ReadableSpan] = []
+        with self._lock:
+            decision = self._decided.get(trace_id)
+            if decision is not None:
+                # Late span of an already decided trace
+                if decision:
+                    forward.append(span)
+                else:
+                    self.spans_dropped += 1
+            else:
+                trace = self._traces.get(trace_id)
+                if trace is None:
+                    trace = self._traces[trace_id] = _BufferedTrace()
+                trace.spans.append(span)
+                trace.has_error = trace.has_error or _is_error(span)
+                trace.forced = trace.forced or _is_forced(span)
+                if span.start_time is not None and (trace.first_start_ns is None or span.start_time < trace.first_start_ns):
+                    trace.first_start_ns = span.start_time
+
+                if span.parent is None or span.parent.is_remote:
+                    forward.extend(self._decide_locked(trace_id, root=span))
+            forward.extend(self._expire_locked())
+        for ended in forward:
+            self.downstream.on_end(ended)
+
+    def _decide_locked(self, trace_id: int, root: Optional[ReadableSpan] = None) -> List[ReadableSpan]:
+        trace = self._traces.pop(trace_id)
+        if root is not None and root.end_time is not None and root.start_time is not None:
+            duration_ms = (root.end_time - root.start_time) / 1e6
+        elif trace.first_start_ns is not None:
+            duration_ms = (time.time_ns() - trace.first_start_ns) / 1e6  # Root still open: age of the oldest span
+        else:
+            duration_ms = (time.monotonic() - trace.buffered_at) * 1000
+
+        if trace.forced:
+            keep = True
+        elif trace.has_error:
+            keep, self.kept_errors = True, self.kept_errors + 1
+        elif duration_ms >= self.latency_threshold_ms:
+            keep, self.kept_slow = True, self.kept_slow + 1
+        elif (trace_id & (_TRACE_ID_LIMIT - 1)) < self._id_bound:
+            keep, self.kept_baseline = True, self.kept_baseline + 1
+        else:
+            keep = False
+
+        self._decided[trace_id] = keep
+        if len(self._decided) > _DECIDED_TRACES_REMEMBERED:
+            self._decided.popitem(last=False)
+        if keep:
+            self.traces_kept += 1
+            self.spans_forwarded += len(trace.spans)
+            return trace.spans
+        self.traces_dropped += 1
+        self.spans_dropped += len(trace.spans)
+        return []
+
+    def _expire_locked(self) -> List[ReadableSpan]:
+        forward: List[ReadableSpan] = []
+        cutoff = time.monotonic() - self.max_trace_age_ms / 1000.0
+        while self._traces:
+            trace_id, trace = next(iter(self._traces.items()))
+            if trace.buffered_at > cutoff and len(self._traces) <= self.max_buffered_traces:
+                break
+            self.decided_early += 1
+            forward.extend(self._decide_locked(trace_id))
+        return forward
+
+    def _expire(self) -> None:
+        with self._lock:
+            forward = self._expire_locked()
+        for ended in forward:
+            self.downstream.on_end(ended)
+
+    def _sweep_loop(self) -> None:
+        interval_s = min(1.0, max(0.05, self.max_trace_age_ms / 4000.0))
+        while not self._stop.wait(interval_s):
+            try:
+                self._expire()
+            except Exception as e:
+                print(f"⚠️  Tail sampling sweep failed: {e}")
+
+    def _decide_all(self) -> None:
+        with self._lock:
+            forward: List[ReadableSpan] = []
+            while self._traces:
+                forward.extend(self._decide_locked(next(iter(self._traces))))
+        for ended in forward:
+            self.downstream.on_end(ended)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._sweeper.join(timeout=1.0)
+        self._decide_all()  # Nothing buffered is lost on exit
+        self.downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Traces past their age are decided first; younger open traces stay buffered
+        self._expire()
+        return self.downstream.force_flush(timeout_millis)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns configuration and decision counters for observability."""
+        decided = self.traces_kept + self.traces_dropped
+        return {
+            "sample_ratio": self.sample_ratio,
+            "latency_threshold_ms": self.latency_threshold_ms,
+            "buffered_traces": len(self._traces),
+            "traces_kept": self.traces_kept,
+            "traces_dropped": self.traces_dropped,
+            "kept_errors": self.kept_errors,
+            "kept_slow": self.kept_slow,
+            "kept_baseline": self.kept_baseline,
+            "decided_early": self.decided_early,
+            "spans_forwarded": self.spans_forwarded,
+            "spans_dropped": self.spans_dropped,
+            "kept_fraction": round(self.traces_kept / decided, 4) if decided else None,
+        }
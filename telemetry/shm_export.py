@@ -0,0 +1,301 @@
+"""
+Out-of-process span export through a shared-memory ring buffer.
+
+With the stock BatchSpanProcessor, protobuf encoding and the HTTP export run in
+a thread of the serving process and hold the GIL while they do. In shared-memory
+mode (OTEL_EXPORT_MODE=shm) the serving process only flattens each finished span
+into a tuple, marshals it and copies it into a ring buffer in shared memory. A
+separate exporter process reads the ring, rebuilds the spans, batches them and
+ships them with the same compressed, keep-alive OTLP exporter as in-process mode.
+
+Ring layout: a 64-byte header of u64 counters followed by OTEL_SHM_RING_BYTES of
+data. `write_pos` and `read_pos` only grow; a record is a u32 length followed by
+the payload, and a length of 0xFFFFFFFF tells the reader to wrap to the start.
+There is one writer (serialized by a lock) and one reader. When the ring is full
+new spans are dropped and counted, never waited for.
+"""
+
+import marshal
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+
+from .export_pool import build_otlp_exporter
+
+EXPORT_MODE = os.getenv("OTEL_EXPORT_MODE", "inprocess").lower()  # inprocess | shm
+SHM_RING_BYTES = int(os.getenv("OTEL_SHM_RING_BYTES", str(16 * 1024 * 1024)))  # Data capacity of the ring
+SHM_POLL_INTERVAL_MS = float(os.getenv("OTEL_SHM_POLL_INTERVAL_MS", "2"))  # Exporter process wait when the ring is empty
+SHM_EXPORTER_NICE = int(os.getenv("OTEL_SHM_EXPORTER_NICE", "10"))  # CPU priority offset of the exporter process
+
+EXPORT_MODE_INPROCESS = "inprocess"
+EXPORT_MODE_SHM = "shm"
+
+_HEADER_SIZE = 64
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+_WRAP = 0xFFFFFFFF
+
+# Header slots (u64 each)
+_WRITE_POS, _READ_POS, _FLUSHED_POS, _FLUSH_REQUEST, _STOP, _EXPORTED, _FAILED_BATCHES, _BATCHES = range(8)
+
+
+def _get(buf, slot: int) -> int:
+    return _U64.unpack_from(buf, slot * 8)[0]
+
+
+def _set(buf, slot: int, value: int) -> None:
+    _U64.pack_into(buf, slot * 8, value)
+
+
+def _flatten(span: ReadableSpan) -> tuple:
+    """Reduces a finished span to builtins that marshal can encode."""
+    context = span.context
+    parent = span.parent
+    scope = span.instrumentation_scope
+    return (
+        span.name,
+        context.trace_id,
+        context.span_id,
+        int(context.trace_flags),
+        (parent.span_id, parent.is_remote) if parent is not None else None,
+        span.kind.value,
+        span.start_time,
+        span.end_time,
+        span.status.status_code.value,
+        span.status.description,
+        dict(span.attributes or {}),
+        [(event.name, event.timestamp, dict(event.attributes or {})) for event in span.events],
+        [(link.context.trace_id, link.context.span_id, dict(link.attributes or {})) for link in span.links],
+        (scope.name, scope.version) if scope is not None else None,
+    )
+
+
+def _rebuild(record: tuple, resource) -> ReadableSpan:
+    """Inverse of _flatten, run in the exporter process."""
+    from opentelemetry.sdk.trace import Event
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+    from opentelemetry.trace import Link, SpanContext, SpanKind, Status, StatusCode, TraceFlags
+
+    (name, trace_id, span_id, trace_flags, parent, kind, start_time, end_time, status_code, status_description,
+     attributes, events, links, scope) = record
+    parent_context = SpanContext(trace_id, parent[0], is_remote=parent[1], trace_flags=TraceFlags(trace_flags)) if parent else None
+    return ReadableSpan(
+        name=name,
+        context=SpanContext(trace_id, span_id, is_remote=False, trace_flags=TraceFlags(trace_flags)),
+        parent=parent_context,
+        resource=resource,
+        attributes=attributes,
+        events=[Event(event_name, attributes=event_attributes, timestamp=timestamp)
+                for event_name, timestamp, event_attributes in events],
+        links=[Link(SpanContext(link_trace_id, link_span_id, is_remote=True), attributes=link_attributes)
+               for link_trace_id, link_span_id, link_attributes in links],
+        kind=SpanKind(kind),
+        status=Status(StatusCode(status_code), status_description),
+        start_time=start_time,
+        end_time=end_time,
+        instrumentation_scope=InstrumentationScope(scope[0], scope[1]) if scope else None,
+    )
+
+
+def _exporter_main(shm_name: str, capacity: int, endpoint: str, timeout_s: float, resource_attributes: dict,
+                   max_export_batch_size: int, schedule_delay_millis: float, poll_interval_ms: float,
+                   nice: int = 0) -> None:
+    """Exporter process: drains the ring, rebuilds spans and exports them in batches."""
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)  # Yield the CPU to request handling when cores are scarce
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace.export import SpanExportResult
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buf = shm.buf
+    resource = Resource(resource_attributes)
+    exporter = build_otlp_exporter(endpoint, timeout_s, max_in_flight=1)
+    batch: List[ReadableSpan] = []
+    batch_started = time.monotonic()
+
+    def export_batch(read_pos: int) -> None:
+        nonlocal batch
+        if batch:
+            if exporter.export(batch) is SpanExportResult.SUCCESS:
+                _set(buf, _EXPORTED, _get(buf, _EXPORTED) + len(batch))
+            else:
+                _set(buf, _FAILED_BATCHES, _get(buf, _FAILED_BATCHES) + 1)
+            _set(buf, _BATCHES, _get(buf, _BATCHES) + 1)
+            batch = []
+        _set(buf, _FLUSHED_POS, read_pos)
+
+    try:
+        while True:
+            read_pos = _get(buf, _READ_POS)
+            write_pos = _get(buf, _WRITE_POS)
+            if read_pos == write_pos:
+                if _get(buf, _STOP):
+                    export_batch(read_pos)
+                    break
+                if batch and (_get(buf, _FLUSH_REQUEST) > _get(buf, _FLUSHED_POS)
+                              or (time.monotonic() - batch_started) * 1000 >= schedule_delay_millis):
+                    export_batch(read_pos)
+                elif not batch:
+                    _set(buf, _FLUSHED_POS, read_pos)
+                time.sleep(poll_interval_ms / 1000.0)
+                continue
+
+            offset = read_pos % capacity
+            length = _U32.unpack_from(buf, _HEADER_SIZE + offset)[0] if capacity - offset >= _U32.size else _WRAP
+            if length == _WRAP:
+                _set(buf, _READ_POS, read_pos + (capacity - offset))
+                continue
+            start = _HEADER_SIZE + offset + _U32.size
+            record = marshal.loads(bytes(buf[start:start + length]))
+            _set(buf, _READ_POS, read_pos + _U32.size + length)
+            if not batch:
+                batch_started = time.monotonic()
+            try:
+                batch.append(_rebuild(record, resource))
+            except Exception as e:
+                print(f"⚠️  Shared-memory exporter skipped a span it could not rebuild: {e}")
+            if len(batch) >= max_export_batch_size:
+                export_batch(_get(buf, _READ_POS))
+    finally:
+        exporter.shutdown()
+        del buf
+        shm.close()
+
+
+class ShmRingSpanProcessor(SpanProcessor):
+    """
+    Copies finished spans into a shared-memory ring drained by a separate exporter process.
+
+    The request path pays for flattening and marshalling a span and one memory
+    copy; encoding and HTTP export happen in the other process.
+    """
+
+    def __init__(self, endpoint: str, resource_attributes: Optional[dict] = None, name: str = "shm",
+                 capacity: int = SHM_RING_BYTES, max_export_batch_size: int = 512,
+                 schedule_delay_millis: float = 5000, export_timeout_millis: float = 30000,
+                 poll_interval_ms: float = SHM_POLL_INTERVAL_MS, nice: int = SHM_EXPORTER_NICE):
+        """
+        Args:
+            endpoint: OTLP/HTTP traces URL the exporter process sends to
+            resource_attributes: Resource attributes attached to every exported span
+            name: Label distinguishing this processor in stats
+            capacity: Bytes of span data the ring holds before spans are dropped
+            max_export_batch_size: Spans per export request
+            schedule_delay_millis: Longest wait before a partial batch is exported
+            export_timeout_millis: Timeout of one export request
+            poll_interval_ms: Exporter process sleep when the ring is empty
+            nice: Added to the exporter process's nice value, so it runs at lower CPU priority
+        """
+        self.name = name
+        self.endpoint = endpoint
+        self.capacity = capacity
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay_millis = schedule_delay_millis
+        self.export_timeout_millis = export_timeout_millis
+        self._lock = threading.Lock()
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + capacity)
+        self._buf = self._shm.buf
+        self._buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        self._shutdown = False
+
+        self.written_spans = 0
+        self.dropped_spans = 0
+        self.oversized_spans = 0
+
+        # Spawn rather than fork: the serving process has threads (uvicorn, batch processors)
+        context = multiprocessing.get_context("spawn")
+        self._process = context.Process(
+            target=_exporter_main,
+            args=(self._shm.name, capacity, endpoint, export_timeout_millis / 1000, dict(resource_attributes or {}),
+                  max_export_batch_size, schedule_delay_millis, poll_interval_ms, nice),
+            name=f"otel-shm-exporter-{name}",
+            daemon=True,
+        )
+        self._process.start()
+
+    @property
+    def ring_used_bytes(self) -> int:
+        """Bytes written but not yet read by the exporter process."""
+        return _get(self._buf, _WRITE_POS) - _get(self._buf, _READ_POS)
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self._shutdown or not (span.context and span.context.trace_flags.sampled):
+            return
+        try:
+            payload = marshal.dumps(_flatten(span))
+        except ValueError:
+            self.dropped_spans += 1  # Attribute value marshal cannot encode
+            return
+        needed = _U32.size + len(payload)
+        if needed + _U32.size > self.capacity:
+            self.oversized_spans += 1
+            self.dropped_spans += 1
+            return
+        buf = self._buf
+        with self._lock:
+            write_pos = _get(buf, _WRITE_POS)
+            offset = write_pos % self.capacity
+            tail = self.capacity - offset
+            pad = tail if tail < needed else 0  # Record must be contiguous: wrap first
+            if write_pos + pad + needed - _get(buf, _READ_POS) > self.capacity:
+                self.dropped_spans += 1
+                return
+            if pad:
+                if tail >= _U32.size:
+                    _U32.pack_into(buf, _HEADER_SIZE + offset, _WRAP)
+                write_pos += pad
+                offset = 0
+            start = _HEADER_SIZE + offset
+            _U32.pack_into(buf, start, len(payload))
+            buf[start + _U32.size:start + needed] = payload
+            _set(buf, _WRITE_POS, write_pos + needed)  # Publish after the record is complete
+            self.written_spans += 1
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        target = _get(self._buf, _WRITE_POS)
+        _set(self._buf, _FLUSH_REQUEST, target)
+        deadline = time.monotonic() + timeout_millis / 1000.0
+        while _get(self._buf, _FLUSHED_POS) < target:
+            if time.monotonic() >= deadline or not self._process.is_alive():
+                return False
+            time.sleep(0.005)
+        return True
+
+    def shutdown(self) -> None:
+        if self._shutdown:
+            return
+        self._shutdown = True
+        _set(self._buf, _STOP, 1)
+        self._process.join(timeout=self.export_timeout_millis / 1000 + 5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._buf = bytearray(self._shm.buf[:_HEADER_SIZE])  # Keep stats readable after the segment is gone
+        self._shm.close()
+        self._shm.unlink()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns ring usage and export counters for observability."""
+        buf = self._buf
+        return {
+            "mode": EXPORT_MODE_SHM,
+            "exporter_pid": self._process.pid,
+            "exporter_alive": self._process.is_alive(),
+            "ring_capacity_bytes": self.capacity,
+            "ring_used_bytes": self.ring_used_bytes,
+            "written_spans": self.written_spans,
+            "dropped_spans": self.dropped_spans,
+            "oversized_spans": self.oversized_spans,
+            "exported_spans": _get(buf, _EXPORTED),
+            "export_batches": _get(buf, _BATCHES),
+            "failed_batches": _get(buf, _FAILED_BATCHES),
+        }
@@ -0,0 +1,248 @@
+"""
+Tunable, instrumented span batching shared by the demo and the FAQ backend.
+
+MeteredBatchSpanProcessor is a BatchSpanProcessor whose queue size, batch size,
+schedule delay and export timeout come from the standard OTEL_BSP_* variables,
+and which keeps track of what the stock processor does silently: how full the
+queue is, how many spans were dropped because it was full, how large export
+batches are and how long exports take. The numbers are published as
+OpenTelemetry metrics and returned by `get_stats()` for /observability.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from opentelemetry import metrics
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from .export_pool import EXPORT_MAX_IN_FLIGHT, ConcurrentSpanExporter
+
+# Batching configuration, using the variable names of the OpenTelemetry SDK
+BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "2048"))  # Spans buffered before new ones are dropped
+BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))  # Spans per export request
+BSP_SCHEDULE_DELAY_MS = float(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "5000"))  # Longest wait before a partial batch is sent
+BSP_EXPORT_TIMEOUT_MS = float(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "30000"))  # Timeout of one export request
+
+# Optional OTLP endpoint for the processor metrics (e.g. http://localhost:4318/v1/metrics); unset keeps them in-process
+OTEL_METRICS_ENDPOINT = os.getenv("OTEL_METRICS_ENDPOINT")
+OTEL_METRICS_EXPORT_INTERVAL_MS = int(os.getenv("OTEL_METRICS_EXPORT_INTERVAL_MS", "10000"))
+
+_LATENCY_WINDOW = 1024  # Recent export latencies kept for percentiles
+
+_meter = metrics.get_meter("beeai.telemetry")
+_processors: List["MeteredBatchSpanProcessor"] = []
+_metrics_export_configured = False
+
+
+def _observe_queue_depth(options):
+    return [metrics.Observation(p.queue_depth, {"processor": p.name}) for p in list(_processors)]
+
+
+_queue_depth_gauge = _meter.create_observable_gauge(
+    "otel.bsp.queue_depth", callbacks=[_observe_queue_depth], unit="{span}",
+    description="Spans waiting in the batch span processor queue",
+)
+_dropped_counter = _meter.create_counter(
+    "otel.bsp.spans_dropped", unit="{span}", description="Spans dropped because the processor queue was full",
+)
+_batch_size_histogram = _meter.create_histogram(
+    "otel.bsp.export_batch_size", unit="{span}", description="Spans per export request",
+)
+_export_latency_histogram = _meter.create_histogram(
+    "otel.bsp.export_latency", unit="ms", description="Duration of export requests",
+)
+_export_failure_counter = _meter.create_counter(
+    "otel.bsp.export_failures", unit="{batch}", description="Export requests that did not succeed",
+)
+
+
+def setup_metrics_export() -> bool:
+    """
+    Exports the processor metrics over OTLP when OTEL_METRICS_ENDPOINT is set.
+
+    Returns:
+        bool: True if a metrics pipeline is configured (now or earlier)
+    """
+    global _metrics_export_configured
+    if _metrics_export_configured or not OTEL_METRICS_ENDPOINT:
+        return _metrics_export_configured
+    try:
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+        reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(endpoint=OTEL_METRICS_ENDPOINT),
+            export_interval_millis=OTEL_METRICS_EXPORT_INTERVAL_MS,
+        )
+        metrics.set_meter_provider(MeterProvider(metric_readers=[reader]))
+        _metrics_export_configured = True
+        print(f"✅ Span processor metrics exported to {OTEL_METRICS_ENDPOINT}")
+    except Exception as e:
+        print(f"⚠️  Failed to configure metrics export: {e}")
+    return _metrics_export_configured
+
+
+class MeteredSpanExporter(SpanExporter):
+    """Wraps a SpanExporter and measures every export call."""
+
+    def __init__(self, exporter: SpanExporter, name: str):
+        self.exporter = exporter
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=_LATENCY_WINDOW)
+
+        self.exported_spans = 0
+        self.export_batches = 0
+        self.failed_batches = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.max_export_ms = 0.0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        start = time.perf_counter()
+        result = SpanExportResult.FAILURE
+        try:
+            result = self.exporter.export(spans)
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            attributes = {"processor": self.name}
+            with self._lock:
+                self.exported_spans += len(spans)
+                self.export_batches += 1
+                self.last_batch_size = len(spans)
+                self.max_batch_size = max(self.max_batch_size, len(spans))
+                self.max_export_ms = max(self.max_export_ms, elapsed_ms)
+                self._latencies_ms.append(elapsed_ms)
+                if result is not SpanExportResult.SUCCESS:
+                    self.failed_batches += 1
+            _batch_size_histogram.record(len(spans), attributes)
+            _export_latency_histogram.record(elapsed_ms, attributes)
+            if result is not SpanExportResult.SUCCESS:
+                _export_failure_counter.add(1, attributes)
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
+
+    def latency_percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._latencies_ms)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+class MeteredBatchSpanProcessor(BatchSpanProcessor):
+    """
+    BatchSpanProcessor with configurable limits and queue/export metrics.
+
+    A span is counted as dropped when it ends while the queue is already full
+    (the SDK then discards the oldest queued span to make room).
+    """
+
+    def __init__(self, exporter: SpanExporter, name: str = "otlp",
+                 max_queue_size: int = BSP_MAX_QUEUE_SIZE,
+                 max_export_batch_size: int = BSP_MAX_EXPORT_BATCH_SIZE,
+                 schedule_delay_millis: float = BSP_SCHEDULE_DELAY_MS,
+                 export_timeout_millis: float = BSP_EXPORT_TIMEOUT_MS,
+                 max_in_flight: int = EXPORT_MAX_IN_FLIGHT):
+        """
+        Args:
+            exporter: Exporter receiving the batches
+            name: Label distinguishing this processor in metrics
+            max_queue_size: Spans buffered before spans are dropped
+            max_export_batch_size: Spans per export request
+            schedule_delay_millis: Longest wait before a partial batch is exported
+            export_timeout_millis: Timeout of one export request
+            max_in_flight: Export requests outstanding at once; above 1 they run on worker threads
+        """
+        self.name = name
+        max_export_batch_size = min(max_export_batch_size, max_queue_size)  # The SDK rejects larger batches
+        self.metered_exporter = MeteredSpanExporter(exporter, name)
+        # Concurrency sits in front of the metering, so latency and failures are those of the real requests
+        self.concurrent_exporter = ConcurrentSpanExporter(self.metered_exporter, max_in_flight, name) if max_in_flight > 1 else None
+        self.max_queue_size = max_queue_size
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay_millis = schedule_delay_millis
+        self.export_timeout_millis = export_timeout_millis
+        super().__init__(
+            self.concurrent_exporter or self.metered_exporter,
+            max_queue_size=max_queue_size,
+            schedule_delay_millis=schedule_delay_millis,
+            max_export_batch_size=max_export_batch_size,
+            export_timeout_millis=export_timeout_millis,
+        )
+        self.received_spans = 0
+        self.dropped_spans = 0
+        _processors.append(self)
+
+    @property
+    def queue_depth(self) -> int:
+        """Spans currently waiting to be exported."""
+        queue = getattr(getattr(self, "_batch_processor", None), "_queue", None)
+        if queue is not None:
+            return len(queue)
+        # Older SDKs: estimate from what went in and what reached the exporter
+        return max(0, self.received_spans - self.dropped_spans - self.metered_exporter.exported_spans)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if not (span.context and span.context.trace_flags.sampled):
+            return
+        self.received_spans += 1
+        if self.queue_depth >= self.max_queue_size:
+            self.dropped_spans += 1
+            _dropped_counter.add(1, {"processor": self.name})
+        super().on_end(span)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        flushed = super().force_flush(timeout_millis)
+        if self.concurrent_exporter is not None:
+            # The batch processor only hands batches over; wait for the requests still in flight
+            flushed = self.concurrent_exporter.force_flush(timeout_millis) and flushed
+        return flushed
+
+    def shutdown(self):
+        if self in _processors:
+            _processors.remove(self)
+        return super().shutdown()
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns configuration, queue state and export statistics for observability."""
+        exporter = self.metered_exporter
+        p50, p99 = exporter.latency_percentile(50), exporter.latency_percentile(99)
+        return {
+            "config": {
+                "max_queue_size": self.max_queue_size,
+                "max_export_batch_size": self.max_export_batch_size,
+                "schedule_delay_ms": self.schedule_delay_millis,
+                "export_timeout_ms": self.export_timeout_millis,
+            },
+            "queue_depth": self.queue_depth,
+            "concurrency": self.concurrent_exporter.get_stats() if self.concurrent_exporter else {"max_in_flight": 1},
+            "received_spans": self.received_spans,
+            "dropped_spans": self.dropped_spans,
+            "exported_spans": exporter.exported_spans,
+            "export_batches": exporter.export_batches,
+            "failed_batches": exporter.failed_batches,
+            "last_batch_size": exporter.last_batch_size,
+            "max_batch_size": exporter.max_batch_size,
+            "avg_batch_size": round(exporter.exported_spans / exporter.export_batches, 2) if exporter.export_batches else 0,
+            "export_latency_ms": {
+                "p50": round(p50, 3) if p50 is not None else None,
+                "p99": round(p99, 3) if p99 is not None else None,
+                "max": round(exporter.max_export_ms, 3),
+            },
+        }
+
+
+def get_span_processor_stats() -> Dict[str, Dict[str, object]]:
+    """Returns get_stats() of every active MeteredBatchSpanProcessor keyed by name."""
+    return {processor.name: processor.get_stats() for processor in list(_processors)}
@@ -0,0 +1,392 @@
+"""
+Disk spool for spans the collector could not accept.
+
+SpoolingSpanExporter wraps the OTLP exporter. A batch that fails to export is
+encoded as an OTLP request and appended to a gzip-compressed segment file in
+OTEL_SPOOL_DIR instead of being dropped. Segments rotate at
+OTEL_SPOOL_SEGMENT_BYTES and the spool is capped at OTEL_SPOOL_MAX_BYTES by
+deleting the oldest segments. While the collector is unreachable new batches go
+straight to the spool, so the batch thread is not held up by retries.
+
+A background replayer probes the collector every OTEL_SPOOL_REPLAY_INTERVAL_MS
+and, once a request succeeds, drains the spool oldest first at no more than
+OTEL_SPOOL_REPLAY_SPANS_PER_SECOND. Connection errors, 429 and 5xx responses are
+retried; a record the collector rejects outright (400, 413, ...) would be
+rejected again, so it is dropped and counted instead of blocking the spool.
+Delivery is at-least-once: a request that was replayed right before a crash can
+be sent again on the next start.
+
+Segment records are `>IQI` headers (payload length, spool time in ms, span
+count) followed by the serialized ExportTraceServiceRequest.
+"""
+
+import glob
+import gzip
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from opentelemetry import metrics
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from .export_pool import OTLP_COMPRESSION
+
+SPOOL_ENABLED = os.getenv("OTEL_SPOOL_ENABLED", "false").lower() == "true"
+SPOOL_DIR = os.getenv("OTEL_SPOOL_DIR", "./otel_spool")
+SPOOL_MAX_BYTES = int(os.getenv("OTEL_SPOOL_MAX_BYTES", str(256 * 1024 * 1024)))  # Oldest segments deleted beyond this
+SPOOL_SEGMENT_BYTES = int(os.getenv("OTEL_SPOOL_SEGMENT_BYTES", str(8 * 1024 * 1024)))  # Compressed size before rotating
+SPOOL_REPLAY_SPANS_PER_SECOND = float(os.getenv("OTEL_SPOOL_REPLAY_SPANS_PER_SECOND", "2000"))  # Replay rate limit
+SPOOL_REPLAY_INTERVAL_MS = float(os.getenv("OTEL_SPOOL_REPLAY_INTERVAL_MS", "5000"))  # Probe interval while unreachable
+
+_RECORD_HEADER = struct.Struct(">IQI")
+_SEGMENT_PATTERN = "segment-*.otlp.gz"
+
+_meter = metrics.get_meter("beeai.telemetry")
+_spools: List["SpoolingSpanExporter"] = []
+
+
+def _observe_spool_size(options):
+    return [metrics.Observation(s.spool_bytes, {"spool": s.name}) for s in list(_spools)]
+
+
+def _observe_replay_lag(options):
+    return [metrics.Observation(s.replay_lag_ms, {"spool": s.name}) for s in list(_spools)]
+
+
+_spool_size_gauge = _meter.create_observable_gauge(
+    "otel.spool.size", callbacks=[_observe_spool_size], unit="By",
+    description="Bytes of spooled spans waiting for replay",
+)
+_replay_lag_gauge = _meter.create_observable_gauge(
+    "otel.spool.replay_lag", callbacks=[_observe_replay_lag], unit="ms",
+    description="Age of the oldest spooled span request",
+)
+_spooled_counter = _meter.create_counter(
+    "otel.spool.spans_spooled", unit="{span}", description="Spans written to the spool after a failed export",
+)
+_replayed_counter = _meter.create_counter(
+    "otel.spool.spans_replayed", unit="{span}", description="Spooled spans delivered to the collector",
+)
+_spool_dropped_counter = _meter.create_counter(
+    "otel.spool.spans_dropped", unit="{span}", description="Spooled spans deleted because the spool was full",
+)
+_rejected_counter = _meter.create_counter(
+    "otel.spool.spans_rejected", unit="{span}", description="Spooled spans the collector refused as invalid",
+)
+
+# Outcomes of one replay request
+_SENT, _RETRY, _REJECTED = "sent", "retry", "rejected"
+
+
+def _read_segment(path: str) -> List[Tuple[int, int, bytes]]:
+    """Returns (spooled_at_ms, span_count, payload) records; a segment cut short by a crash yields its complete records."""
+    records = []
+    try:
+        with gzip.open(path, "rb") as f:
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, spooled_at_ms, span_count = _RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break
+                records.append((spooled_at_ms, span_count, payload))
+    except (EOFError, OSError):
+        pass
+    return records
+
+
+class _Segment:
+    __slots__ = ("path", "size", "spans", "oldest_ms")
+
+    def __init__(self, path: str, size: int = 0, spans: Optional[int] = None, oldest_ms: Optional[int] = None):
+        self.path = path
+        self.size = size
+        self.spans = spans  # None for segments left by an earlier process until they are read
+        self.oldest_ms = oldest_ms
+
+
+class SpoolingSpanExporter(SpanExporter):
+    """Exports through `exporter` and spools failed batches to disk for later replay."""
+
+    def __init__(self, exporter: SpanExporter, endpoint: str, headers: Optional[Dict[str, str]] = None,
+                 timeout_s: float = 10.0, name: str = "otlp", spool_dir: str = SPOOL_DIR,
+                 max_bytes: int = SPOOL_MAX_BYTES, segment_bytes: int = SPOOL_SEGMENT_BYTES,
+                 replay_spans_per_second: float = SPOOL_REPLAY_SPANS_PER_SECOND,
+                 replay_interval_ms: float = SPOOL_REPLAY_INTERVAL_MS):
+        """
+        Args:
+            exporter: Exporter used for live batches (e.g. OTLPSpanExporter)
+            endpoint: OTLP/HTTP traces URL spooled requests are replayed to
+            headers: Extra headers sent with replayed requests
+            timeout_s: Timeout of one replay request
+            name: Label distinguishing this spool in metrics
+            spool_dir: Directory holding the segment files
+            max_bytes: Spool size at which the oldest segments are deleted
+            segment_bytes: Compressed segment size at which a new segment is started
+            replay_spans_per_second: Maximum replay rate once the collector is reachable
+            replay_interval_ms: Wait between attempts while the collector is unreachable
+        """
+        self.exporter = exporter
+        self.endpoint = endpoint
+        self.headers = dict(headers or {})
+        self.timeout_s = timeout_s
+        self.name = name
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.replay_spans_per_second = replay_spans_per_second
+        self.replay_interval_ms = replay_interval_ms
+
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = []  # Closed segments, oldest first
+        self._active: Optional[_Segment] = None
+        self._active_file = None
+        self._next_sequence = 0
+        self._replay_offset = 0  # Records of the oldest segment already replayed
+        self._healthy = True
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._session = requests.Session()
+
+        self.spans_spooled = 0
+        self.spans_replayed = 0
+        self.spans_dropped = 0
+        self.segments_dropped = 0
+        self.replay_failures = 0
+        self.records_rejected = 0
+        self.spans_rejected = 0
+        self.last_replay_lag_ms = 0.0
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, _SEGMENT_PATTERN))):
+            self._segments.append(_Segment(path, os.path.getsize(path)))
+            self._next_sequence = max(self._next_sequence, self._sequence_of(path) + 1)
+        if self._segments:
+            self._healthy = False  # Replay what the previous process left before trusting the collector
+            print(f"📼 Span spool: {len(self._segments)} segment(s) from a previous run in {self.spool_dir}")
+
+        self._replayer = threading.Thread(target=self._replay_loop, name=f"otel-spool-replay-{name}", daemon=True)
+        self._replayer.start()
+        _spools.append(self)
+
+    @staticmethod
+    def _sequence_of(path: str) -> int:
+        try:
+            return int(os.path.basename(path).split("-")[1].split(".")[0])
+        except (IndexError, ValueError):
+            return 0
+
+    @property
+    def spool_bytes(self) -> int:
+        """Compressed bytes currently spooled."""
+        active = self._active.size if self._active else 0
+        return active + sum(segment.size for segment in self._segments)
+
+    @property
+    def replay_lag_ms(self) -> float:
+        """Age of the oldest spooled request, 0 when the spool is empty."""
+        oldest = None
+        if self._segments:
+            oldest = self._segments[0].oldest_ms
+            if oldest is None:
+                return self.last_replay_lag_ms  # Not read yet; report the last known lag
+        elif self._active:
+            oldest = self._active.oldest_ms
+        return max(0.0, time.time() * 1000 - oldest) if oldest is not None else 0.0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        was_healthy = self._healthy
+        if was_healthy:
+            result = self.exporter.export(spans)
+            if result is SpanExportResult.SUCCESS:
+                return result
+            self._healthy = False
+        # Spooled spans count as handled: they are exported later by the replayer
+        spooled = self._spool(spans)
+        if was_healthy:
+            # First failure after a success: start replaying once the batch is on disk. While the
+            # collector stays down, the replayer keeps to its interval instead of retrying per batch.
+            self._wake.set()
+        return SpanExportResult.SUCCESS if spooled else SpanExportResult.FAILURE
+
+    def _spool(self, spans: Sequence[ReadableSpan]) -> bool:
+        try:
+            payload = encode_spans(spans).SerializeToString()
+        except Exception as e:
+            print(f"⚠️  Failed to encode spans for the spool: {e}")
+            return False
+        now_ms = int(time.time() * 1000)
+        with self._lock:
+            try:
+                if self._active is None:
+                    path = os.path.join(self.spool_dir, f"segment-{self._next_sequence:010d}.otlp.gz")
+                    self._next_sequence += 1
+                    self._active = _Segment(path, spans=0, oldest_ms=now_ms)
+                    self._active_file = gzip.open(path, "ab")
+                self._active_file.write(_RECORD_HEADER.pack(len(payload), now_ms, len(spans)))
+                self._active_file.write(payload)
+                self._active_file.flush()  # Sync flush: complete records survive a crash
+                self._active.size = os.path.getsize(self._active.path)
+                self._active.spans += len(spans)
+                if self._active.size >= self.segment_bytes:
+                    self._rotate_locked()
+                self._enforce_cap_locked()
+            except OSError as e:
+                print(f"⚠️  Failed to spool {len(spans)} spans: {e}")
+                return False
+        self.spans_spooled += len(spans)
+        _spooled_counter.add(len(spans), {"spool": self.name})
+        return True
+
+    def _rotate_locked(self) -> None:
+        if self._active is None:
+            return
+        self._active_file.close()
+        self._active.size = os.path.getsize(self._active.path)
+        self._segments.append(self._active)
+        self._active, self._active_file = None, None
+
+    def _enforce_cap_locked(self) -> None:
+        while self._segments and self.spool_bytes > self.max_bytes:
+            segment = self._segments.pop(0)
+            self._replay_offset = 0
+            try:
+                os.remove(segment.path)
+            except OSError:
+                pass
+            self.segments_dropped += 1
+            if segment.spans:
+                self.spans_dropped += segment.spans
+                _spool_dropped_counter.add(segment.spans, {"spool": self.name})
+
+    def _send(self, payload: bytes) -> str:
+        """
+        POSTs one serialized ExportTraceServiceRequest.
+
+        Returns:
+            str: _SENT, _RETRY (unreachable, 429 or 5xx) or _REJECTED (any other error status)
+        """
+        headers = {"Content-Type": "application/x-protobuf", **self.headers}
+        if OTLP_COMPRESSION == "gzip":
+            payload = gzip.compress(payload)
+            headers["Content-Encoding"] = "gzip"
+        try:
+            response = self._session.post(self.endpoint, data=payload, headers=headers, timeout=self.timeout_s)
+        except requests.RequestException:
+            return _RETRY
+        if response.ok:
+            return _SENT
+        if response.status_code == 429 or response.status_code >= 500:
+            return _RETRY
+        return _REJECTED
+
+    def _probe(self) -> None:
+        """Marks the collector reachable only if it accepts an empty export request."""
+        if self._send(b"") == _SENT:  # An empty ExportTraceServiceRequest serializes to no bytes
+            self._healthy = True
+        else:
+            self.replay_failures += 1
+
+    def _replay_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.replay_interval_ms / 1000.0)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with self._lock:
+                empty = not self._segments and (self._active is None or not self._active.spans)
+                if not empty:
+                    if not self._segments:
+                        self._rotate_locked()  # Replay what has been spooled so far
+                    segment = self._segments[0]
+                    offset = self._replay_offset
+            if empty:
+                if not self._healthy:
+                    self._probe()
+                continue
+            self._replay_segment(segment, offset)
+
+    def _replay_segment(self, segment: _Segment, offset: int) -> None:
+        records = _read_segment(segment.path)
+        if segment.spans is None:
+            segment.spans = sum(span_count for _, span_count, _ in records)
+        if records:
+            segment.oldest_ms = records[min(offset, len(records) - 1)][0]
+        for index in range(offset, len(records)):
+            if self._stop.is_set():
+                return
+            spooled_at_ms, span_count, payload = records[index]
+            outcome = self._send(payload)
+            if outcome == _RETRY:
+                self.replay_failures += 1
+                self._healthy = False
+                return
+            self._healthy = True  # Collector is back: live batches export directly again
+            if outcome == _REJECTED:
+                # Retrying would fail the same way; skip the record so the rest of the spool drains
+                self.records_rejected += 1
+                self.spans_rejected += span_count
+                _rejected_counter.add(span_count, {"spool": self.name})
+                print(f"⚠️  Collector rejected {span_count} spooled spans; dropping the record")
+            else:
+                self.last_replay_lag_ms = max(0.0, time.time() * 1000 - spooled_at_ms)
+                self.spans_replayed += span_count
+                _replayed_counter.add(span_count, {"spool": self.name})
+            with self._lock:
+                if not self._segments or self._segments[0] is not segment:
+                    return  # Deleted by the size cap while replaying
+                self._replay_offset = index + 1
+                segment.spans -= span_count
+                if index + 1 < len(records):
+                    segment.oldest_ms = records[index + 1][0]
+            if outcome == _SENT and self.replay_spans_per_second > 0:
+                self._stop.wait(span_count / self.replay_spans_per_second)
+        with self._lock:
+            if self._segments and self._segments[0] is segment:
+                self._segments.pop(0)
+                self._replay_offset = 0
+                try:
+                    os.remove(segment.path)
+                except OSError:
+                    pass
+        self._wake.set()  # Continue with the next segment without waiting
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._replayer.join(timeout=self.timeout_s)
+        with self._lock:
+            self._rotate_locked()  # Close the active segment; it is replayed on the next start
+        if self in _spools:
+            _spools.remove(self)
+        self._session.close()
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Returns spool state and replay counters for observability."""
+        return {
+            "spool_dir": self.spool_dir,
+            "collector_reachable": self._healthy,
+            "spool_bytes": self.spool_bytes,
+            "max_bytes": self.max_bytes,
+            "segments": len(self._segments) + (1 if self._active else 0),
+            "replay_lag_ms": round(self.replay_lag_ms, 1),
+            "spans_spooled": self.spans_spooled,
+            "spans_replayed": self.spans_replayed,
+            "spans_dropped": self.spans_dropped,
+            "segments_dropped": self.segments_dropped,
+            "replay_failures": self.replay_failures,
+            "records_rejected": self.records_rejected,
+            "spans_rejected": self.spans_rejected,
+            "replay_spans_per_second": self.replay_spans_per_second,
+        }
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the span attribute policy in telemetry/attributes.py.
+Run with: python -m pytest test_telemetry_attributes.py
+"""
+
+from opentelemetry.sdk.trace import SpanLimits, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from telemetry.attributes import AttributePolicy, AttributePolicySpanProcessor, content_hash
+
+
+def _record(policy, build_span, span_limits=None):
+    """Runs `build_span(tracer)` behind the policy processor and returns the exported spans."""
+    exporter = InMemorySpanExporter()
+    processor = AttributePolicySpanProcessor(SimpleSpanProcessor(exporter), policy=policy)
+    provider = TracerProvider(span_limits=span_limits) if span_limits else TracerProvider()
+    provider.add_span_processor(processor)
+    build_span(provider.get_tracer("test"))
+    provider.shutdown()
+    return exporter.get_finished_spans(), processor
+
+
+def test_unchanged_attributes_are_returned_as_is():
+    policy = AttributePolicy(max_length=10)
+    attributes = {"short": "ok", "count": 3}
+    assert policy.apply(attributes) is attributes
+
+
+def test_long_strings_are_truncated_with_marker():
+    policy = AttributePolicy(max_length=5)
+    result = policy.apply({"llm.prompt": "x" * 12, "other": 1})
+    assert result["llm.prompt"] == "xxxxx...[truncated 7 of 12 chars]"
+    assert result["other"] == 1
+    assert policy.get_stats()["attributes_truncated"] == 1
+
+
+def test_hash_allow_and_deny_lists():
+    policy = AttributePolicy(max_length=0, hash_keys=("llm.*",), allow_keys=("llm.*", "workflow.*"),
+                             deny_keys=("workflow.secret",))
+    result = policy.apply({"llm.prompt": "hello", "workflow.query": "q", "workflow.secret": "s", "user.id": "u"})
+    assert result == {"llm.prompt": content_hash("hello"), "workflow.query": "q"}
+    stats = policy.get_stats()
+    assert (stats["attributes_hashed"], stats["attributes_dropped"]) == (1, 2)
+
+
+def test_processor_rewrites_span_and_event_attributes():
+    def build(tracer):
+        with tracer.start_as_current_span("request") as span:
+            span.set_attribute("llm.response", "y" * 50)
+            span.add_event("exception", {"exception.stacktrace": "z" * 50})
+
+    spans, processor = _record(AttributePolicy(max_length=8), build)
+    (span,) = spans
+    assert span.attributes["llm.response"].startswith("y" * 8 + "...[truncated")
+    assert span.events[0].attributes["exception.stacktrace"].startswith("z" * 8 + "...[truncated")
+    assert processor.get_stats()["spans_rewritten"] == 1
+    assert processor.get_stats()["events_rewritten"] == 1
+
+
+def test_processor_keeps_sdk_dropped_counts():
+    def build(tracer):
+        with tracer.start_as_current_span("request") as span:
+            for i in range(4):
+                span.set_attribute(f"key.{i}", "v" * 50)
+
+    spans, _ = _record(AttributePolicy(max_length=8), build, span_limits=SpanLimits(max_span_attributes=2))
+    (span,) = spans
+    assert len(span.attributes) == 2
+    assert span.dropped_attributes == 2
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for head and tail sampling in telemetry/sampling.py.
+Run with: python -m pytest test_telemetry_sampling.py
+"""
+
+import time
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from telemetry.sampling import TailSamplingSpanProcessor, build_sampler
+
+
+def _tail_pipeline(**kwargs):
+    exporter = InMemorySpanExporter()
+    sampler = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter), **kwargs)
+    provider = TracerProvider()
+    provider.add_span_processor(sampler)
+    return provider, provider.get_tracer("test"), sampler, exporter
+
+
+def test_head_sampler_ratio_zero_records_nothing():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=build_sampler(0.0))
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    with provider.get_tracer("test").start_as_current_span("request") as span:
+        assert not span.is_recording()
+    provider.shutdown()
+    assert exporter.get_finished_spans() == ()
+
+
+def test_tail_sampler_keeps_error_traces_with_all_their_spans():
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=0.0)
+    with tracer.start_as_current_span("request"):
+        with tracer.start_as_current_span("llm") as child:
+            child.set_status(Status(StatusCode.ERROR, "timeout"))
+    assert {span.name for span in exporter.get_finished_spans()} == {"request", "llm"}
+    assert sampler.get_stats()["kept_errors"] == 1
+    provider.shutdown()
+
+
+def test_tail_sampler_keeps_slow_traces_and_drops_the_rest():
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=0.0, latency_threshold_ms=20)
+    with tracer.start_as_current_span("fast"):
+        pass
+    with tracer.start_as_current_span("slow"):
+        time.sleep(0.03)
+    assert [span.name for span in exporter.get_finished_spans()] == ["slow"]
+    stats = sampler.get_stats()
+    assert (stats["kept_slow"], stats["traces_dropped"]) == (1, 1)
+    provider.shutdown()
+
+
+def test_tail_sampler_forced_priority_is_always_kept():
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=0.0)
+    with tracer.start_as_current_span("connectivity-test", attributes={"sampling.priority": 1}):
+        pass
+    assert len(exporter.get_finished_spans()) == 1
+    provider.shutdown()
+
+
+def test_tail_sampler_baseline_ratio_is_roughly_respected():
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=0.25)
+    for _ in range(2000):
+        with tracer.start_as_current_span("request"):
+            pass
+    assert 0.18 < sampler.get_stats()["kept_fraction"] < 0.32
+    provider.shutdown()
+
+
+def test_open_trace_is_decided_by_the_sweeper():
+    """A trace whose root never ends is decided after max_trace_age_ms without further spans."""
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=1.0, max_trace_age_ms=100)
+    root = tracer.start_span("request")
+    with trace.use_span(root):
+        with tracer.start_as_current_span("step"):
+            pass
+    assert sampler.get_stats()["buffered_traces"] == 1  # "step" waits for its root
+    deadline = time.monotonic() + 2.0
+    while sampler.get_stats()["buffered_traces"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert sampler.get_stats()["decided_early"] == 1
+    assert "step" in {span.name for span in exporter.get_finished_spans()}
+    root.end()
+    provider.shutdown()
+
+
+def test_shutdown_flushes_buffered_traces():
+    provider, tracer, sampler, exporter = _tail_pipeline(sample_ratio=1.0)
+    root = tracer.start_span("request")
+    with trace.use_span(root):
+        with tracer.start_as_current_span("step"):
+            pass
+    provider.shutdown()
+    assert [span.name for span in exporter.get_finished_spans()] == ["step"]
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the disk spool and its replay pacing in telemetry/spool.py.
+The collector is replaced by a fake `_send`, so no network is needed.
+Run with: python -m pytest test_telemetry_spool.py
+"""
+
+import threading
+import time
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from telemetry.spool import _REJECTED, _RETRY, _SENT, SpoolingSpanExporter
+
+
+class FlakyExporter(SpanExporter):
+    """Live exporter whose availability is switched by the test."""
+
+    def __init__(self):
+        self.up = False
+        self.exported = 0
+
+    def export(self, spans):
+        if not self.up:
+            return SpanExportResult.FAILURE
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+class FakeCollector:
+    """Replaces SpoolingSpanExporter._send: records replay requests and answers with `outcome`."""
+
+    def __init__(self, outcome=_RETRY):
+        self.outcome = outcome
+        self.requests = []  # (time, payload size)
+        self.lock = threading.Lock()
+
+    def send(self, payload: bytes) -> str:
+        with self.lock:
+            self.requests.append((time.monotonic(), len(payload)))
+            outcome = self.outcome
+        return outcome(payload) if callable(outcome) else outcome
+
+    @property
+    def replays(self):
+        return [sent_at for sent_at, size in self.requests if size]  # Empty payloads are probes
+
+
+def make_spans(count: int):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer("test")
+    for i in range(count):
+        with tracer.start_as_current_span(f"span-{i}"):
+            pass
+    provider.shutdown()
+    return list(exporter.get_finished_spans())
+
+
+def wait_for(condition, timeout_s: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def spool_factory(tmp_path):
+    spools = []
+
+    def create(collector: FakeCollector, **kwargs):
+        kwargs.setdefault("replay_interval_ms", 100)
+        kwargs.setdefault("replay_spans_per_second", 0)
+        live = FlakyExporter()
+        spool = SpoolingSpanExporter(live, endpoint="http://collector.invalid/v1/traces",
+                                     spool_dir=str(tmp_path / "spool"), **kwargs)
+        spool._send = collector.send
+        spools.append(spool)
+        return spool, live
+
+    yield create
+    for spool in spools:
+        spool.shutdown()
+
+
+def test_failed_batches_are_spooled_and_replayed_after_recovery(spool_factory):
+    collector = FakeCollector(_RETRY)
+    spool, live = spool_factory(collector)
+    for _ in range(3):
+        assert spool.export(make_spans(5)) is SpanExportResult.SUCCESS
+    assert spool.get_stats()["spans_spooled"] == 15
+    assert live.exported == 0
+
+    collector.outcome = _SENT
+    assert wait_for(lambda: spool.get_stats()["spans_replayed"] == 15)
+    stats = spool.get_stats()
+    assert stats["spool_bytes"] == 0
+    assert stats["collector_reachable"]
+
+    # Once the collector is back, live batches bypass the spool again
+    live.up = True
+    spool.export(make_spans(2))
+    assert live.exported == 2
+    assert spool.get_stats()["spans_spooled"] == 15
+
+
+def test_replay_is_paced_to_the_configured_span_rate(spool_factory):
+    collector = FakeCollector(_RETRY)
+    spool, _ = spool_factory(collector, replay_spans_per_second=100)
+    for _ in range(4):
+        spool.export(make_spans(10))  # 10 spans = 100 ms of replay budget each
+
+    collector.outcome = _SENT
+    assert wait_for(lambda: spool.get_stats()["spans_replayed"] == 40)
+    replays = collector.replays[-4:]
+    gaps = [later - earlier for earlier, later in zip(replays, replays[1:])]
+    assert min(gaps) >= 0.09
+
+
+def test_collector_outage_does_not_cause_a_replay_storm(spool_factory):
+    """While the collector stays down, spooling more batches does not trigger extra attempts."""
+    collector = FakeCollector(_RETRY)
+    spool, _ = spool_factory(collector, replay_interval_ms=200)
+    started = time.monotonic()
+    while time.monotonic() - started < 0.6:
+        spool.export(make_spans(1))
+        time.sleep(0.005)
+    attempts = len(collector.requests)
+    assert spool.get_stats()["spans_spooled"] > 50
+    assert attempts <= 0.6 / 0.2 + 2  # About one attempt per interval, plus the wake-up on the first failure
+
+
+def test_rejected_record_is_dropped_and_the_rest_drains(spool_factory):
+    collector = FakeCollector(_RETRY)
+    spool, _ = spool_factory(collector)
+    spool.export(make_spans(3))
+    spool.export(make_spans(4))
+
+    first = []
+
+    def reject_first(payload):
+        if not payload:
+            return _SENT
+        if not first:
+            first.append(payload)
+            return _REJECTED
+        return _SENT
+
+    collector.outcome = reject_first
+    assert wait_for(lambda: spool.get_stats()["spans_replayed"] == 4)
+    stats = spool.get_stats()
+    assert (stats["records_rejected"], stats["spans_rejected"]) == (1, 3)
+
+
+def test_spool_left_by_a_previous_process_is_replayed(spool_factory):
+    collector = FakeCollector(_RETRY)
+    spool, _ = spool_factory(collector)
+    spool.export(make_spans(6))
+    spool.shutdown()
+
+    restarted, live = spool_factory(FakeCollector(_SENT))
+    live.up = True
+    assert not restarted.get_stats()["collector_reachable"]  # Old spool is replayed before live export resumes
+    assert wait_for(lambda: restarted.get_stats()["spans_replayed"] == 6)
+    assert restarted.get_stats()["spool_bytes"] == 0
+
+
+def test_size_cap_deletes_oldest_segments(spool_factory):
+    collector = FakeCollector(_RETRY)
+    spool, _ = spool_factory(collector, replay_interval_ms=60000, segment_bytes=1, max_bytes=2000)
+    for _ in range(50):
+        spool.export(make_spans(5))
+    stats = spool.get_stats()
+    assert stats["spool_bytes"] <= 2000
+    assert stats["segments_dropped"] > 0
+    assert stats["spans_dropped"] == stats["spans_spooled"] - 5 * (stats["segments"])